@@ -0,0 +1,96 @@
+"""Compare fixed and adaptive per-host concurrency on a fast and a fragile host.
+
+A local server answers as two hosts: ``127.0.0.1`` always responds in a
+few milliseconds, while ``localhost`` slows down with every concurrent
+request and returns 503 beyond ``--capacity`` of them. ``scrape_many``
+fetches pages of both with a fixed worker count and then with
+``adaptive_concurrency``::
+
+    python -m benchmarks.bench_adaptive_concurrency --pages 300 --concurrency 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+def make_handler(capacity: int):
+    lock = threading.Lock()
+    active = {"count": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        body = b"<html><title>bench</title><body>" + b"<p>x</p>" * 200 + b"</body></html>"
+
+        def do_GET(self):
+            if self.headers["Host"].startswith("localhost"):
+                with lock:
+                    active["count"] += 1
+                    overloaded = active["count"] > capacity
+                try:
+                    time.sleep(0.005 * active["count"])
+                finally:
+                    with lock:
+                        active["count"] -= 1
+                if overloaded:
+                    self.send_error(503)
+                    return
+            else:
+                time.sleep(0.005)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(self.body)))
+            self.end_headers()
+            self.wfile.write(self.body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300, help="pages per host")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--capacity", type=int, default=3, help="fragile host's limit")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.capacity))
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    port = httpd.server_address[1]
+    urls = [
+        f"http://{host}:{port}/{i}" for i in range(args.pages) for host in ("127.0.0.1", "localhost")
+    ]
+
+    print(f"{args.pages} pages per host, concurrency {args.concurrency}")
+    print(f"{'mode':>8}  {'pages/s':>8}  {'failed':>6}  {'fast limit':>10}  {'fragile limit':>13}")
+    for mode, adaptive in (("fixed", False), ("adaptive", True)):
+        engine = ScraperEngine(config={
+            "delay": 0,
+            "retries": 3,
+            "backoff_base": 0.05,
+            "concurrency": args.concurrency,
+            "circuit_breaker": {"min_requests": 10_000},
+            "adaptive_concurrency": adaptive,
+        })
+        start = time.perf_counter()
+        failed = sum(html is None for _, html in engine.scrape_many(urls))
+        elapsed = time.perf_counter() - start
+        limits = engine.concurrency_limits()
+        fast = limits.get("127.0.0.1", {}).get("limit", args.concurrency)
+        fragile = limits.get("localhost", {}).get("limit", args.concurrency)
+        print(f"{mode:>8}  {len(urls) / elapsed:>8.0f}  {failed:>6}  {fast:>10}  {fragile:>13}")
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Measure how many concurrent connections ``AsyncScraperEngine`` sustains.
+
+The benchmark runs an asyncio HTTP server and the engine on the *same* event
+loop, so everything executes on a single core. Every response is held for
+``--latency`` seconds, forcing the engine to keep many sockets open at once::
+
+    python -m benchmarks.bench_async_engine --pages 5000 --concurrency 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+from cinder_web_scraper.scraping.async_scraper_engine import AsyncScraperEngine
+
+
+class SlowServer:
+    """Tiny HTTP server that tracks the peak number of open connections."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.open = 0
+        self.peak = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.open += 1
+        self.peak = max(self.peak, self.open)
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+            await asyncio.sleep(self.latency)
+            path = request_line.split()[1] if request_line else b"/"
+            body = b"<html><body><p>" + path + b"</p></body></html>"
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                b"Content-Length: %d\r\nConnection: close\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+        finally:
+            self.open -= 1
+            writer.close()
+
+
+async def run(pages: int, concurrency: int, latency: float) -> None:
+    handler = SlowServer(latency)
+    server = await asyncio.start_server(handler.handle, "127.0.0.1", 0, backlog=4096)
+    port = server.sockets[0].getsockname()[1]
+    engine = AsyncScraperEngine(
+        config={"delay": 0, "retries": 1, "concurrency": concurrency, "timeout": 60}
+    )
+    urls = (f"http://127.0.0.1:{port}/page/{i}" for i in range(pages))
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    ok = 0
+    async for _, html in engine.scrape_many(urls):
+        ok += html is not None
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    server.close()
+    await server.wait_closed()
+    print(f"pages ok        : {ok}/{pages}")
+    print(f"peak open conns : {handler.peak}")
+    print(f"wall time       : {elapsed:.2f}s ({pages / elapsed:.0f} pages/sec)")
+    print(f"cpu time        : {cpu:.2f}s (single thread)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    # Each in-flight page needs a client and a server socket.
+    if resource is not None:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        wanted = min(hard, max(soft, args.concurrency * 2 + 256))
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+    asyncio.run(run(args.pages, args.concurrency, args.latency))
+
+
+if __name__ == "__main__":
+    main()
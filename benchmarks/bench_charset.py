@@ -0,0 +1,62 @@
+"""Compare ``response.text`` decoding with :class:`CharsetDetector`.
+
+Pages are served without a ``charset`` in ``Content-Type`` so ``requests``
+has to run ``charset_normalizer`` on the whole body::
+
+    python -m benchmarks.bench_charset --pages 20 --size-kb 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+import requests
+
+from cinder_web_scraper.scraping.charset import CharsetDetector
+
+from .bench_extraction import synthetic_page
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/octet-stream"
+    response._content = body
+    return response
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--size-kb", type=int, default=512)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rows = max(1, args.size_kb * 1024 // 150)
+    bodies = [
+        synthetic_page(i, rows).replace("Paragraph", "Paragraphe été").encode("cp1252")
+        for i in range(args.pages)
+    ]
+
+    start = time.perf_counter()
+    for body in bodies:
+        _response(body).text
+    before = time.perf_counter() - start
+
+    detector = CharsetDetector()
+    start = time.perf_counter()
+    for i, body in enumerate(bodies):
+        detector.decode(f"http://host{i % 4}.example/", body)
+    after = time.perf_counter() - start
+
+    print(f"{len(bodies)} pages of {len(bodies[0]) // 1024} KiB, no charset header")
+    print(f"response.text   : {before * 1000 / len(bodies):8.2f} ms/page")
+    print(f"CharsetDetector : {after * 1000 / len(bodies):8.2f} ms/page")
+    print(f"speed-up        : {before / after:8.2f}x")
+    print(f"detector stats  : {detector.stats()}")
+
+
+if __name__ == "__main__":
+    main()
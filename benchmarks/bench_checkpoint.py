@@ -0,0 +1,58 @@
+"""Measure the cost of checkpointing a crawl and of replaying the file.
+
+Each simulated page queues ``--links`` URLs and finishes once, as the
+crawler does. The flush interval decides how often the file is fsynced::
+
+    python -m benchmarks.bench_checkpoint --pages 100000 --intervals 0,1,5
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from cinder_web_scraper.crawling.checkpoint import Checkpoint
+from cinder_web_scraper.scraping.rate_limiter import HostRateLimiter
+
+
+def record(path: str, pages: int, links: int, interval: float) -> float:
+    limiter = HostRateLimiter(rate=10)
+    limiter.reserve("https://example.com/")
+    start = time.perf_counter()
+    with Checkpoint(path, interval) as checkpoint:
+        checkpoint.pending("https://example.com/")
+        for page in range(pages):
+            for link in range(links):
+                checkpoint.pending(f"https://example.com/{page * links + link}", 1)
+            checkpoint.finished(f"https://example.com/{page}")
+            checkpoint.maybe_flush(limiter)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100000)
+    parser.add_argument("--links", type=int, default=3)
+    parser.add_argument("--intervals", default="0,1,5")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{args.pages} pages, {args.links} links each")
+    print(f"{'interval':>8}  {'pages/s':>9}  {'MB':>6}  {'replay s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoint.jsonl")
+        for interval in (float(n) for n in args.intervals.split(",")):
+            elapsed = record(path, args.pages, args.links, interval)
+            start = time.perf_counter()
+            state = Checkpoint.load(path)
+            replay = time.perf_counter() - start
+            assert len(state.finished) == args.pages
+            size = os.path.getsize(path) / 1e6
+            print(f"{interval:>8.1f}  {args.pages / elapsed:>9.0f}  {size:>6.1f}  {replay:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Show how the per-host pool size affects connection reuse under concurrency.
+
+``scrape_many`` fetches pages from a local keep-alive server with a fixed
+number of workers while the ``connection_pool`` ``per_host`` size varies.
+Pools smaller than the concurrency open and discard connections (or wait
+for one with ``--block``)::
+
+    python -m benchmarks.bench_connection_pool --pages 400 --concurrency 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b"<html><title>bench</title><body>" + b"<p>x</p>" * 500 + b"</body></html>"
+
+    def do_GET(self):
+        time.sleep(0.005)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--block", action="store_true", help="wait for a free connection")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    urls = [f"{base}/{i}" for i in range(args.pages)]
+
+    print(f"{args.pages} pages, concurrency {args.concurrency}, block={args.block}")
+    print(f"{'per_host':>8}  {'pages/s':>8}  {'reuse':>6}  {'new':>5}  {'discarded':>9}  {'wait s':>7}")
+    for per_host in sorted({1, max(1, args.concurrency // 4), max(1, args.concurrency // 2), args.concurrency}):
+        engine = ScraperEngine(config={
+            "delay": 0,
+            "concurrency": args.concurrency,
+            "connection_pool": {"per_host": per_host, "block": args.block, "shared": False},
+        })
+        # Keep scrape_many from growing the pool to the worker count.
+        engine._ensure_pool_size = lambda size: None  # type: ignore[assignment]
+        start = time.perf_counter()
+        for _ in engine.scrape_many(urls):
+            pass
+        elapsed = time.perf_counter() - start
+        stats = engine.connection_stats()
+        print(f"{per_host:>8}  {args.pages / elapsed:>8.0f}  {stats['reuse_ratio']:>6.2f}  "
+              f"{stats['new_connections']:>5.0f}  {stats['discarded']:>9.0f}  "
+              f"{stats['pool_wait_seconds']:>7.2f}")
+    httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""CPU cost per page of the extraction pipeline, before and after single-parse.
+
+The legacy pipeline parsed every page, serialised the tree back to a string
+and parsed that string again inside ``ContentExtractor``. The current
+pipeline hands the fetched HTML straight to the extractor, which parses it
+exactly once::
+
+    python -m benchmarks.bench_extraction --pages 200
+    python -m benchmarks.bench_extraction --corpus path/to/saved/pages
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from bs4 import BeautifulSoup
+
+from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+
+
+def synthetic_page(index: int, paragraphs: int = 400) -> str:
+    """Return a moderately large article-like HTML page."""
+    body = "".join(
+        f"<div class='row'><h2>Heading {i}</h2><p class='content'>Paragraph {i} of "
+        f"page {index} with <a href='/p/{i}'>a link</a> and <b>bold</b> text.</p>"
+        f"<img src='/img/{i}.png'></div>"
+        for i in range(paragraphs)
+    )
+    return (
+        f"<html><head><title>Page {index}</title><script>var x = {index};</script>"
+        f"</head><body><h1>Page {index}</h1>{body}</body></html>"
+    )
+
+
+def load_corpus(directory: str) -> List[str]:
+    """Read every ``*.html`` file below ``directory``."""
+    return [
+        path.read_text(encoding="utf-8", errors="replace")
+        for path in sorted(Path(directory).rglob("*.html"))
+    ]
+
+
+def cpu_per_page(pages: List[str], run: Callable[[str], object]) -> float:
+    """Return the mean process CPU time in milliseconds per page."""
+    start = time.process_time()
+    for html in pages:
+        run(html)
+    return (time.process_time() - start) * 1000 / len(pages)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    pages = load_corpus(args.corpus) if args.corpus else [
+        synthetic_page(i) for i in range(args.pages)
+    ]
+    extractor = ContentExtractor()
+
+    def legacy(html: str) -> object:
+        soup = BeautifulSoup(html, "html.parser")
+        return extractor.extract(str(soup))
+
+    before = cpu_per_page(pages, legacy)
+    after = cpu_per_page(pages, extractor.extract)
+    print(f"pages            : {len(pages)}")
+    print(f"before (2 parses): {before:8.2f} ms CPU/page")
+    print(f"after  (1 parse) : {after:8.2f} ms CPU/page")
+    print(f"speed-up         : {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
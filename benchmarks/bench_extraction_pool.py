@@ -0,0 +1,90 @@
+"""Measure extraction throughput of threads versus the process pool.
+
+Pages are extracted with the twelve ``bench_fields`` selectors, first on a
+thread pool (GIL-bound, as on the fetch threads of ``scrape_many``) and
+then by an :class:`ExtractionPool` with a growing number of processes.
+On an idle machine pages/s grow almost linearly with processes up to the
+number of cores::
+
+    python -m benchmarks.bench_extraction_pool --pages 200 --workers 1,2,4,8
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+from cinder_web_scraper.scraping.extraction_pool import ExtractionPool, extract_page
+
+from .bench_extraction import load_corpus, synthetic_page
+from .bench_fields import DEFAULT_SELECTORS
+
+
+def run_threads(bodies: List[bytes], workers: int) -> float:
+    extractor = ContentExtractor()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(
+            lambda body: extract_page(body.decode("utf-8"), DEFAULT_SELECTORS, extractor=extractor),
+            bodies,
+        ))
+    return len(bodies) / (time.perf_counter() - start)
+
+
+def run_pool(bodies: List[bytes], processes: int, shared: bool = True) -> float:
+    with ExtractionPool(processes, shared=shared) as pool:
+        # Start the workers before timing.
+        for future in [pool.submit(bodies[0]) for _ in range(processes)]:
+            future.result()
+        start = time.perf_counter()
+        futures = [pool.submit(body, "utf-8", DEFAULT_SELECTORS) for body in bodies]
+        for future in futures:
+            future.result()
+        return len(bodies) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument(
+        "--workers",
+        help="comma separated worker counts (default: powers of two up to the CPU count)",
+    )
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    pages = load_corpus(args.corpus) if args.corpus else [
+        synthetic_page(i) for i in range(args.pages)
+    ]
+    bodies = [page.encode("utf-8") for page in pages]
+    cpus = os.cpu_count() or 1
+    if args.workers:
+        counts = [int(n) for n in args.workers.split(",")]
+    else:
+        counts = [1]
+        while counts[-1] * 2 <= cpus:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != cpus:
+            counts.append(cpus)
+
+    print(f"{len(bodies)} pages, {sum(map(len, bodies)) / len(bodies) / 1024:.0f} KiB each, "
+          f"{cpus} CPUs")
+    print(f"{'workers':>7}  {'threads':>10}  {'processes':>10}  {'scaling':>7}")
+    single = None
+    for count in counts:
+        threads = run_threads(bodies, count)
+        processes = run_pool(bodies, count)
+        single = single or processes
+        print(f"{count:>7}  {threads:>8.1f}/s  {processes:>8.1f}/s  {processes / single:>6.2f}x")
+    pickled = run_pool(bodies, counts[-1], shared=False)
+    print(f"pickled bodies at {counts[-1]} processes: {pickled:.1f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare one ``select`` per field with single-pass ``extract_fields``.
+
+Both variants run on already parsed documents so only extraction time is
+measured::
+
+    python -m benchmarks.bench_fields --pages 20
+    python -m benchmarks.bench_fields --corpus path/to/saved/pages
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from typing import Dict, List
+
+from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+
+from .bench_extraction import load_corpus, synthetic_page
+
+# Twelve fields in the style of a ``websites.json`` ``selectors`` map.
+DEFAULT_SELECTORS = {
+    "title": "h1",
+    "headings": "h2",
+    "subheadings": "div.row > h2",
+    "content": ".content",
+    "paragraphs": "p",
+    "links": "a[href]",
+    "images": "img",
+    "bold": "b",
+    "rows": ".row",
+    "main": "#main",
+    "lists": "ul li",
+    "captions": "figure figcaption",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    extractor = ContentExtractor()
+    pages = load_corpus(args.corpus) if args.corpus else [
+        synthetic_page(i) for i in range(args.pages)
+    ]
+    docs = [extractor.parse(html) for html in pages]
+
+    start = time.perf_counter()
+    per_field: List[Dict[str, List[str]]] = [
+        {field: extractor.extract(doc, sel) for field, sel in DEFAULT_SELECTORS.items()}
+        for doc in docs
+    ]
+    before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single_pass = [extractor.extract_fields(doc, DEFAULT_SELECTORS) for doc in docs]
+    after = time.perf_counter() - start
+
+    print(f"{len(docs)} pages, {len(DEFAULT_SELECTORS)} fields")
+    print(f"select per field : {before * 1000 / len(docs):8.2f} ms/page")
+    print(f"extract_fields   : {after * 1000 / len(docs):8.2f} ms/page")
+    print(f"speed-up         : {before / after:8.2f}x")
+    print(f"identical output : {per_field == single_pass}")
+
+
+if __name__ == "__main__":
+    main()
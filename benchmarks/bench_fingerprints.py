@@ -0,0 +1,68 @@
+"""Measure a re-run over unchanged pages with and without fingerprints.
+
+Every page is extracted with the twelve ``bench_fields`` selectors and
+saved as JSON; the second run sees the same bodies, so the fingerprint
+store skips both extraction and writing::
+
+    python -m benchmarks.bench_fingerprints --pages 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import Optional
+
+from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+from cinder_web_scraper.scraping.fingerprints import FingerprintStore, process_page
+from cinder_web_scraper.scraping.output_manager import OutputManager
+
+from .bench_extraction import load_corpus, synthetic_page
+from .bench_fields import DEFAULT_SELECTORS
+
+
+def run(pages, store: Optional[FingerprintStore], out_dir: str) -> float:
+    extractor = ContentExtractor()
+    output = OutputManager()
+    start = time.perf_counter()
+    for i, html in enumerate(pages):
+        process_page(
+            store, output, f"https://example.com/{i}", html,
+            os.path.join(out_dir, f"{i}.json"),
+            lambda page: extractor.extract_fields(page, DEFAULT_SELECTORS), "bench",
+        )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    pages = load_corpus(args.corpus) if args.corpus else [
+        synthetic_page(i) for i in range(args.pages)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = run(pages, None, tmp)
+        with FingerprintStore(os.path.join(tmp, "fp.db")) as store:
+            first = run(pages, store, tmp)
+            second = run(pages, store, tmp)
+            stats = store.stats()
+
+    per_page = 1000 / len(pages)
+    print(f"{len(pages)} pages")
+    print(f"no fingerprints     : {baseline * per_page:8.2f} ms/page")
+    print(f"first run (storing) : {first * per_page:8.2f} ms/page")
+    print(f"unchanged re-run    : {second * per_page:8.2f} ms/page")
+    print(f"speed-up            : {baseline / second:8.1f}x")
+    print(f"skipped             : {stats['extractions_skipped']} extractions, "
+          f"{stats['writes_skipped']} writes")
+
+
+if __name__ == "__main__":
+    main()
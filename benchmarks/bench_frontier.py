@@ -0,0 +1,55 @@
+"""Push and pop millions of URLs through the crawl frontier and seen-set.
+
+Reports throughput and peak traced memory, which stays bounded by
+``--memory`` heap entries plus the fixed-size Bloom filter::
+
+    python -m benchmarks.bench_frontier --urls 1000000 --memory 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+from cinder_web_scraper.crawling.bloom_filter import BloomFilter
+from cinder_web_scraper.crawling.frontier import Frontier
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=1_000_000)
+    parser.add_argument("--memory", type=int, default=50_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tracemalloc.start()
+        seen = BloomFilter(args.urls, 0.001)
+        frontier = Frontier(os.path.join(tmp, "frontier.db"), args.memory)
+        start = time.perf_counter()
+        for i in range(args.urls):
+            url = f"https://site{i % 97}.example/page/{i}"
+            if seen.add(url):
+                frontier.push(url, i % 5, i % 5)
+        pushed = time.perf_counter() - start
+        popped = 0
+        while frontier.pop() is not None:
+            popped += 1
+        total = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        frontier.close()
+
+    print(f"{popped} URLs, heap limit {args.memory}")
+    print(f"push        : {args.urls / pushed:10.0f} URLs/s")
+    print(f"push + pop  : {popped / total:10.0f} URLs/s")
+    print(f"bloom size  : {seen.size_bytes / 2**20:10.2f} MiB")
+    print(f"peak traced : {peak / 2**20:10.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
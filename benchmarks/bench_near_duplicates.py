@@ -0,0 +1,75 @@
+"""Measure near-duplicate lookups and detection rates.
+
+Indexes ``--docs`` synthetic articles, then checks edited copies at several
+similarity levels and reports the detection rate, the lookup latency with
+and without computing the signature, and the memory of the band filter::
+
+    python -m benchmarks.bench_near_duplicates --docs 100000 --threshold 0.9
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from typing import List
+
+from cinder_web_scraper.scraping.near_duplicates import NearDuplicateDetector
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = random.Random(1)
+    vocab = [f"w{i}" for i in range(50_000)]
+
+    def article() -> List[str]:
+        return [rng.choice(vocab) for _ in range(args.words)]
+
+    detector = NearDuplicateDetector(args.threshold, capacity=max(args.docs, 1))
+    kept: List[List[str]] = []
+    start = time.perf_counter()
+    for i in range(args.docs):
+        words = article()
+        detector.add(" ".join(words))
+        if i < args.queries:
+            kept.append(words)
+    indexed = time.perf_counter() - start
+
+    print(f"{args.docs} documents, threshold {args.threshold}, "
+          f"{detector.bands} bands x {detector.rows} rows")
+    print(f"index     : {args.docs / indexed:10.0f} docs/s")
+    print(f"memory    : {detector.size_bytes / 2**20:10.2f} MiB")
+
+    for changes in (0, 3, 6, 10, 20, 60):
+        texts = []
+        for words in kept:
+            words = list(words)
+            for _ in range(changes):
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+            texts.append(" ".join(words))
+        signatures = [detector.signature(text) for text in texts]
+        start = time.perf_counter()
+        hits = sum(detector.matches(sig) for sig in signatures)
+        lookup = (time.perf_counter() - start) / len(signatures)
+        start = time.perf_counter()
+        for text in texts:
+            detector.contains(text)
+        total = (time.perf_counter() - start) / len(texts)
+        print(f"{changes:3d} edited words: detected {hits / len(texts):6.1%}  "
+              f"lookup {lookup * 1e6:7.1f} us  with signature {total * 1e3:6.2f} ms")
+
+    fresh = [" ".join(article()) for _ in range(args.queries)]
+    false_hits = sum(detector.contains(text) for text in fresh)
+    print(f"unrelated : {false_hits / len(fresh):6.1%} flagged")
+
+
+if __name__ == "__main__":
+    main()
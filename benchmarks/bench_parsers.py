@@ -0,0 +1,94 @@
+"""Parse and select time per HTML parser backend.
+
+Runs every installed ``BeautifulSoup`` backend (and ``selectolax`` when it is
+installed, as a selector-only reference) over a corpus of saved pages and
+reports the mean parse and select time per page. Results are compared with
+``html.parser`` so a faster backend that changes the extracted text is
+flagged::
+
+    python -m benchmarks.bench_parsers --corpus path/to/saved/pages
+    python -m benchmarks.bench_parsers --selector "h1" --selector ".content"
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import logging
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+from cinder_web_scraper.scraping.parsers import available_parsers
+
+from .bench_extraction import load_corpus, synthetic_page
+
+Result = List[List[str]]
+
+
+def bs4_backend(name: str) -> Tuple[Callable[[str], object], Callable[[object, str], List[str]]]:
+    extractor = ContentExtractor(name)
+    return extractor.parse, lambda doc, selector: extractor.extract(doc, selector)
+
+
+def selectolax_backend() -> Tuple[Callable[[str], object], Callable[[object, str], List[str]]]:
+    from selectolax.parser import HTMLParser  # type: ignore[import-not-found]
+
+    def select(doc: object, selector: str) -> List[str]:
+        return [node.text(strip=True) for node in doc.css(selector)]  # type: ignore[attr-defined]
+
+    return HTMLParser, select
+
+
+def run_backend(
+    pages: Sequence[str],
+    selectors: Sequence[str],
+    parse: Callable[[str], object],
+    select: Callable[[object, str], List[str]],
+) -> Tuple[float, float, Result]:
+    """Return mean parse ms, mean select ms and the extracted values."""
+    parse_time = select_time = 0.0
+    results: Result = []
+    for html in pages:
+        start = time.perf_counter()
+        doc = parse(html)
+        parse_time += time.perf_counter() - start
+        start = time.perf_counter()
+        results.append(sum((select(doc, sel) for sel in selectors), []))
+        select_time += time.perf_counter() - start
+    count = len(pages)
+    return parse_time * 1000 / count, select_time * 1000 / count, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--selector", action="append", dest="selectors")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    pages = load_corpus(args.corpus) if args.corpus else [
+        synthetic_page(i) for i in range(args.pages)
+    ]
+    selectors = args.selectors or ["h1", ".content", "a", "div.row > h2"]
+
+    backends: Dict[str, Tuple[Callable, Callable]] = {
+        name: bs4_backend(name) for name in available_parsers()
+    }
+    if importlib.util.find_spec("selectolax") is not None:
+        backends["selectolax"] = selectolax_backend()
+
+    reference: Result = []
+    print(f"{len(pages)} pages, selectors: {', '.join(selectors)}")
+    print(f"{'backend':<12} {'parse ms':>10} {'select ms':>10}  matches html.parser")
+    for name in ["html.parser"] + [n for n in backends if n != "html.parser"]:
+        parse_ms, select_ms, results = run_backend(pages, selectors, *backends[name])
+        if name == "html.parser":
+            reference = results
+        same = sum(a == b for a, b in zip(results, reference))
+        print(f"{name:<12} {parse_ms:>10.2f} {select_ms:>10.2f}  {same}/{len(pages)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare full and partial (strained) parsing for targeted extraction.
+
+Large pages are parsed with and without ``ContentExtractor(partial=True)``
+and the time and peak memory of ``extract_fields`` are reported::
+
+    python -m benchmarks.bench_partial_parse --size-mb 1 --size-mb 5
+    python -m benchmarks.bench_partial_parse --corpus path/to/saved/pages
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+
+from .bench_extraction import load_corpus, synthetic_page
+
+# Targeted fields reaching only a small part of each page.
+DEFAULT_SELECTORS = {
+    "title": "h1",
+    "links": "a[href]",
+    "images": "img",
+}
+
+
+def measure(pages: List[str], run: Callable[[str], object]) -> Tuple[float, float, list]:
+    """Return ms per page, peak traced MiB and the results of ``run``.
+
+    Memory is traced for the first page only, in a separate pass, because
+    ``tracemalloc`` slows allocation-heavy parsing down considerably.
+    """
+    start = time.perf_counter()
+    results = [run(html) for html in pages]
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run(pages[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000 / len(pages), peak / 2**20, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument(
+        "--size-mb", type=float, action="append", help="synthetic page size (repeatable)"
+    )
+    parser.add_argument("--pages", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    suites: Dict[str, List[str]] = {}
+    if args.corpus:
+        suites["corpus"] = load_corpus(args.corpus)
+    else:
+        for size in args.size_mb or [1.0, 5.0]:
+            # One synthetic row is roughly 150 bytes.
+            rows = int(size * 2**20 / 150)
+            suites[f"{size:g} MB"] = [synthetic_page(i, rows) for i in range(args.pages)]
+
+    full = ContentExtractor()
+    partial = ContentExtractor(partial=True)
+    for label, pages in suites.items():
+        mb = sum(len(page) for page in pages) / len(pages) / 2**20
+        full_ms, full_peak, expected = measure(
+            pages, lambda html: full.extract_fields(html, DEFAULT_SELECTORS)
+        )
+        part_ms, part_peak, actual = measure(
+            pages, lambda html: partial.extract_fields(html, DEFAULT_SELECTORS)
+        )
+        print(f"{label}: {len(pages)} pages of {mb:.2f} MB, {full.parser}")
+        print(f"  full parse    : {full_ms:9.1f} ms/page  peak {full_peak:8.1f} MiB")
+        print(f"  partial parse : {part_ms:9.1f} ms/page  peak {part_peak:8.1f} MiB")
+        print(f"  speed-up      : {full_ms / part_ms:9.2f}x  memory {full_peak / part_peak:.2f}x less")
+        print(f"  identical     : {expected == actual}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare sequential ``scrape`` with concurrent ``scrape_many``.
+
+A local HTTP server that adds a fixed latency to every response stands in for
+remote sites, so the numbers reflect I/O overlap rather than network noise::
+
+    python -m benchmarks.bench_scrape_many --pages 200 --latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+def start_server(latency: float) -> ThreadingHTTPServer:
+    """Start a local server that sleeps ``latency`` seconds per request."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+            time.sleep(latency)
+            body = f"<html><body><p>{self.path}</p></body></html>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    server = start_server(args.latency)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/page/{i}" for i in range(args.pages)]
+    engine = ScraperEngine(config={"delay": 0, "retries": 1})
+
+    start = time.perf_counter()
+    for url in urls:
+        engine.scrape(url)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in engine.scrape_many(urls, concurrency=args.concurrency):
+        pass
+    concurrent = time.perf_counter() - start
+
+    print(f"sequential : {args.pages / sequential:8.1f} pages/sec")
+    print(f"scrape_many: {args.pages / concurrent:8.1f} pages/sec "
+          f"(concurrency={args.concurrency})")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare streaming sitemap parsing with building the whole tree.
+
+Writes a gzipped sitemap with ``--urls`` entries and reports throughput
+and peak traced memory of :func:`iter_sitemap` against ``ET.parse``::
+
+    python -m benchmarks.bench_sitemap --urls 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from typing import Callable
+
+from cinder_web_scraper.crawling.sitemap import iter_sitemap
+
+NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def write_sitemap(path: str, urls: int) -> None:
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        handle.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{NS}">\n')
+        for i in range(urls):
+            handle.write(
+                f"<url><loc>https://example.com/products/{i}</loc>"
+                f"<lastmod>2024-01-{i % 28 + 1:02d}</lastmod></url>\n"
+            )
+        handle.write("</urlset>\n")
+
+
+def streaming(path: str) -> int:
+    with open(path, "rb") as handle:
+        return sum(1 for _ in iter_sitemap(handle))
+
+
+def full_tree(path: str) -> int:
+    with gzip.open(path, "rb") as handle:
+        root = ET.parse(handle).getroot()
+    return len(root.findall(f"{{{NS}}}url/{{{NS}}}loc"))
+
+
+def measure(name: str, func: Callable[[str], int], path: str) -> None:
+    start = time.perf_counter()
+    count = func(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10}: {count / elapsed:10.0f} URLs/s  peak {peak / 2**20:8.2f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=500_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sitemap.xml.gz")
+        write_sitemap(path, args.urls)
+        print(f"{args.urls} URLs, {os.path.getsize(path) / 2**20:.1f} MiB gzipped")
+        measure("streaming", streaming, path)
+        measure("ET.parse", full_tree, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare tree-based and streaming ``extract_structured``.
+
+Reports time per page and peak traced memory for the ``BeautifulSoup``
+tree (with the configured backend) and the tree-free
+``StructuredParser``::
+
+    python -m benchmarks.bench_structured --pages 20
+    python -m benchmarks.bench_structured --corpus path/to/saved/pages
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+
+from .bench_extraction import load_corpus, synthetic_page
+
+
+def measure(pages: List[str], run: Callable[[str], object]) -> Tuple[float, float, list]:
+    """Return ms per page, peak traced MiB for the first page and results."""
+    start = time.perf_counter()
+    results = [run(html) for html in pages]
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run(pages[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000 / len(pages), peak / 2**20, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--parser", default="html.parser", help="tree backend")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    pages = load_corpus(args.corpus) if args.corpus else [
+        synthetic_page(i) for i in range(args.pages)
+    ]
+    tree = ContentExtractor(args.parser)
+    streaming = ContentExtractor(args.parser, streaming=True)
+
+    tree_ms, tree_peak, expected = measure(pages, tree.extract_structured)
+    stream_ms, stream_peak, actual = measure(pages, streaming.extract_structured)
+
+    print(f"{len(pages)} pages, tree backend {tree.parser}")
+    print(f"tree      : {tree_ms:8.2f} ms/page  peak {tree_peak:7.2f} MiB")
+    print(f"streaming : {stream_ms:8.2f} ms/page  peak {stream_peak:7.2f} MiB")
+    print(f"speed-up  : {tree_ms / stream_ms:8.2f}x")
+    print(f"identical : {expected == actual}")
+
+
+if __name__ == "__main__":
+    main()
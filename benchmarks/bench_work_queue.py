@@ -0,0 +1,67 @@
+"""Measure WorkQueue claim throughput for several batch and process counts.
+
+Every process claims batches and completes them until the queue is empty,
+so each item costs one claim and one completion transaction share::
+
+    python -m benchmarks.bench_work_queue --items 20000 --processes 1,4
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+
+from cinder_web_scraper.scheduling.work_queue import WorkQueue
+
+
+def drain(db_path: str, batch: int) -> int:
+    logging.disable(logging.INFO)
+    claimed = 0
+    with WorkQueue(db_path) as queue:
+        while True:
+            items = queue.claim(batch)
+            if not items:
+                return claimed
+            claimed += len(items)
+            queue.complete(items)
+
+
+def run(items: int, batch: int, processes: int, wal: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "queue.db")
+        with WorkQueue(db_path, wal=wal) as queue:
+            queue.put_many(f"https://example.com/{i}" for i in range(items))
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(processes) as pool:
+            # Start the workers before timing.
+            pool.map(abs, range(processes))
+            start = time.perf_counter()
+            claimed = sum(pool.starmap(drain, [(db_path, batch)] * processes))
+            elapsed = time.perf_counter() - start
+    assert claimed == items
+    return items / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--batches", default="1,10,100")
+    parser.add_argument("--processes", default="1,4")
+    parser.add_argument("--no-wal", action="store_true", help="use a rollback journal")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{args.items} items, wal={not args.no_wal}")
+    print(f"{'batch':>5}  {'processes':>9}  {'claims/s':>9}")
+    for batch in (int(n) for n in args.batches.split(",")):
+        for processes in (int(n) for n in args.processes.split(",")):
+            rate = run(args.items, batch, processes, not args.no_wal)
+            print(f"{batch:>5}  {processes:>9}  {rate:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Fixed-size Bloom filter used as the crawler's seen-set."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+from typing import List, Union
+
+
+class BloomFilter:
+    """Probabilistic set of strings (or bytes) with a fixed memory footprint.
+
+    Membership tests never give false negatives; false positives occur at
+    about ``error_rate`` once ``capacity`` items have been added. The bit
+    array is sized up front, so memory does not grow with the number of
+    URLs seen (roughly 1.8 MiB per million items at a 0.1% error rate).
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001) -> None:
+        """Create an empty filter.
+
+        Args:
+            capacity: Expected number of distinct items.
+            error_rate: Acceptable false positive probability at ``capacity``.
+        """
+        capacity = max(1, int(capacity))
+        error_rate = min(max(float(error_rate), 1e-12), 0.5)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, item: Union[str, bytes]) -> List[int]:
+        if isinstance(item, str):
+            item = item.encode("utf-8")
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        # Kirsch-Mitzenmacher double hashing.
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: Union[str, bytes]) -> bool:
+        """Add ``item`` and return ``True`` if it was not (probably) present."""
+        positions = self._positions(item)
+        with self._lock:
+            added = False
+            for pos in positions:
+                mask = 1 << (pos & 7)
+                if not self._bits[pos >> 3] & mask:
+                    self._bits[pos >> 3] |= mask
+                    added = True
+            if added:
+                self._count += 1
+            return added
+
+    def __contains__(self, item: Union[str, bytes]) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item)
+        )
+
+    def __len__(self) -> int:
+        """Number of distinct items added (lower bound due to false positives)."""
+        return self._count
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by the bit array."""
+        return len(self._bits)
@@ -0,0 +1,185 @@
+"""Append-only checkpoints of a crawl pass for resuming after a crash."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import IO, Any, Callable, Dict, Iterator, Mapping, Optional, Set, Tuple
+
+from cinder_web_scraper.scraping.rate_limiter import HostRateLimiter
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+
+class CheckpointState:
+    """Run state replayed from a checkpoint file.
+
+    ``pending`` maps every queued URL to its ``(depth, site)``, in queue
+    order; ``finished`` holds the URLs that were handed to the consumer and
+    ``failed`` those of them that could not be scraped. ``limits`` is the
+    last :meth:`HostRateLimiter.limits` snapshot.
+    """
+
+    def __init__(self) -> None:
+        self.pending: Dict[str, Tuple[int, int]] = {}
+        self.finished: Set[str] = set()
+        self.failed: Set[str] = set()
+        self.limits: Dict[str, Dict[str, float]] = {}
+
+    def remaining(self) -> Iterator[Tuple[str, int, int]]:
+        """Yield ``(url, depth, site)`` of queued URLs that did not finish."""
+        for url, (depth, site) in self.pending.items():
+            if url not in self.finished:
+                yield url, depth, site
+
+    def site_pages(self) -> Dict[int, int]:
+        """Return how many pages of every site were taken from the queue."""
+        pages: Dict[int, int] = {}
+        for url in self.finished:
+            site = self.pending.get(url, (0, 0))[1]
+            pages[site] = pages.get(site, 0) + 1
+        return pages
+
+
+class Checkpoint:
+    """Record the progress of a crawl pass in an append-only JSON lines file.
+
+    Each event is one short line: ``{"p": url, "d": depth, "s": site}`` when
+    a URL is queued, ``{"c": url}`` once its result was consumed (and so
+    saved), ``{"f": url}`` when it failed and ``{"l": limits}`` with the rate limiter
+    state. Lines are buffered and written out by :meth:`maybe_flush` at most
+    every ``interval`` seconds, so checkpointing costs one small append per
+    interval however large the run is. A line cut short by a crash is
+    ignored by :meth:`load`.
+
+    Resuming (``state`` given) first rewrites the file with only the
+    replayed state, so it does not grow across restarts.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/crawl_checkpoint.jsonl",
+        interval: float = 5.0,
+        state: Optional[CheckpointState] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Open the checkpoint file.
+
+        Args:
+            path: Location of the checkpoint file.
+            interval: Seconds between flushes to disk.
+            state: Replayed state of the pass being resumed. Without it the
+                file is started afresh.
+            clock: Monotonic time source, mainly useful for tests.
+        """
+        self.path = path
+        self.interval = float(interval)
+        self._clock = clock
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if state is not None:
+            self._compact(state)
+        self._file: IO[str] = open(path, "a" if state is not None else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._flushed = clock()
+
+    @staticmethod
+    def load(path: str) -> CheckpointState:
+        """Replay the checkpoint at ``path`` (an empty state if it is missing)."""
+        state = CheckpointState()
+        try:
+            fp = open(path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return state
+        with fp:
+            for number, line in enumerate(fp, 1):
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Ignoring damaged checkpoint line {number} in {path}")
+                    continue
+                if "p" in event:
+                    state.pending.setdefault(event["p"], (event.get("d", 0), event.get("s", 0)))
+                elif "c" in event:
+                    state.finished.add(event["c"])
+                    state.failed.discard(event["c"])
+                elif "f" in event:
+                    state.finished.add(event["f"])
+                    state.failed.add(event["f"])
+                elif "l" in event:
+                    state.limits = event["l"]
+        return state
+
+    def _compact(self, state: CheckpointState) -> None:
+        """Atomically replace the file with the events needed to rebuild ``state``."""
+        temporary = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as fp:
+            for url, (depth, site) in state.pending.items():
+                fp.write(_line(_pending(url, depth, site)))
+            for url in state.finished:
+                fp.write(_line({"f" if url in state.failed else "c": url}))
+            if state.limits:
+                fp.write(_line({"l": state.limits}))
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temporary, self.path)
+
+    def _write(self, event: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._file.write(_line(event))
+
+    def pending(self, url: str, depth: int = 0, site: int = 0) -> None:
+        """Record that ``url`` was queued."""
+        self._write(_pending(url, depth, site))
+
+    def finished(self, url: str, ok: bool = True) -> None:
+        """Record that ``url`` completed or, with ``ok`` false, failed."""
+        self._write({"c" if ok else "f": url})
+
+    def maybe_flush(self, limiter: Optional[HostRateLimiter] = None) -> bool:
+        """Flush if ``interval`` elapsed, recording ``limiter`` state first."""
+        if self._clock() - self._flushed < self.interval:
+            return False
+        self.flush(limiter)
+        return True
+
+    def flush(self, limiter: Optional[HostRateLimiter] = None) -> None:
+        """Write buffered events (and ``limiter`` state) to disk."""
+        if limiter is not None:
+            self._write({"l": limiter.limits()})
+        with self._lock:
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError as exc:
+                logger.error(f"Failed to write checkpoint {self.path}: {exc}")
+            self._flushed = self._clock()
+
+    def close(self, limiter: Optional[HostRateLimiter] = None) -> None:
+        """Flush and close the file."""
+        if self._file.closed:
+            return
+        self.flush(limiter)
+        self._file.close()
+
+    def __enter__(self) -> "Checkpoint":
+        """Return the checkpoint for context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Flush and close the file when exiting a ``with`` block."""
+        self.close()
+
+
+def _pending(url: str, depth: int, site: int) -> Dict[str, Any]:
+    event: Dict[str, Any] = {"p": url}
+    # Zero is the common case; leave it out to keep lines short.
+    if depth:
+        event["d"] = depth
+    if site:
+        event["s"] = site
+    return event
+
+
+def _line(event: Mapping[str, Any]) -> str:
+    return json.dumps(event, separators=(",", ":"), ensure_ascii=False) + "\n"
@@ -0,0 +1,360 @@
+"""Link-following crawler built on :class:`ScraperEngine`."""
+
+from __future__ import annotations
+
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from cinder_web_scraper.scraping.rate_limiter import host_of
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+from .bloom_filter import BloomFilter
+from .checkpoint import Checkpoint, CheckpointState
+from .frontier import Frontier
+from .sitemap import SitemapSource
+
+# Settings a ``websites.json`` entry may override in its ``crawl`` mapping.
+SITE_SETTINGS = (
+    "max_depth",
+    "max_pages",
+    "same_domain",
+    "allowed_domains",
+    "allow_patterns",
+    "deny_patterns",
+)
+
+
+class CrawlResult(NamedTuple):
+    """A crawled page. ``record`` is ``None`` if it could not be scraped."""
+
+    url: str
+    depth: int
+    record: Optional[Dict[str, Any]]
+
+
+class SiteRules:
+    """Depth, page and link filters of one crawled site."""
+
+    def __init__(
+        self,
+        seed: str,
+        max_depth: int = 2,
+        max_pages: int = 1000,
+        same_domain: bool = True,
+        allowed_domains: Iterable[str] = (),
+        allow_patterns: Iterable[str] = (),
+        deny_patterns: Iterable[str] = (),
+    ) -> None:
+        """Create rules for the site starting at ``seed``.
+
+        Args:
+            seed: Start URL of the site.
+            max_depth: Largest link distance from ``seed`` that is fetched.
+            max_pages: Largest number of pages fetched for the site.
+            same_domain: Only follow links to the host of ``seed`` (and
+                ``allowed_domains``).
+            allowed_domains: Extra domains to follow, including subdomains.
+            allow_patterns: Regular expressions of which a followed URL must
+                match at least one (when any are given).
+            deny_patterns: Regular expressions excluding matching URLs.
+        """
+        self.seed = seed
+        self.max_depth = int(max_depth)
+        self.max_pages = int(max_pages)
+        self.same_domain = bool(same_domain)
+        self.domains = {host_of(seed)} | {d.lower().lstrip(".") for d in allowed_domains}
+        self.allow: List[Pattern[str]] = [re.compile(p) for p in allow_patterns]
+        self.deny: List[Pattern[str]] = [re.compile(p) for p in deny_patterns]
+        self.pages = 0
+
+    @classmethod
+    def for_site(
+        cls, site: Union[str, Mapping[str, Any]], defaults: Mapping[str, Any]
+    ) -> "SiteRules":
+        """Build rules from a URL or ``websites.json`` entry and ``defaults``."""
+        if isinstance(site, str):
+            site = {"url": site}
+        settings = {key: defaults[key] for key in SITE_SETTINGS if key in defaults}
+        settings.update(
+            (key, value)
+            for key, value in (site.get("crawl") or {}).items()
+            if key in SITE_SETTINGS
+        )
+        return cls(site["url"], **settings)
+
+    @property
+    def exhausted(self) -> bool:
+        """``True`` once ``max_pages`` pages have been scheduled."""
+        return self.pages >= self.max_pages
+
+    def allows(self, url: str, depth: int) -> bool:
+        """Return ``True`` if ``url`` found at ``depth`` should be crawled."""
+        if depth > self.max_depth:
+            return False
+        if self.same_domain:
+            host = host_of(url)
+            if not any(host == d or host.endswith("." + d) for d in self.domains):
+                return False
+        if self.allow and not any(p.search(url) for p in self.allow):
+            return False
+        return not any(p.search(url) for p in self.deny)
+
+
+def resolve_link(base: str, href: str) -> Optional[str]:
+    """Return the absolute, fragment-free HTTP(S) URL of ``href`` or ``None``."""
+    url, _ = urldefrag(urljoin(base, href.strip()))
+    if urlsplit(url).scheme not in ("http", "https"):
+        return None
+    return url
+
+
+class Crawler:
+    """Breadth-first (by default) crawl of one or more sites.
+
+    Seeds and discovered links are kept in a :class:`Frontier` whose memory
+    use is bounded, and a :class:`BloomFilter` remembers every URL ever
+    queued, so crawls of millions of URLs run in constant memory. Pages are
+    fetched in waves through :meth:`ScraperEngine.scrape_many`, keeping the
+    engine's per-host rate limits, retries, circuit breaker and dedup index,
+    and links come from :meth:`ContentExtractor.extract_structured`. URLs
+    are canonicalized with the engine's :class:`UrlNormalizer` before the
+    seen check, so variants of one page are fetched once. Sitemaps added
+    with :meth:`add_sitemap` (or a site's ``sitemap`` key) are read lazily,
+    one wave at a time, and a page's ``lastmod`` is only stored once it was
+    crawled.
+
+    Crawl settings are read from ``engine.config["crawl"]``: ``max_depth``,
+    ``max_pages``, ``same_domain``, ``allowed_domains``, ``allow_patterns``
+    and ``deny_patterns`` (overridable per site through a ``crawl`` mapping
+    in ``websites.json``), plus ``frontier_path``, ``frontier_memory``,
+    ``expected_urls``, ``false_positive_rate`` and ``sitemap_state`` (the
+    SQLite file used to skip sitemap URLs whose ``lastmod`` is unchanged).
+
+    With a :class:`Checkpoint` every queued and finished URL is appended to
+    its file, together with the rate limiter state, and :meth:`resume`
+    continues an interrupted crawl from a replayed :class:`CheckpointState`.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[ScraperEngine] = None,
+        config: Optional[Mapping[str, Any]] = None,
+        priority: Optional[Callable[[str, int], float]] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> None:
+        """Create a crawler.
+
+        Args:
+            engine: Engine used to download pages.
+            config: Crawl settings; defaults to ``engine.config["crawl"]``.
+            priority: Optional ``(url, depth) -> float`` function; lower
+                values are crawled first. Defaults to the depth.
+            checkpoint: Optional checkpoint recording the crawl's progress.
+        """
+        self.engine = engine or ScraperEngine()
+        self.config: Mapping[str, Any] = (
+            config if config is not None else self.engine.config.get("crawl") or {}
+        )
+        self.priority = priority or (lambda url, depth: float(depth))
+        self.frontier = Frontier(
+            self.config.get("frontier_path", "data/crawl_frontier.db"),
+            int(self.config.get("frontier_memory", 100_000)),
+        )
+        self.seen = BloomFilter(
+            int(self.config.get("expected_urls", 1_000_000)),
+            float(self.config.get("false_positive_rate", 0.001)),
+        )
+        self.sites: List[SiteRules] = []
+        self.sitemaps = SitemapSource(self.engine, self.config.get("sitemap_state"))
+        # (URL iterator, site index) pairs still being read.
+        self._sources: List[Tuple[Iterator[str], int]] = []
+        # Links dropped because their canonical URL was already queued.
+        self.duplicates = 0
+        self.checkpoint = checkpoint
+        # Pages each site had fetched before a resumed crawl, by site index.
+        self._resumed_pages: Dict[int, int] = {}
+
+    def add_site(self, site: Union[str, Mapping[str, Any]]) -> SiteRules:
+        """Queue the seed of ``site`` (a URL or ``websites.json`` entry).
+
+        The pages of a ``sitemap`` URL listed in the entry are queued too.
+        """
+        rules = SiteRules.for_site(site, self.config)
+        rules.pages = self._resumed_pages.get(len(self.sites), 0)
+        self.sites.append(rules)
+        seed = self.engine.url_normalizer.normalize(rules.seed)
+        self._enqueue(seed, 0, len(self.sites) - 1)
+        if isinstance(site, Mapping) and site.get("sitemap"):
+            self._sources.append((self.sitemaps.urls(site["sitemap"]), len(self.sites) - 1))
+        return rules
+
+    def add_sitemap(
+        self, sitemap_url: str, site: Union[str, Mapping[str, Any], None] = None
+    ) -> SiteRules:
+        """Crawl the pages listed in ``sitemap_url`` as depth-0 seeds.
+
+        Args:
+            sitemap_url: Sitemap or sitemap index URL.
+            site: URL or ``websites.json`` entry whose rules apply; defaults
+                to the sitemap's own site.
+        """
+        rules = SiteRules.for_site(site or sitemap_url, self.config)
+        rules.pages = self._resumed_pages.get(len(self.sites), 0)
+        self.sites.append(rules)
+        self._sources.append((self.sitemaps.urls(sitemap_url), len(self.sites) - 1))
+        return rules
+
+    def _read_sitemaps(self, wanted: int) -> None:
+        """Move sitemap URLs into the frontier until it holds ``wanted`` entries."""
+        while self._sources and len(self.frontier) < wanted:
+            urls, site = self._sources[0]
+            rules = self.sites[site]
+            url = None if rules.exhausted else next(urls, None)
+            if url is None:
+                self._sources.pop(0)
+                continue
+            url = self.engine.url_normalizer.normalize(url)
+            if not rules.allows(url, 0):
+                self.sitemaps.processed(url, ok=False)
+            elif not self._enqueue(url, 0, site):
+                self.sitemaps.duplicate(url)
+
+    def _enqueue(self, url: str, depth: int, site: int) -> bool:
+        """Queue canonical ``url`` unless it was seen before."""
+        if not self.seen.add(url):
+            self.duplicates += 1
+            return False
+        self.frontier.push(url, self.priority(url, depth), depth, site)
+        if self.checkpoint is not None:
+            self.checkpoint.pending(url, depth, site)
+        return True
+
+    def resume(self, state: CheckpointState) -> int:
+        """Continue the crawl recorded in ``state``.
+
+        Call this before adding the sites, in the same order as the
+        interrupted crawl. Every URL it queued is marked as seen, the
+        unfinished ones are queued again, per-site page counts and the
+        engine's rate limiter state are restored, and unfinished URLs are
+        released from the engine's dedup index so they are fetched again.
+
+        Returns:
+            The number of URLs queued again.
+        """
+        for url in state.finished:
+            self.seen.add(url)
+        requeued = 0
+        for url, depth, site in state.remaining():
+            self.seen.add(url)
+            self.frontier.push(url, self.priority(url, depth), depth, site)
+            if self.engine.dedup_index is not None:
+                self.engine.dedup_index.release(url)
+            requeued += 1
+        self._resumed_pages = state.site_pages()
+        if state.limits:
+            self.engine.rate_limiter.restore(state.limits)
+        logger.log(
+            f"Resuming crawl: {len(state.finished)} pages done, {requeued} queued"
+        )
+        return requeued
+
+    def crawl(
+        self, sites: Iterable[Union[str, Mapping[str, Any]]] = ()
+    ) -> Iterator[CrawlResult]:
+        """Crawl ``sites`` (plus any added earlier) and yield every page.
+
+        Results are yielded as pages complete. Links of a page are queued
+        when it is yielded, subject to the rules of the site it belongs to.
+        A page is recorded as finished in the :attr:`checkpoint` only once
+        the caller asks for the next result, i.e. after it was handled.
+        """
+        for site in sites:
+            self.add_site(site)
+
+        wave_size = max(1, self.engine.concurrency * 4)
+        while True:
+            self._read_sitemaps(wave_size)
+            batch: Dict[str, Any] = {}
+            while len(batch) < wave_size:
+                entry = self.frontier.pop()
+                if entry is None:
+                    break
+                rules = self.sites[entry.site]
+                if rules.exhausted:
+                    self.sitemaps.processed(entry.url, ok=False)
+                    continue
+                rules.pages += 1
+                batch[entry.url] = entry
+            if not batch:
+                self.sitemaps.finish()
+                if self.checkpoint is not None:
+                    self.checkpoint.flush(self.engine.rate_limiter)
+                self._report()
+                return
+
+            for url, html in self.engine.scrape_many(batch):
+                entry = batch[url]
+                record = None
+                if html is not None:
+                    try:
+                        record = self.engine.extractor.extract_structured(html)
+                    except Exception as exc:  # pylint: disable=broad-except
+                        logger.error(f"Failed to extract links from {url}: {exc}")
+                if record is not None:
+                    self._follow(url, entry.depth + 1, entry.site, record["links"])
+                yield CrawlResult(url, entry.depth, record)
+                self.sitemaps.processed(url, record is not None)
+                if self.checkpoint is not None:
+                    self.checkpoint.finished(url, record is not None)
+                    self.checkpoint.maybe_flush(self.engine.rate_limiter)
+
+    def _follow(self, base: str, depth: int, site: int, links: Iterable[str]) -> None:
+        rules = self.sites[site]
+        if depth > rules.max_depth or rules.exhausted:
+            return
+        for href in links:
+            url = resolve_link(base, href)
+            if url is None:
+                continue
+            url = self.engine.url_normalizer.normalize(url)
+            if rules.allows(url, depth):
+                self._enqueue(url, depth, site)
+
+    def _report(self) -> None:
+        """Log how many fetches deduplication saved."""
+        message = f"Crawl finished; skipped {self.duplicates} duplicate links"
+        if self.engine.dedup_index is not None:
+            saved = self.engine.dedup_index.stats()["saved"]
+            message += f" and {saved} already fetched URLs"
+        logger.log(message)
+
+    def close(self) -> None:
+        """Release the frontier's and sitemap state's SQLite connections."""
+        for urls, _ in self._sources:
+            urls.close()  # type: ignore[attr-defined]
+        self._sources.clear()
+        self.frontier.close()
+        self.sitemaps.close()
+
+    def __enter__(self) -> "Crawler":
+        """Return the crawler for context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Close the frontier when exiting a ``with`` block."""
+        self.close()
@@ -0,0 +1,169 @@
+"""Priority-queue crawl frontier that spills to SQLite."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import sqlite3
+from typing import List, NamedTuple, Optional, Tuple
+
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+
+class FrontierEntry(NamedTuple):
+    """A URL waiting to be crawled."""
+
+    priority: float
+    seq: int
+    url: str
+    depth: int
+    site: int
+
+
+class Frontier:
+    """Priority queue of URLs with a bounded in-memory part.
+
+    Entries with the lowest ``priority`` are popped first, ties in insertion
+    order. At most ``max_in_memory`` entries live in a heap; when it fills
+    up the larger half is moved to a SQLite table, and the heap is refilled
+    from disk once it runs empty. Every entry in memory has a priority no
+    larger than any entry on disk, so the order is exact.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/crawl_frontier.db",
+        max_in_memory: int = 100_000,
+        batch_size: int = 1000,
+    ) -> None:
+        """Open the frontier, discarding entries left by a previous crawl.
+
+        Args:
+            db_path: Location of the SQLite spill file.
+            max_in_memory: Largest number of entries kept in the heap.
+            batch_size: Number of disk-bound entries buffered before they
+                are written in one transaction.
+        """
+        self.db_path = db_path
+        self.max_in_memory = max(2, int(max_in_memory))
+        self.batch_size = max(1, int(batch_size))
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path)
+        self._init_db()
+        self._heap: List[FrontierEntry] = []
+        self._pending: List[FrontierEntry] = []
+        self._on_disk = 0
+        # Smallest (priority, seq) stored on disk or pending, if any.
+        self._disk_min: Optional[Tuple[float, int]] = None
+        self._seq = itertools.count()
+
+    def _init_db(self) -> None:
+        """Create the spill table, emptying it if it already exists."""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS frontier (
+                    priority REAL NOT NULL,
+                    seq INTEGER NOT NULL,
+                    url TEXT NOT NULL,
+                    depth INTEGER NOT NULL,
+                    site INTEGER NOT NULL,
+                    PRIMARY KEY (priority, seq)
+                )
+                """
+            )
+            self.conn.execute("DELETE FROM frontier")
+
+    def push(self, url: str, priority: float = 0.0, depth: int = 0, site: int = 0) -> None:
+        """Add ``url`` to the frontier."""
+        entry = FrontierEntry(float(priority), next(self._seq), url, depth, site)
+        if self._disk_min is not None and entry[:2] > self._disk_min:
+            self._pending.append(entry)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            return
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > self.max_in_memory:
+            self._spill()
+
+    def pop(self) -> Optional[FrontierEntry]:
+        """Remove and return the entry with the lowest priority, or ``None``."""
+        if not self._heap and self._disk_min is not None:
+            self._refill()
+        if not self._heap:
+            return None
+        return heapq.heappop(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap) + len(self._pending) + self._on_disk
+
+    @property
+    def in_memory(self) -> int:
+        """Number of entries currently held in RAM."""
+        return len(self._heap) + len(self._pending)
+
+    def _spill(self) -> None:
+        """Move the larger half of the heap to disk."""
+        self._heap.sort()
+        keep = self.max_in_memory // 2
+        self._pending.extend(self._heap[keep:])
+        del self._heap[keep:]
+        # A sorted list is a valid heap.
+        self._flush()
+
+    def _flush(self) -> None:
+        """Write buffered disk-bound entries in a single transaction."""
+        if not self._pending:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO frontier (priority, seq, url, depth, site) VALUES (?, ?, ?, ?, ?)",
+                    self._pending,
+                )
+        except sqlite3.Error as exc:
+            logger.error(f"Failed to spill crawl frontier: {exc}")
+            raise
+        self._on_disk += len(self._pending)
+        smallest = min(entry[:2] for entry in self._pending)
+        if self._disk_min is None or smallest < self._disk_min:
+            self._disk_min = smallest
+        self._pending.clear()
+
+    def _refill(self) -> None:
+        """Load the lowest-priority half of the heap capacity from disk."""
+        self._flush()
+        limit = max(1, self.max_in_memory // 2)
+        with self.conn:
+            rows = self.conn.execute(
+                "SELECT priority, seq, url, depth, site FROM frontier "
+                "ORDER BY priority, seq LIMIT ?",
+                (limit,),
+            ).fetchall()
+            if rows:
+                last = rows[-1]
+                self.conn.execute(
+                    "DELETE FROM frontier WHERE priority < ? OR (priority = ? AND seq <= ?)",
+                    (last[0], last[0], last[1]),
+                )
+        self._heap = [FrontierEntry(*row) for row in rows]
+        self._on_disk -= len(rows)
+        row = self.conn.execute(
+            "SELECT priority, seq FROM frontier ORDER BY priority, seq LIMIT 1"
+        ).fetchone()
+        self._disk_min = tuple(row) if row else None  # type: ignore[assignment]
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "Frontier":
+        """Return the frontier for context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Close the SQLite connection when exiting a ``with`` block."""
+        self.close()
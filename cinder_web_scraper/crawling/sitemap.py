@@ -0,0 +1,326 @@
+"""Streaming ``sitemap.xml`` reader for feeding the scrape pipeline."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import os
+import sqlite3
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import IO, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from requests.exceptions import RequestException
+
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+GZIP_MAGIC = b"\x1f\x8b"
+# Sitemap indexes may nest; deeper chains are almost certainly loops.
+MAX_INDEX_DEPTH = 5
+
+
+class SitemapEntry(NamedTuple):
+    """A ``<url>`` or ``<sitemap>`` element.
+
+    ``lastmod`` is a POSIX timestamp, or ``None`` if missing or invalid.
+    """
+
+    kind: str
+    loc: str
+    lastmod: Optional[float]
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """Convert a W3C datetime (``2024-05-01``, ``2024-05-01T10:00:00Z``, ...)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    try:
+        if len(value) == 4:
+            parsed = datetime(int(value), 1, 1)
+        elif len(value) == 7:
+            parsed = datetime(int(value[:4]), int(value[5:7]), 1)
+        else:
+            parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from ``tag``."""
+    return tag.rpartition("}")[2]
+
+
+def iter_sitemap(source: IO[bytes]) -> Iterator[SitemapEntry]:
+    """Yield the entries of a sitemap or sitemap index read from ``source``.
+
+    The document is parsed incrementally and every finished entry is
+    removed from the tree, so memory use does not depend on its size.
+    Gzip-compressed input is detected and decompressed on the fly. Only
+    ``<loc>`` and ``<lastmod>`` directly inside an entry count, so those of
+    extensions such as ``<image:image><image:loc>`` are ignored.
+    """
+    buffered = io.BufferedReader(source) if not hasattr(source, "peek") else source
+    if buffered.peek(2)[:2] == GZIP_MAGIC:  # type: ignore[union-attr]
+        buffered = gzip.GzipFile(fileobj=buffered)  # type: ignore[assignment]
+
+    root = None
+    loc: Optional[str] = None
+    lastmod: Optional[str] = None
+    local_names: Dict[str, str] = {}
+    # Nesting level of the current element; the root is 1, entries are 2.
+    depth = 0
+    for event, elem in ET.iterparse(buffered, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        tag = local_names.get(elem.tag)
+        if tag is None:
+            tag = local_names[elem.tag] = _local(elem.tag)
+        if depth == 2 and tag == "loc":
+            loc = (elem.text or "").strip()
+        elif depth == 2 and tag == "lastmod":
+            lastmod = elem.text
+        elif depth == 1 and tag in ("url", "sitemap"):
+            if loc:
+                yield SitemapEntry(tag, loc, parse_lastmod(lastmod))
+            loc = lastmod = None
+            # Drop finished entries so the tree never grows.
+            root.clear()  # type: ignore[union-attr]
+
+
+class _Reading:
+    """A sitemap being read and how many of its pages and children are unfinished."""
+
+    def __init__(self, entry: Optional[SitemapEntry], parent: Optional["_Reading"]) -> None:
+        self.entry = entry
+        self.parent = parent
+        self.outstanding = 0
+        self.read = False
+        self.failed = False
+        self.settled = False
+
+
+class SitemapSource:
+    """Lazily yield page URLs from sitemaps, following sitemap indexes.
+
+    Sitemaps are downloaded with the engine's session (respecting its
+    per-host rate limit) and parsed with :func:`iter_sitemap`. When a
+    ``state_path`` is given, the ``lastmod`` of a yielded URL is stored in
+    SQLite once the consumer reports it with :meth:`processed`, and URLs
+    whose ``lastmod`` has not advanced since a previous run are skipped.
+    Child sitemaps of an index are skipped the same way once they were read
+    to the end and all of their pages were processed.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[ScraperEngine] = None,
+        state_path: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> None:
+        """Create a source.
+
+        Args:
+            engine: Engine whose session and rate limiter fetch sitemaps.
+            state_path: SQLite file remembering ``lastmod`` values. Without
+                it every URL is yielded.
+            batch_size: Number of ``lastmod`` updates written per transaction.
+        """
+        self.engine = engine or ScraperEngine()
+        self.batch_size = max(1, int(batch_size))
+        self.conn: Optional[sqlite3.Connection] = None
+        if state_path:
+            if state_path != ":memory:":
+                os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+            self.conn = sqlite3.connect(state_path)
+            self._init_db()
+        self._pending: List[Tuple[str, float]] = []
+        # Yielded pages awaiting :meth:`processed`, by canonical URL.
+        self._outstanding: Dict[str, Tuple[SitemapEntry, _Reading]] = {}
+        # Outstanding pages the consumer already had from another source.
+        self._duplicates: Set[str] = set()
+        self._stats = {"urls": 0, "unchanged": 0, "sitemaps": 0, "errors": 0}
+
+    def _init_db(self) -> None:
+        """Create required tables if they don't exist."""
+        with self.conn:  # type: ignore[union-attr]
+            self.conn.execute(  # type: ignore[union-attr]
+                """
+                CREATE TABLE IF NOT EXISTS lastmod (
+                    loc TEXT PRIMARY KEY,
+                    lastmod REAL NOT NULL
+                )
+                """
+            )
+
+    def urls(self, sitemap_url: str) -> Iterator[str]:
+        """Yield the page URLs listed by ``sitemap_url`` and any nested sitemaps."""
+        try:
+            yield from self._walk(sitemap_url, 0, _Reading(None, None))
+        finally:
+            self._flush()
+
+    def processed(self, url: str, ok: bool = True) -> None:
+        """Report that the page ``url`` yielded by :meth:`urls` was handled.
+
+        Its ``lastmod`` is stored only when ``ok`` is true, so pages that
+        failed (or were never fetched) are yielded again by the next run.
+        URLs that were not yielded by this source are ignored.
+        """
+        if self.conn is None:
+            return
+        key = self.engine.url_normalizer.normalize(url)
+        self._duplicates.discard(key)
+        item = self._outstanding.pop(key, None)
+        if item is None:
+            return
+        entry, reading = item
+        if ok:
+            self._record(entry)
+        else:
+            reading.failed = True
+        reading.outstanding -= 1
+        self._settle(reading)
+
+    def duplicate(self, url: str) -> None:
+        """Report that the consumer already had the yielded page ``url``.
+
+        If its earlier copy is still queued, that copy reports the outcome
+        with :meth:`processed`. Otherwise the page was handled before the
+        sitemap listed it, and :meth:`finish` records it.
+        """
+        key = self.engine.url_normalizer.normalize(url)
+        if key in self._outstanding:
+            self._duplicates.add(key)
+
+    def finish(self) -> None:
+        """Record duplicate pages that are still outstanding once the consumer is done."""
+        for key in list(self._duplicates):
+            self.processed(key)
+        self._flush()
+
+    def _settle(self, reading: Optional[_Reading]) -> None:
+        """Record sitemaps whose pages and children all finished successfully."""
+        while (
+            reading is not None
+            and reading.read
+            and not reading.failed
+            and not reading.settled
+            and reading.outstanding == 0
+        ):
+            if reading.entry is not None:
+                self._record(reading.entry)
+            reading.settled = True
+            reading = reading.parent
+            if reading is not None:
+                reading.outstanding -= 1
+
+    def _walk(self, sitemap_url: str, depth: int, reading: _Reading) -> Iterator[str]:
+        errors = self._stats["errors"]
+        children: List[SitemapEntry] = []
+        for entry in self._entries(sitemap_url):
+            if entry.kind == "sitemap":
+                if depth >= MAX_INDEX_DEPTH:
+                    logger.warning(f"Ignoring sitemap nested too deeply: {entry.loc}")
+                elif not self._unchanged(entry):
+                    # Index files are small; read pages only after closing them.
+                    children.append(entry)
+            elif self._unchanged(entry):
+                self._stats["unchanged"] += 1
+            else:
+                if self.conn is not None:
+                    key = self.engine.url_normalizer.normalize(entry.loc)
+                    if key not in self._outstanding:
+                        self._outstanding[key] = (entry, reading)
+                        reading.outstanding += 1
+                self._stats["urls"] += 1
+                yield entry.loc
+        if self._stats["errors"] != errors:
+            reading.failed = True
+
+        for child in children:
+            reading.outstanding += 1
+            yield from self._walk(child.loc, depth + 1, _Reading(child, reading))
+        reading.read = True
+        self._settle(reading)
+
+    def _entries(self, sitemap_url: str) -> Iterator[SitemapEntry]:
+        """Download ``sitemap_url`` and yield its entries."""
+        engine = self.engine
+        logger.log(f"Reading sitemap: {sitemap_url}")
+        self._stats["sitemaps"] += 1
+        response = None
+        try:
+            engine.rate_limiter.acquire(sitemap_url)
+            response = engine.session.get(sitemap_url, timeout=engine.timeout, stream=True)
+            response.raise_for_status()
+            # Undo Content-Encoding; a gzipped payload is handled by iter_sitemap.
+            response.raw.decode_content = True
+            # Keep reads at EOF returning b"" instead of failing on a closed file.
+            response.raw.auto_close = False
+            yield from iter_sitemap(response.raw)
+        except (RequestException, ET.ParseError, OSError, EOFError) as exc:
+            logger.error(f"Failed to read sitemap {sitemap_url}: {exc}")
+            self._stats["errors"] += 1
+        finally:
+            if response is not None:
+                response.close()
+
+    def _unchanged(self, entry: SitemapEntry) -> bool:
+        """``True`` if ``entry`` was seen before with the same or newer ``lastmod``."""
+        if self.conn is None or entry.lastmod is None:
+            return False
+        row = self.conn.execute(
+            "SELECT lastmod FROM lastmod WHERE loc = ?", (entry.loc,)
+        ).fetchone()
+        return row is not None and row[0] >= entry.lastmod
+
+    def _record(self, entry: SitemapEntry) -> None:
+        if self.conn is None or entry.lastmod is None:
+            return
+        self._pending.append((entry.loc, entry.lastmod))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write buffered ``lastmod`` values in a single transaction."""
+        if self.conn is None or not self._pending:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO lastmod (loc, lastmod) VALUES (?, ?) "
+                    "ON CONFLICT (loc) DO UPDATE SET lastmod = excluded.lastmod",
+                    self._pending,
+                )
+        except sqlite3.Error as exc:
+            logger.error(f"Failed to store sitemap state: {exc}")
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of yielded ``urls``, ``unchanged`` URLs, ``sitemaps`` and ``errors``."""
+        return dict(self._stats)
+
+    def close(self) -> None:
+        """Write pending state and close the SQLite connection."""
+        self._flush()
+        if self.conn is not None:
+            self.conn.close()
+
+    def __enter__(self) -> "SitemapSource":
+        """Return the source for context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Close the SQLite connection when exiting a ``with`` block."""
+        self.close()
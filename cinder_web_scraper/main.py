@@ -1,22 +1,94 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import logging
+import os
 import time
 import traceback
+from typing import List, Optional
 
+from cinder_web_scraper.crawling.checkpoint import Checkpoint
+from cinder_web_scraper.crawling.crawler import Crawler
 from cinder_web_scraper.gui.main_window import MainWindow
 from cinder_web_scraper.scheduling.schedule_manager import ScheduleManager
+from cinder_web_scraper.scraping.output_manager import OutputManager
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+from cinder_web_scraper.utils.config_manager import load_config
 from cinder_web_scraper.utils.logger import default_logger as logger
 
 
-def parse_arguments() -> argparse.Namespace:
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Cinder's Web Scraper")
     group = parser.add_mutually_exclusive_group()
     group.add_argument("--gui", action="store_true", help="Launch in GUI mode")
     group.add_argument("--cli", action="store_true", help="Launch in CLI mode")
+    group.add_argument("--crawl", action="store_true", help="Crawl the configured websites once")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
-    return parser.parse_args()
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the crawl recorded in the checkpoint (implies --crawl)",
+    )
+    parser.add_argument("--websites", default="data/websites.json", help="Websites to crawl")
+    parser.add_argument("--config", default="data/config.json", help="Engine settings")
+    parser.add_argument(
+        "--checkpoint", default="data/crawl_checkpoint.jsonl", help="Crawl checkpoint file"
+    )
+    parser.add_argument(
+        "--output-dir", default="crawl", help="Crawl output directory, relative to output/"
+    )
+    args = parser.parse_args(argv)
+    if args.resume and (args.gui or args.cli):
+        parser.error("--resume only applies to --crawl")
+    args.crawl = args.crawl or args.resume
+    return args
+
+
+def output_path(output_dir: str, url: str) -> str:
+    """Return the file a crawled ``url`` is saved to inside ``output_dir``."""
+    return os.path.join(output_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+
+def run_crawl(args: argparse.Namespace) -> int:
+    """Crawl the websites of ``args.websites``, checkpointing progress.
+
+    Every page is saved to its own JSON file before it is recorded as
+    finished, so the saved files are exactly the completed part of the
+    pass. With ``args.resume`` the pass recorded in ``args.checkpoint``
+    continues; otherwise the checkpoint is started afresh.
+
+    Returns:
+        The number of pages saved by this run.
+    """
+    config = load_config(args.config)
+    websites = load_config(args.websites)
+    if isinstance(websites, dict):
+        websites = websites.get("websites", [])
+    interval = float((config.get("crawl") or {}).get("checkpoint_interval", 5.0))
+    state = Checkpoint.load(args.checkpoint) if args.resume else None
+
+    # Per-site ``rate_limit`` and ``url_rules`` are read from the engine config.
+    engine = ScraperEngine(config={**config, "websites": websites})
+    output = OutputManager()
+    saved = 0
+    with Checkpoint(args.checkpoint, interval, state) as checkpoint, Crawler(
+        engine, checkpoint=checkpoint
+    ) as crawler:
+        if state is not None:
+            crawler.resume(state)
+        try:
+            for result in crawler.crawl(websites):
+                if result.record is not None and output.save(
+                    result.record, output_path(args.output_dir, result.url)
+                ):
+                    saved += 1
+        except KeyboardInterrupt:
+            logger.log("Crawl interrupted; continue it with --resume.")
+        finally:
+            checkpoint.flush(engine.rate_limiter)
+    logger.log(f"Crawl saved {saved} pages")
+    return saved
 
 
 def run_cli() -> None:
@@ -50,7 +122,9 @@ def main() -> None:
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    if args.cli:
+    if args.crawl:
+        run_crawl(args)
+    elif args.cli:
         run_cli()
     else:
         run_gui()
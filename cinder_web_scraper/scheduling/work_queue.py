@@ -0,0 +1,414 @@
+"""Durable SQLite work queue with leases, shared by several scraper processes."""
+
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from cinder_web_scraper.scraping.scraper_engine import SKIP_DUPLICATE, ScraperEngine
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+READY = "ready"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+
+class WorkItem(NamedTuple):
+    """A claimed queue entry.
+
+    ``lease`` identifies the claim; :meth:`WorkQueue.complete`,
+    :meth:`WorkQueue.fail` and :meth:`WorkQueue.heartbeat` only act while it
+    is still current, so a worker whose lease expired cannot clobber the
+    work of the process that reclaimed the item.
+    """
+
+    id: int
+    url: str
+    payload: Optional[str]
+    attempts: int
+    lease: str
+
+
+class WorkQueue:
+    """Persistent queue of URLs that several processes can work through.
+
+    :meth:`claim` atomically leases up to ``n`` ready items in one
+    transaction. A lease lasts ``lease_seconds`` and can be extended with
+    :meth:`heartbeat`; items whose lease expires (for example because their
+    worker crashed) become claimable again. Every claim counts as an
+    attempt: :meth:`fail` schedules a retry with exponential backoff, and
+    items that used up ``max_attempts`` are moved to the dead letters (see
+    :meth:`dead_letters` and :meth:`requeue_dead`).
+
+    The database uses WAL mode so readers never block the single writer
+    and commits are cheap. WAL needs shared memory, which network
+    filesystems do not provide reliably; pass ``wal=False`` when processes
+    on several machines share the file.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/work_queue.db",
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+        wal: bool = True,
+        busy_timeout: float = 30.0,
+        owner: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Open (and create if needed) the queue database.
+
+        Args:
+            db_path: Location of the SQLite database file.
+            lease_seconds: How long a claim is exclusive without a heartbeat.
+            max_attempts: Claims allowed before an item is dead-lettered.
+            retry_delay: Delay before the first retry of a failed item;
+                doubled for every further attempt.
+            wal: Use write-ahead logging (see the class documentation).
+            busy_timeout: Seconds to wait for another process's write lock.
+            owner: Name recorded with claims. Defaults to ``host:pid``.
+            clock: Wall clock shared by all processes, mainly useful for
+                tests.
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.lease_seconds = float(lease_seconds)
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_delay = float(retry_delay)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self._clock = clock
+
+        self.conn = sqlite3.connect(self.db_path, timeout=busy_timeout, check_same_thread=False)
+        self._lock = threading.Lock()
+        if wal:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            # Durable at checkpoints; a power cut may only lose the last commits.
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Create required tables if they don't exist."""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS work (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL UNIQUE,
+                    payload TEXT,
+                    state TEXT NOT NULL DEFAULT 'ready',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL DEFAULT 0,
+                    lease TEXT,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    last_error TEXT,
+                    updated_at REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS work_ready ON work (state, available_at)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS work_leases ON work (state, lease_expires)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS work_lease ON work (lease)")
+
+    def put(self, url: str, payload: Optional[str] = None, delay: float = 0.0) -> bool:
+        """Add ``url`` to the queue; ``False`` if it is already queued."""
+        return self.put_many([(url, payload)], delay) == 1
+
+    def put_many(
+        self, items: Iterable[Union[str, Tuple[str, Optional[str]]]], delay: float = 0.0
+    ) -> int:
+        """Add URLs (or ``(url, payload)`` pairs) in one transaction.
+
+        URLs already in the queue, in any state, are ignored.
+
+        Returns:
+            The number of URLs added.
+        """
+        now = self._clock()
+        rows = [
+            (item, None, now + delay, now) if isinstance(item, str)
+            else (item[0], item[1], now + delay, now)
+            for item in items
+        ]
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO work (url, payload, available_at, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return self.conn.total_changes - before
+
+    def claim(self, n: int = 1) -> List[WorkItem]:
+        """Lease up to ``n`` items that are ready or whose lease expired.
+
+        Expired items that already used up ``max_attempts`` are
+        dead-lettered instead of being handed out again.
+        """
+        now = self._clock()
+        lease = uuid.uuid4().hex
+        with self._lock:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        """
+                        UPDATE work SET state = ?, lease = NULL,
+                            last_error = 'lease expired', updated_at = ?
+                        WHERE state = ? AND lease_expires <= ? AND attempts >= ?
+                        """,
+                        (DEAD, now, LEASED, now, self.max_attempts),
+                    )
+                    self.conn.execute(
+                        """
+                        UPDATE work SET state = ?, lease = ?, lease_owner = ?,
+                            lease_expires = ?, attempts = attempts + 1, updated_at = ?
+                        WHERE id IN (
+                            SELECT id FROM work
+                            WHERE state = ? AND available_at <= ?
+                            UNION ALL
+                            SELECT id FROM work
+                            WHERE state = ? AND lease_expires <= ?
+                            LIMIT ?
+                        )
+                        """,
+                        (
+                            LEASED, lease, self.owner, now + self.lease_seconds, now,
+                            READY, now, LEASED, now, max(1, int(n)),
+                        ),
+                    )
+                    rows = self.conn.execute(
+                        "SELECT id, url, payload, attempts, lease FROM work "
+                        "WHERE lease = ? ORDER BY id",
+                        (lease,),
+                    ).fetchall()
+            except sqlite3.Error as exc:
+                logger.error(f"Failed to claim work: {exc}")
+                return []
+        return [WorkItem(*row) for row in rows]
+
+    def heartbeat(self, items: Sequence[WorkItem], extend: Optional[float] = None) -> int:
+        """Extend the leases of ``items`` by ``extend`` (default ``lease_seconds``).
+
+        Returns:
+            The number of leases renewed; items whose lease was lost are
+            not counted and should be abandoned.
+        """
+        expires = self._clock() + (self.lease_seconds if extend is None else extend)
+        return self._update(
+            "UPDATE work SET lease_expires = ? WHERE id = ? AND lease = ? AND state = ?",
+            [(expires, item.id, item.lease, LEASED) for item in items],
+        )
+
+    def complete(self, items: Sequence[WorkItem]) -> int:
+        """Mark ``items`` as done; returns how many leases were still held."""
+        now = self._clock()
+        return self._update(
+            "UPDATE work SET state = ?, lease = NULL, lease_expires = NULL, "
+            "last_error = NULL, updated_at = ? WHERE id = ? AND lease = ? AND state = ?",
+            [(DONE, now, item.id, item.lease, LEASED) for item in items],
+        )
+
+    def fail(
+        self, items: Sequence[WorkItem], error: str = "", retry_delay: Optional[float] = None
+    ) -> int:
+        """Record a failed attempt of ``items``.
+
+        Items with attempts left become ready again after ``retry_delay``
+        (default ``retry_delay`` doubled per previous attempt); the others
+        are dead-lettered.
+
+        Returns:
+            How many leases were still held.
+        """
+        now = self._clock()
+        rows = []
+        for item in items:
+            if item.attempts >= self.max_attempts:
+                state, available_at = DEAD, now
+            else:
+                delay = self.retry_delay * 2 ** (item.attempts - 1)
+                state = READY
+                available_at = now + (delay if retry_delay is None else retry_delay)
+            rows.append((state, available_at, error, now, item.id, item.lease, LEASED))
+        return self._update(
+            "UPDATE work SET state = ?, available_at = ?, last_error = ?, lease = NULL, "
+            "lease_expires = NULL, updated_at = ? WHERE id = ? AND lease = ? AND state = ?",
+            rows,
+        )
+
+    def reject(self, items: Sequence[WorkItem], error: str = "") -> int:
+        """Dead-letter ``items`` right away, for failures that retrying cannot fix.
+
+        Returns:
+            How many leases were still held.
+        """
+        now = self._clock()
+        return self._update(
+            "UPDATE work SET state = ?, last_error = ?, lease = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE id = ? AND lease = ? AND state = ?",
+            [(DEAD, error, now, item.id, item.lease, LEASED) for item in items],
+        )
+
+    def release(self, items: Sequence[WorkItem]) -> int:
+        """Give ``items`` back unprocessed without counting the attempt."""
+        now = self._clock()
+        return self._update(
+            "UPDATE work SET state = ?, attempts = attempts - 1, lease = NULL, "
+            "lease_expires = NULL, updated_at = ? WHERE id = ? AND lease = ? AND state = ?",
+            [(READY, now, item.id, item.lease, LEASED) for item in items],
+        )
+
+    def _update(self, sql: str, rows: List[tuple]) -> int:
+        """Run ``sql`` for every row in one transaction and count changed rows."""
+        if not rows:
+            return 0
+        with self._lock:
+            try:
+                with self.conn:
+                    before = self.conn.total_changes
+                    self.conn.executemany(sql, rows)
+                    return self.conn.total_changes - before
+            except sqlite3.Error as exc:
+                logger.error(f"Failed to update work queue: {exc}")
+                return 0
+
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, object]]:
+        """Return up to ``limit`` dead-lettered items with their last error."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, url, payload, attempts, last_error FROM work "
+                "WHERE state = ? ORDER BY updated_at LIMIT ?",
+                (DEAD, limit),
+            ).fetchall()
+        keys = ("id", "url", "payload", "attempts", "last_error")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def requeue_dead(self, ids: Optional[Iterable[int]] = None) -> int:
+        """Make dead-lettered items (all, or those in ``ids``) ready again."""
+        now = self._clock()
+        sql = (
+            "UPDATE work SET state = ?, attempts = 0, available_at = ?, updated_at = ? "
+            "WHERE state = ?"
+        )
+        if ids is None:
+            return self._update(sql, [(READY, now, now, DEAD)])
+        return self._update(sql + " AND id = ?", [(READY, now, now, DEAD, i) for i in ids])
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of items per state (``ready``, ``leased``, ``done``, ``dead``)."""
+        with self._lock:
+            rows = self.conn.execute("SELECT state, COUNT(*) FROM work GROUP BY state").fetchall()
+        counts = dict.fromkeys((READY, LEASED, DONE, DEAD), 0)
+        counts.update(rows)
+        return counts
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "WorkQueue":
+        """Return the queue instance for context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Close the SQLite connection when exiting a ``with`` block."""
+        self.close()
+
+
+def run_worker(
+    queue: WorkQueue,
+    engine: ScraperEngine,
+    batch_size: int = 50,
+    output_path: Optional[Callable[[WorkItem], Optional[str]]] = None,
+    wait: Optional[float] = None,
+) -> Dict[str, int]:
+    """Scrape queued URLs with ``engine`` until the queue runs dry.
+
+    Items are claimed ``batch_size`` at a time and fetched with
+    :meth:`ScraperEngine.scrape_many`; a background thread renews their
+    leases every third of ``lease_seconds`` while the batch runs. Fetched
+    items are completed and failures retried or dead-lettered, one
+    transaction per batch. URLs the engine's ``dedup_index`` skips as
+    duplicates count as completed. Pages the engine will never fetch
+    (disallowed by ``robots.txt`` or rejected by its download limits) are
+    dead-lettered at once with the reason, without using up retries.
+
+    Args:
+        queue: Queue to work through.
+        engine: Engine fetching the pages.
+        batch_size: Items claimed per transaction.
+        output_path: Optional function returning where an item's extracted
+            data should be saved.
+        wait: Seconds to sleep when nothing is claimable before trying
+            again. ``None`` returns instead, leaving items scheduled for a
+            later retry to other runs.
+
+    Returns:
+        Counts of ``completed``, ``failed`` and ``rejected`` items.
+    """
+    counts = {"completed": 0, "failed": 0, "rejected": 0}
+    while True:
+        items = queue.claim(batch_size)
+        if not items:
+            if wait is None:
+                return counts
+            time.sleep(wait)
+            continue
+
+        by_url = {item.url: item for item in items}
+        paths = {}
+        if output_path is not None:
+            paths = {item.url: path for item in items for path in [output_path(item)] if path}
+        stop = threading.Event()
+        beat = threading.Thread(
+            target=_renew_leases, args=(queue, items, stop), name="work-queue-heartbeat",
+            daemon=True,
+        )
+        beat.start()
+        finished: List[WorkItem] = []
+        failed: List[WorkItem] = []
+        skipped: Dict[str, str] = {}
+        try:
+            for url, html in engine.scrape_many(
+                list(by_url), output_paths=paths, on_skip=skipped.__setitem__
+            ):
+                reason = skipped.get(url)
+                if html is not None or reason == SKIP_DUPLICATE:
+                    finished.append(by_url[url])
+                elif reason is None:
+                    failed.append(by_url[url])
+        finally:
+            stop.set()
+            beat.join()
+        counts["completed"] += queue.complete(finished)
+        counts["failed"] += queue.fail(failed, "fetch failed")
+        for reason in set(skipped.values()) - {SKIP_DUPLICATE}:
+            rejected = [by_url[url] for url, why in skipped.items() if why == reason]
+            counts["rejected"] += queue.reject(rejected, reason)
+
+
+def _renew_leases(queue: WorkQueue, items: Sequence[WorkItem], stop: threading.Event) -> None:
+    while not stop.wait(queue.lease_seconds / 3):
+        queue.heartbeat(items)
@@ -0,0 +1,218 @@
+"""Per-host AIMD concurrency limits driven by latency and errors."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from .rate_limiter import host_of
+
+
+def is_congestion_status(status: Optional[int]) -> bool:
+    """Return ``True`` for responses telling us to back off (429 and 5xx).
+
+    ``None`` stands for a request that got no response at all (timeouts,
+    refused or reset connections) and counts as congestion too.
+    """
+    return status is None or status == 429 or status >= 500
+
+
+class _HostLimit:
+    """Concurrency window and latency estimates of a single host."""
+
+    def __init__(self, limit: float, threshold: float) -> None:
+        self.limit = limit
+        # Slow start doubles the limit each round trip up to ``threshold``.
+        self.threshold = threshold
+        self.in_flight = 0
+        self.latency = 0.0
+        self.baseline = 0.0
+        self.samples = 0
+        self.decreased_at = float("-inf")
+        self.decreases = 0
+
+
+class AdaptiveConcurrency:
+    """Adjust how many requests may be in flight to each host (AIMD).
+
+    Every host starts with ``initial`` slots. Like TCP congestion control,
+    each healthy response adds one slot during slow start (doubling the
+    limit every round trip) and ``increase / limit`` slots afterwards (one
+    slot per round trip). A 429, a 5xx, a failed connection or a smoothed
+    latency above ``latency_factor`` times the host's baseline multiplies
+    the limit by ``decrease`` and ends slow start. Decreases happen at most
+    once per smoothed latency, so the responses of one congested round trip
+    cut the limit only once. Limits stay between ``minimum`` and
+    ``maximum``.
+
+    The baseline is the lowest smoothed latency seen; it creeps towards the
+    current latency so that a permanently slower host is not treated as
+    congested forever.
+    """
+
+    def __init__(
+        self,
+        initial: int = 2,
+        minimum: int = 1,
+        maximum: int = 32,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_factor: float = 2.0,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a controller.
+
+        Args:
+            initial: Slots a host starts with.
+            minimum: Lowest limit a host can be cut to.
+            maximum: Highest limit a host can grow to.
+            increase: Slots added per round trip after slow start.
+            decrease: Factor in ``(0, 1)`` applied to the limit on congestion.
+            latency_factor: Smoothed latency, relative to the baseline, that
+                counts as a latency spike.
+            smoothing: Weight of a new latency sample in the moving average.
+            clock: Monotonic time source, mainly useful for tests.
+        """
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.initial = min(self.maximum, max(self.minimum, int(initial)))
+        self.increase = float(increase)
+        self.decrease = min(max(float(decrease), 0.05), 0.95)
+        self.latency_factor = max(1.0, float(latency_factor))
+        self.smoothing = min(max(float(smoothing), 0.01), 1.0)
+        self._clock = clock
+        self._hosts: Dict[str, _HostLimit] = {}
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._releases = 0
+
+    @classmethod
+    def from_config(
+        cls, config: Mapping[str, Any], concurrency: int
+    ) -> Optional["AdaptiveConcurrency"]:
+        """Build a controller from ``config["adaptive_concurrency"]`` or return ``None``.
+
+        The setting is ``True`` or a mapping with ``initial``, ``minimum``,
+        ``maximum`` (default ``concurrency``), ``increase``, ``decrease``,
+        ``latency_factor`` and ``smoothing``.
+        """
+        settings = config.get("adaptive_concurrency")
+        if not settings:
+            return None
+        if not isinstance(settings, Mapping):
+            settings = {}
+        return cls(
+            initial=int(settings.get("initial", 2)),
+            minimum=int(settings.get("minimum", 1)),
+            maximum=int(settings.get("maximum", concurrency)),
+            increase=float(settings.get("increase", 1.0)),
+            decrease=float(settings.get("decrease", 0.5)),
+            latency_factor=float(settings.get("latency_factor", 2.0)),
+            smoothing=float(settings.get("smoothing", 0.2)),
+        )
+
+    def _host(self, url: str) -> _HostLimit:
+        host = host_of(url)
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostLimit(float(self.initial), float(self.maximum))
+        return state
+
+    def acquire(self, url: str) -> bool:
+        """Take a slot for the host of ``url`` if one is free, without waiting."""
+        with self._lock:
+            state = self._host(url)
+            if state.in_flight >= int(state.limit):
+                return False
+            state.in_flight += 1
+            return True
+
+    def release(self, url: str) -> None:
+        """Give back a slot taken by :meth:`acquire`."""
+        with self._lock:
+            state = self._host(url)
+            state.in_flight = max(0, state.in_flight - 1)
+            self._releases += 1
+            self._released.notify_all()
+
+    def releases(self) -> int:
+        """Return how many slots were released so far, for :meth:`wait_release`."""
+        with self._lock:
+            return self._releases
+
+    def wait_release(self, seen: int, timeout: Optional[float] = None) -> bool:
+        """Block until more than ``seen`` slots were released in total.
+
+        Pass the :meth:`releases` count taken before the failed
+        :meth:`acquire` calls, so a release in between is not missed.
+
+        Returns:
+            ``False`` if ``timeout`` seconds passed first.
+        """
+        with self._released:
+            return self._released.wait_for(lambda: self._releases != seen, timeout)
+
+    def record(self, url: str, latency: float, status: Optional[int] = None) -> None:
+        """Adjust the host's limit after a request that took ``latency`` seconds.
+
+        Args:
+            url: Requested URL.
+            latency: Seconds until the response (or the failure) arrived.
+            status: HTTP status code, ``None`` if no response was received.
+        """
+        with self._lock:
+            state = self._host(url)
+            congested = is_congestion_status(status)
+            if status is not None:
+                state.samples += 1
+                if state.samples == 1:
+                    state.latency = state.baseline = latency
+                else:
+                    state.latency += self.smoothing * (latency - state.latency)
+                    if state.latency < state.baseline:
+                        state.baseline = state.latency
+                    else:
+                        state.baseline += self.smoothing / 10 * (state.latency - state.baseline)
+                congested = congested or (
+                    state.samples > 1
+                    and state.latency > self.latency_factor * state.baseline
+                )
+            if congested:
+                self._decrease(state)
+            elif state.limit < state.threshold:
+                state.limit = min(state.limit + 1.0, state.threshold, float(self.maximum))
+            else:
+                state.limit = min(
+                    state.limit + self.increase / state.limit, float(self.maximum)
+                )
+
+    def _decrease(self, state: _HostLimit) -> None:
+        now = self._clock()
+        if now - state.decreased_at < state.latency:
+            return
+        state.limit = max(float(self.minimum), state.limit * self.decrease)
+        state.threshold = state.limit
+        state.decreased_at = now
+        state.decreases += 1
+
+    def limit(self, url: str) -> int:
+        """Return the current number of slots for the host of ``url``."""
+        with self._lock:
+            state = self._hosts.get(host_of(url))
+            return int(state.limit) if state else self.initial
+
+    def limits(self) -> Dict[str, Dict[str, float]]:
+        """Return ``limit``, ``in_flight``, latencies and decreases per host."""
+        with self._lock:
+            return {
+                host: {
+                    "limit": int(state.limit),
+                    "in_flight": state.in_flight,
+                    "latency": state.latency,
+                    "baseline_latency": state.baseline,
+                    "decreases": state.decreases,
+                }
+                for host, state in self._hosts.items()
+            }
@@ -0,0 +1,455 @@
+"""Asynchronous scraping engine built on :mod:`asyncio` streams."""
+
+from __future__ import annotations
+
+import asyncio
+import ssl
+import zlib
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urljoin, urlsplit
+
+from requests.structures import CaseInsensitiveDict
+from requests.utils import requote_uri
+
+from .charset import CharsetDetector
+from .content_extractor import ContentExtractor
+from .dedup_index import DedupIndex
+from .circuit_breaker import CircuitBreaker
+from .download_limits import DownloadLimits, DownloadRejected
+from .fingerprints import FingerprintStore, process_page
+from .near_duplicates import NearDuplicateDetector
+from .output_manager import OutputManager
+from .parsers import DEFAULT_PARSER
+from .rate_limiter import HostRateLimiter, host_of
+from .retry_policy import RetryPolicy
+from .robots import RobotsCache
+from .url_normalizer import UrlNormalizer
+
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+
+class HTTPStatusError(Exception):
+    """Raised when a server answers with an error status code."""
+
+    def __init__(
+        self, url: str, status: int, headers: Optional[Mapping[str, str]] = None
+    ) -> None:
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+        self.headers = dict(headers or {})
+
+
+class AsyncResponse(NamedTuple):
+    """Minimal response returned by :meth:`AsyncScraperEngine.fetch`."""
+
+    url: str
+    status: int
+    headers: Dict[str, str]
+    content: bytes
+
+
+class AsyncScraperEngine:
+    """Download pages concurrently on a single event loop.
+
+    The engine mirrors :class:`ScraperEngine` but performs all network I/O
+    with non-blocking sockets, so thousands of requests can be in flight on
+    one thread. A semaphore bounds the number of open connections and
+    per-host rate limits wait with :func:`asyncio.sleep` instead of blocking
+    the loop.
+    """
+
+    def __init__(
+        self,
+        extractor: Optional[ContentExtractor] = None,
+        output_manager: Optional[OutputManager] = None,
+        config: Optional[Dict[str, Any]] = None,
+        delay: float = 1.0,
+    ) -> None:
+        """Initialize the engine with dependencies and configuration.
+
+        Args:
+            extractor: ``ContentExtractor`` instance for parsing HTML.
+            output_manager: ``OutputManager`` instance for persisting data.
+            config: Optional configuration dictionary. Supported keys are
+                ``user_agent``, ``delay``, ``timeout``, ``retries``,
+                ``concurrency``, ``max_redirects``, ``rate_limit``,
+                ``websites``, the backoff settings, ``circuit_breaker``,
+                ``parser``, ``partial_parse``, ``streaming_extract``,
+                ``stream_download``, ``charset_sample_bytes``, ``url_rules``,
+                ``dedup_index``, ``fingerprints``, ``near_duplicates`` and
+                ``respect_robots`` (see :class:`ScraperEngine`).
+            delay: Seconds to wait between requests to the same host
+                (fallback if not in config).
+        """
+        self.extractor = extractor or ContentExtractor(
+            (config or {}).get("parser", DEFAULT_PARSER),
+            partial=bool((config or {}).get("partial_parse", False)),
+            streaming=bool((config or {}).get("streaming_extract", False)),
+        )
+        self.output_manager = output_manager or OutputManager()
+        self.config = config or {}
+
+        self.user_agent: str = self.config.get("user_agent", "Cinder Web Scraper 1.0")
+        self.delay: float = float(self.config.get("delay", delay))
+        self.timeout: int = int(self.config.get("timeout", 30))
+        self.retries: int = int(self.config.get("retries", 3))
+        self.concurrency: int = max(1, int(self.config.get("concurrency", 100)))
+        self.max_redirects: int = int(self.config.get("max_redirects", 5))
+        self.rate_limiter = HostRateLimiter.from_config(self.config, self.delay)
+        self.retry_policy = RetryPolicy.from_config(self.config, self.delay)
+        self.circuit_breaker = CircuitBreaker.from_config(self.config)
+        self.download_limits = DownloadLimits.from_config(self.config)
+        self.charset_detector = CharsetDetector(
+            int(self.config.get("charset_sample_bytes", 64 * 1024))
+        )
+        self.url_normalizer = UrlNormalizer.from_config(self.config)
+        self.dedup_index: Optional[DedupIndex] = None
+        dedup_config = self.config.get("dedup_index")
+        if dedup_config:
+            ttl = dedup_config.get("ttl")
+            self.dedup_index = DedupIndex(
+                dedup_config.get("path", "data/dedup_index.db"),
+                float(ttl) if ttl is not None else None,
+            )
+        self.fingerprints: Optional[FingerprintStore] = None
+        fingerprint_config = self.config.get("fingerprints")
+        if fingerprint_config:
+            self.fingerprints = FingerprintStore(
+                fingerprint_config.get("path", "data/fingerprints.db")
+            )
+        self.near_duplicates = NearDuplicateDetector.from_config(self.config)
+        self.robots: Optional[RobotsCache] = (
+            RobotsCache.shared() if self.config.get("respect_robots") else None
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Semaphore limiting the number of concurrent connections."""
+        # Created lazily so it binds to the loop that actually runs the engine.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def scrape(self, url: str, output_path: Optional[str] = None) -> Optional[str]:
+        """Scrape ``url`` and return the HTML content with retry support.
+
+        Args:
+            url: The target URL to scrape.
+            output_path: Optional file path where extracted content should be saved.
+
+        Returns:
+            The decoded HTML on success, otherwise ``None`` (also for
+            duplicates found by the ``dedup_index`` and URLs disallowed by
+            ``robots.txt``).
+        """
+        if self.robots is not None:
+            # robots.txt is fetched with blocking I/O, at most once per TTL.
+            loop = asyncio.get_running_loop()
+            allowed = await loop.run_in_executor(
+                None, self.robots.allowed, url, self.user_agent, None, self.rate_limiter
+            )
+            if not allowed:
+                logger.warning(f"Skipping {url}: disallowed by robots.txt")
+                return None
+        if self.dedup_index is None:
+            return await self._scrape(url, output_path)
+        canonical = self.url_normalizer.normalize(url)
+        if not self.dedup_index.claim(canonical, url):
+            logger.log(f"Skipping duplicate URL: {url}")
+            return None
+        html = None
+        try:
+            html = await self._scrape(url, output_path)
+        finally:
+            if html is None:
+                self.dedup_index.release(canonical)
+        return html
+
+    async def _scrape(self, url: str, output_path: Optional[str]) -> Optional[str]:
+        """Implementation of :meth:`scrape` without the dedup check."""
+        for attempt in range(1, self.retries + 1):
+            if not self.circuit_breaker.allow(url):
+                logger.error(f"Circuit open for {host_of(url)}; skipping {url}")
+                return None
+            fetched = False
+            try:
+                logger.log(f"Scraping URL: {url} (attempt {attempt})")
+                await self.rate_limiter.acquire_async(url)
+
+                async with self.semaphore:
+                    response = await asyncio.wait_for(self.fetch(url), self.timeout)
+                self.circuit_breaker.record_success(url)
+                fetched = True
+                html = self._decode(response)
+
+                if output_path:
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, self._save, url, html, output_path)
+
+                return html
+
+            except DownloadRejected as exc:
+                logger.warning(str(exc))
+                if not fetched:
+                    # The host answered; this also ends a half-open trial.
+                    self.circuit_breaker.record_success(url)
+                return None
+            except (
+                OSError,
+                EOFError,
+                asyncio.TimeoutError,
+                HTTPStatusError,
+                ValueError,
+                zlib.error,
+            ) as exc:
+                logger.error(f"Request failed for {url} (attempt {attempt}): {exc!r}")
+                status = getattr(exc, "status", None)
+                if self.retry_policy.is_retryable_status(status):
+                    self.circuit_breaker.record_failure(url)
+                else:
+                    self.circuit_breaker.record_success(url)
+                headers = getattr(exc, "headers", None) or {}
+                wait_for = self.retry_policy.next_delay(
+                    attempt, status, headers.get("retry-after")
+                )
+                if wait_for is None or attempt == self.retries:
+                    return None
+                if wait_for > 0:
+                    await asyncio.sleep(wait_for)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error(f"Unexpected error scraping {url}: {exc!r}")
+                if not fetched:
+                    self.circuit_breaker.record_failure(url)
+                return None
+
+        return None
+
+    async def scrape_many(
+        self,
+        urls: Union[Iterable[str], AsyncIterable[str]],
+        output_paths: Optional[Mapping[str, str]] = None,
+    ) -> AsyncIterator[Tuple[str, Optional[str]]]:
+        """Scrape ``urls`` concurrently and yield results as they complete.
+
+        ``urls`` may be a regular or an asynchronous iterable and is consumed
+        lazily, keeping at most twice the configured concurrency in flight.
+
+        Args:
+            urls: URLs to scrape.
+            output_paths: Optional mapping of URL to the file path where the
+                extracted content for that URL should be saved.
+
+        Yields:
+            ``(url, html)`` pairs in completion order. ``html`` is ``None``
+            when the page could not be scraped.
+        """
+        paths = output_paths or {}
+        source = _aiter_urls(urls)
+        pending: Dict["asyncio.Task[Optional[str]]", str] = {}
+        exhausted = False
+
+        async def refill() -> None:
+            nonlocal exhausted
+            while not exhausted and len(pending) < self.concurrency * 2:
+                try:
+                    url = await source.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    return
+                task = asyncio.ensure_future(self.scrape(url, paths.get(url)))
+                pending[task] = url
+
+        try:
+            await refill()
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    url = pending.pop(task)
+                    yield url, task.result()
+                await refill()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def fetch(self, url: str) -> AsyncResponse:
+        """Perform a ``GET`` request for ``url`` following redirects.
+
+        Raises:
+            HTTPStatusError: If the final response has a 4xx or 5xx status.
+            ValueError: If ``url`` is not an HTTP(S) URL or the server sends
+                a malformed response.
+        """
+        for _ in range(self.max_redirects + 1):
+            response = await self._request(url)
+            location = response.headers.get("location")
+            if response.status in REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            if response.status >= 400:
+                raise HTTPStatusError(url, response.status, response.headers)
+            return response
+        raise ValueError(f"Too many redirects for {url}")
+
+    async def _request(self, url: str) -> AsyncResponse:
+        """Send a single HTTP/1.1 request and read the complete response."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+
+        secure = parts.scheme == "https"
+        port = parts.port or (443 if secure else 80)
+        reader, writer = await asyncio.open_connection(
+            parts.hostname,
+            port,
+            ssl=self._get_ssl_context() if secure else None,
+        )
+        try:
+            target = requote_uri(parts.path or "/")
+            if parts.query:
+                target += "?" + requote_uri(parts.query)
+            request = (
+                f"GET {target} HTTP/1.1\r\n"
+                f"Host: {parts.netloc.rsplit('@', 1)[-1]}\r\n"
+                f"User-Agent: {self.user_agent}\r\n"
+                "Accept: */*\r\n"
+                "Accept-Encoding: gzip, deflate\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(request.encode("latin-1"))
+            await writer.drain()
+
+            status, headers = await _read_head(reader)
+            limits = self.download_limits
+            max_bytes = 0
+            if limits is not None and status < 300:
+                # Reject before reading the body; redirects and errors are small.
+                limits.check_headers(url, CaseInsensitiveDict(headers))
+                max_bytes = limits.max_body_bytes
+            body = await _read_body(reader, headers, url, max_bytes)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding in ("gzip", "deflate"):
+            wbits = 16 + zlib.MAX_WBITS if encoding == "gzip" else zlib.MAX_WBITS
+            if max_bytes > 0:
+                # Never inflate more than one byte past the limit.
+                body = zlib.decompressobj(wbits).decompress(body, max_bytes + 1)
+                _check_size(url, len(body), max_bytes)
+            else:
+                body = zlib.decompress(body, wbits)
+        return AsyncResponse(url, status, headers, body)
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        return self._ssl_context
+
+    def _decode(self, response: AsyncResponse) -> str:
+        """Decode the response body with :class:`CharsetDetector`."""
+        return self.charset_detector.decode(
+            response.url, response.content, response.headers.get("content-type")
+        )
+
+    def _save(self, url: str, html: str, output_path: str) -> None:
+        """Extract data from ``html`` and persist it to ``output_path``."""
+        process_page(
+            self.fingerprints, self.output_manager, url, html, output_path,
+            self.extractor.extract, "text", self.near_duplicates,
+        )
+
+
+async def _aiter_urls(urls: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    """Iterate over a synchronous or asynchronous iterable of URLs."""
+    if hasattr(urls, "__aiter__"):
+        async for url in urls:  # type: ignore[union-attr]
+            yield url
+    else:
+        for url in urls:  # type: ignore[union-attr]
+            yield url
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+    """Read the status line and headers of an HTTP response."""
+    status_line = await reader.readline()
+    fields = status_line.decode("latin-1").split(None, 2)
+    if len(fields) < 2 or not fields[0].startswith("HTTP/") or not fields[1].isdigit():
+        raise ValueError(f"Malformed status line: {status_line!r}")
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return int(fields[1]), headers
+
+
+def _check_size(url: str, size: int, max_bytes: int) -> None:
+    """Raise :class:`DownloadRejected` when ``size`` exceeds ``max_bytes``."""
+    if 0 < max_bytes < size:
+        raise DownloadRejected(url, f"body larger than {max_bytes} bytes")
+
+
+async def _read_body(
+    reader: asyncio.StreamReader,
+    headers: Mapping[str, str],
+    url: str = "",
+    max_bytes: int = 0,
+) -> bytes:
+    """Read a response body honouring chunked and fixed-length framing.
+
+    Reading stops with :class:`DownloadRejected` as soon as more than
+    ``max_bytes`` (when positive) have been received.
+    """
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks = []
+        received = 0
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Skip optional trailers up to the terminating blank line.
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            received += size
+            _check_size(url, received, max_bytes)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    length = headers.get("content-length")
+    if length is not None and length.isdigit():
+        _check_size(url, int(length), max_bytes)
+        return await reader.readexactly(int(length))
+    if max_bytes <= 0:
+        return await reader.read()
+    body = bytearray()
+    while True:
+        chunk = await reader.read(65536)
+        if not chunk:
+            return bytes(body)
+        body += chunk
+        _check_size(url, len(body), max_bytes)
@@ -0,0 +1,200 @@
+"""Cheap charset detection for downloaded pages."""
+
+from __future__ import annotations
+
+import codecs
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:  # pragma: no cover - requests normally installs it
+    from_bytes = None
+
+from .rate_limiter import host_of
+
+# Byte order marks, longest first so UTF-32 LE is not mistaken for UTF-16 LE.
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# How much of a page is searched for ``<meta charset>``.
+META_SNIFF_BYTES = 4096
+# Encoding used when nothing better is known, as browsers do for HTML.
+FALLBACK_ENCODING = "windows-1252"
+
+_META_CHARSET = re.compile(
+    rb"""<meta[^>]*?charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE
+)
+
+
+def normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """Return the canonical codec name for ``name`` or ``None`` if unknown."""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip().strip("\"'")).name
+    except LookupError:
+        return None
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """Return the ``charset`` parameter of a ``Content-Type`` header."""
+    for param in (content_type or "").split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.strip().lower() == "charset":
+            return normalize_encoding(value)
+    return None
+
+
+def bom_encoding(body: bytes) -> Optional[str]:
+    """Return the encoding announced by a byte order mark at the start of ``body``."""
+    for bom, encoding in BOMS:
+        if body.startswith(bom):
+            return encoding
+    return None
+
+
+def sniff_meta_charset(body: bytes, limit: int = META_SNIFF_BYTES) -> Optional[str]:
+    """Find a ``<meta charset>`` or ``http-equiv`` declaration in the head of ``body``."""
+    match = _META_CHARSET.search(body[:limit])
+    if not match:
+        return None
+    encoding = normalize_encoding(match.group(1).decode("ascii", "ignore"))
+    # A declaration readable as ASCII cannot really be UTF-16/32.
+    if encoding and encoding.startswith(("utf-16", "utf-32")):
+        return "utf-8"
+    return encoding
+
+
+def _is_utf8(sample: bytes) -> bool:
+    """``True`` if ``sample`` is valid UTF-8, ignoring a cut-off final character."""
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+class CharsetDetector:
+    """Pick the encoding of response bodies without decoding them twice.
+
+    The cheap sources are tried in order: a byte order mark, the
+    ``Content-Type`` charset, a ``<meta charset>`` in the first
+    :data:`META_SNIFF_BYTES` and an encoding found earlier for the same
+    host. Only when all of them fail is the first ``sample_size`` bytes
+    checked for valid UTF-8 and, failing that, handed to
+    ``charset_normalizer``. Counters returned by :meth:`stats` show how
+    often each source decided.
+    """
+
+    def __init__(self, sample_size: int = 64 * 1024, max_hosts: int = 4096) -> None:
+        """Create a detector.
+
+        Args:
+            sample_size: Number of leading bytes used for statistical
+                detection.
+            max_hosts: Number of per-host encodings remembered (LRU).
+        """
+        self.sample_size = max(1, int(sample_size))
+        self.max_hosts = max(1, int(max_hosts))
+        self._hosts: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "bom": 0,
+            "header": 0,
+            "meta": 0,
+            "host_cache": 0,
+            "utf8": 0,
+            "detected": 0,
+            "fallback": 0,
+        }
+
+    def encoding_for(
+        self, url: str, body: bytes, content_type: Optional[str] = None
+    ) -> str:
+        """Return the encoding to decode ``body`` fetched from ``url`` with.
+
+        ``body`` may be just the beginning of the response.
+        """
+        encoding = bom_encoding(body)
+        if encoding:
+            self._count("bom")
+            return encoding
+        encoding = charset_from_content_type(content_type)
+        if encoding:
+            self._count("header")
+            return encoding
+        host = host_of(url)
+        encoding = sniff_meta_charset(body)
+        if encoding:
+            self._count("meta")
+            self._remember(host, encoding)
+            return encoding
+        with self._lock:
+            encoding = self._hosts.get(host)
+            if encoding:
+                self._hosts.move_to_end(host)
+                self._stats["host_cache"] += 1
+                return encoding
+
+        sample = body[: self.sample_size]
+        if _is_utf8(sample):
+            # Pure ASCII says nothing about the rest of the site.
+            self._count("utf8")
+            if not sample.isascii():
+                self._remember(host, "utf-8")
+            return "utf-8"
+        encoding = self._detect(sample)
+        if encoding:
+            self._count("detected")
+        else:
+            self._count("fallback")
+            encoding = FALLBACK_ENCODING
+        self._remember(host, encoding)
+        return encoding
+
+    def decode(self, url: str, body: bytes, content_type: Optional[str] = None) -> str:
+        """Decode ``body`` with :meth:`encoding_for`, replacing invalid bytes."""
+        return body.decode(self.encoding_for(url, body, content_type), errors="replace")
+
+    @staticmethod
+    def _detect(sample: bytes) -> Optional[str]:
+        """Statistical detection on ``sample``; the slow path."""
+        if from_bytes is None:
+            return None
+        match = from_bytes(sample).best()
+        return normalize_encoding(match.encoding) if match is not None else None
+
+    def _count(self, source: str) -> None:
+        with self._lock:
+            self._stats[source] += 1
+
+    def _remember(self, host: str, encoding: str) -> None:
+        with self._lock:
+            self._hosts[host] = encoding
+            self._hosts.move_to_end(host)
+            while len(self._hosts) > self.max_hosts:
+                self._hosts.popitem(last=False)
+
+    def host_encoding(self, url: str) -> Optional[str]:
+        """Return the encoding remembered for the host of ``url``, if any."""
+        with self._lock:
+            return self._hosts.get(host_of(url))
+
+    def stats(self) -> Dict[str, float]:
+        """Return how often each source decided plus the ``slow_path_rate``.
+
+        ``detected`` and ``fallback`` count runs of statistical detection.
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._stats)
+        total = sum(stats.values())
+        slow = stats["detected"] + stats["fallback"]
+        stats["slow_path_rate"] = slow / total if total else 0.0
+        return stats
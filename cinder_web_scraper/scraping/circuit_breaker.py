@@ -0,0 +1,149 @@
+"""Per-host circuit breaker that stops requests to failing hosts."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Mapping
+
+from .rate_limiter import host_of
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _HostCircuit:
+    """Rolling outcome window and state for a single host."""
+
+    def __init__(self, window: int) -> None:
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class CircuitBreaker:
+    """Short-circuit requests to hosts with a high recent failure rate.
+
+    Each host starts ``closed``. When at least ``min_requests`` outcomes are
+    recorded in the rolling ``window`` and the share of failures reaches
+    ``failure_threshold`` the circuit ``open``\\ s and :meth:`allow` rejects
+    requests for ``reset_timeout`` seconds. Afterwards a single trial
+    request is let through (``half_open``); its outcome closes the circuit
+    again or re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_requests: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a breaker.
+
+        Args:
+            failure_threshold: Failure ratio in ``(0, 1]`` that opens a circuit.
+            window: Number of most recent outcomes considered per host.
+            min_requests: Outcomes required before a circuit may open.
+            reset_timeout: Seconds an open circuit waits before a trial.
+            clock: Monotonic time source, mainly useful for tests.
+        """
+        self.failure_threshold = float(failure_threshold)
+        self.window = max(1, int(window))
+        self.min_requests = max(1, int(min_requests))
+        self.reset_timeout = float(reset_timeout)
+        self._clock = clock
+        self._circuits: Dict[str, _HostCircuit] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "CircuitBreaker":
+        """Build a breaker from the ``circuit_breaker`` mapping in ``config``."""
+        options = config.get("circuit_breaker") or {}
+        return cls(
+            failure_threshold=float(options.get("failure_threshold", 0.5)),
+            window=int(options.get("window", 20)),
+            min_requests=int(options.get("min_requests", 5)),
+            reset_timeout=float(options.get("reset_timeout", 30.0)),
+        )
+
+    def _circuit(self, url: str) -> _HostCircuit:
+        host = host_of(url)
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = _HostCircuit(self.window)
+        return circuit
+
+    def allow(self, url: str) -> bool:
+        """Return ``True`` if a request to the host of ``url`` may proceed."""
+        with self._lock:
+            circuit = self._circuit(url)
+            if circuit.state == CLOSED:
+                return True
+            if circuit.state == OPEN:
+                if self._clock() - circuit.opened_at < self.reset_timeout:
+                    return False
+                circuit.state = HALF_OPEN
+                circuit.trial_in_flight = False
+            if circuit.trial_in_flight:
+                return False
+            circuit.trial_in_flight = True
+            return True
+
+    def record_success(self, url: str) -> None:
+        """Record a healthy response from the host of ``url``."""
+        with self._lock:
+            circuit = self._circuit(url)
+            if circuit.state != CLOSED:
+                circuit.state = CLOSED
+                circuit.outcomes.clear()
+                circuit.trial_in_flight = False
+            circuit.outcomes.append(True)
+
+    def record_failure(self, url: str) -> None:
+        """Record a failed request to the host of ``url``."""
+        with self._lock:
+            circuit = self._circuit(url)
+            circuit.outcomes.append(False)
+            if circuit.state == HALF_OPEN or (
+                circuit.state == CLOSED
+                and len(circuit.outcomes) >= self.min_requests
+                and circuit.failure_rate >= self.failure_threshold
+            ):
+                circuit.state = OPEN
+                circuit.opened_at = self._clock()
+                circuit.trial_in_flight = False
+
+    def state(self, url: str) -> str:
+        """Return ``"closed"``, ``"open"`` or ``"half_open"`` for a host."""
+        with self._lock:
+            circuit = self._circuits.get(host_of(url))
+            return circuit.state if circuit else CLOSED
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the state of every known host for monitoring."""
+        now = self._clock()
+        with self._lock:
+            return {
+                host: {
+                    "state": circuit.state,
+                    "requests": len(circuit.outcomes),
+                    "failure_rate": circuit.failure_rate,
+                    "retry_in": (
+                        max(0.0, self.reset_timeout - (now - circuit.opened_at))
+                        if circuit.state == OPEN
+                        else 0.0
+                    ),
+                }
+                for host, circuit in self._circuits.items()
+            }
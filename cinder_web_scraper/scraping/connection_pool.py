@@ -0,0 +1,280 @@
+"""Instrumented, shareable connection pools for ``requests`` sessions."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.poolmanager import PoolManager
+
+_COUNTERS = (
+    "checkouts",
+    "reused",
+    "new_connections",
+    "tls_handshakes",
+    "idle_closed",
+    "discarded",
+)
+
+
+class PoolMetrics:
+    """Thread-safe counters describing how pooled connections are used.
+
+    ``new_connections`` counts checkouts that open a TCP connection and
+    ``tls_handshakes`` those on ``https`` pools; ``reused`` counts checkouts
+    of an open keep-alive connection. ``pool_wait_seconds`` is the time
+    spent waiting for a free connection (only non-zero with ``block``).
+    ``discarded`` connections were closed because the pool was full, a
+    sign that ``per_host`` is too small.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, float]] = {}
+
+    def _host(self, host: str) -> Dict[str, float]:
+        counters = self._hosts.get(host)
+        if counters is None:
+            counters = self._hosts[host] = dict.fromkeys(_COUNTERS, 0)
+            counters.update(pool_wait_seconds=0.0, max_pool_wait_seconds=0.0)
+        return counters
+
+    def record_checkout(self, host: str, reused: bool, tls: bool, wait: float) -> None:
+        """Count a connection taken from the pool of ``host``."""
+        with self._lock:
+            counters = self._host(host)
+            counters["checkouts"] += 1
+            if reused:
+                counters["reused"] += 1
+            else:
+                counters["new_connections"] += 1
+                counters["tls_handshakes"] += tls
+            counters["pool_wait_seconds"] += wait
+            counters["max_pool_wait_seconds"] = max(counters["max_pool_wait_seconds"], wait)
+
+    def record(self, host: str, counter: str) -> None:
+        """Increment ``counter`` (``idle_closed`` or ``discarded``) for ``host``."""
+        with self._lock:
+            self._host(host)[counter] += 1
+
+    def stats(self, host: Optional[str] = None) -> Dict[str, float]:
+        """Return the counters of ``host``, or of all hosts, plus ``reuse_ratio``."""
+        with self._lock:
+            if host is not None:
+                hosts = [self._hosts[host]] if host in self._hosts else []
+            else:
+                hosts = list(self._hosts.values())
+            totals: Dict[str, float] = dict.fromkeys(_COUNTERS, 0)
+            totals.update(pool_wait_seconds=0.0, max_pool_wait_seconds=0.0)
+            for counters in hosts:
+                for key, value in counters.items():
+                    if key == "max_pool_wait_seconds":
+                        totals[key] = max(totals[key], value)
+                    else:
+                        totals[key] += value
+        checkouts = totals["checkouts"]
+        totals["reuse_ratio"] = totals["reused"] / checkouts if checkouts else 0.0
+        return totals
+
+    def hosts(self) -> Dict[str, Dict[str, float]]:
+        """Return :meth:`stats` for every host seen so far."""
+        with self._lock:
+            names = list(self._hosts)
+        return {name: self.stats(name) for name in names}
+
+    def reset(self) -> None:
+        """Forget all counters."""
+        with self._lock:
+            self._hosts.clear()
+
+
+class _InstrumentedPool:
+    """Mixin for urllib3 pools feeding :class:`PoolMetrics`."""
+
+    metrics: Optional[PoolMetrics] = None
+    idle_timeout: Optional[float] = None
+    tls = False
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        start = time.monotonic()
+        conn = super()._get_conn(timeout)  # type: ignore[misc]
+        wait = time.monotonic() - start
+        reused = getattr(conn, "sock", None) is not None
+        released = getattr(conn, "_cinder_released", None)
+        if (
+            reused
+            and self.idle_timeout is not None
+            and released is not None
+            and time.monotonic() - released > self.idle_timeout
+        ):
+            conn.close()
+            reused = False
+            if self.metrics is not None:
+                self.metrics.record(self.host, "idle_closed")  # type: ignore[attr-defined]
+        if self.metrics is not None:
+            host = self.host  # type: ignore[attr-defined]
+            self.metrics.record_checkout(host, reused, self.tls, wait)
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        if conn is not None:
+            conn._cinder_released = time.monotonic()
+            queue = self.pool  # type: ignore[attr-defined]
+            if self.metrics is not None and queue is not None and queue.full():
+                self.metrics.record(self.host, "discarded")  # type: ignore[attr-defined]
+        super()._put_conn(conn)  # type: ignore[misc]
+
+
+class _InstrumentedHTTPPool(_InstrumentedPool, HTTPConnectionPool):
+    pass
+
+
+class _InstrumentedHTTPSPool(_InstrumentedPool, HTTPSConnectionPool):
+    tls = True
+
+
+class _InstrumentedPoolManager(PoolManager):
+    """``PoolManager`` creating instrumented pools."""
+
+    def __init__(
+        self, *args: Any, metrics: PoolMetrics, idle_timeout: Optional[float], **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics
+        self.idle_timeout = idle_timeout
+        self.pool_classes_by_scheme = {
+            "http": _InstrumentedHTTPPool,
+            "https": _InstrumentedHTTPSPool,
+        }
+
+    def _new_pool(self, scheme: str, host: str, port: int, request_context: Any = None) -> Any:
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.metrics = self.metrics
+        pool.idle_timeout = self.idle_timeout
+        return pool
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """``HTTPAdapter`` with sizable pools, an idle timeout and :class:`PoolMetrics`.
+
+    ``per_host`` connections are kept per host for up to ``hosts`` hosts.
+    Keep-alive connections idle for longer than ``idle_timeout`` seconds
+    are closed instead of reused, so servers that silently drop idle
+    connections do not cause failed requests. With ``block`` a request
+    waits for a free connection instead of opening an extra one.
+
+    :meth:`shared` returns one process-wide adapter so every engine mounting
+    it reuses the same connections.
+    """
+
+    _shared: Optional["InstrumentedAdapter"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        per_host: int = 10,
+        hosts: int = 10,
+        block: bool = False,
+        idle_timeout: Optional[float] = None,
+        metrics: Optional[PoolMetrics] = None,
+    ) -> None:
+        """Create the adapter.
+
+        Args:
+            per_host: Connections kept open per host.
+            hosts: Number of hosts whose pools are kept.
+            block: Wait for a free connection rather than exceeding
+                ``per_host``.
+            idle_timeout: Seconds after which an idle keep-alive connection
+                is closed instead of reused. ``None`` keeps it indefinitely.
+            metrics: Counters to update. A new :class:`PoolMetrics` is used
+                by default.
+        """
+        self.metrics = metrics or PoolMetrics()
+        self.idle_timeout = idle_timeout
+        self._resize_lock = threading.Lock()
+        super().__init__(
+            pool_connections=max(1, int(hosts)),
+            pool_maxsize=max(1, int(per_host)),
+            pool_block=block,
+        )
+
+    @classmethod
+    def from_config(cls, settings: Mapping[str, Any], per_host: int) -> "InstrumentedAdapter":
+        """Build an adapter from a ``connection_pool`` mapping.
+
+        ``per_host`` is used when the mapping does not set it.
+        """
+        idle_timeout = settings.get("idle_timeout")
+        per_host = int(settings.get("per_host", per_host))
+        return cls(
+            per_host,
+            int(settings.get("hosts", per_host)),
+            bool(settings.get("block", False)),
+            float(idle_timeout) if idle_timeout is not None else None,
+        )
+
+    @classmethod
+    def shared(cls, settings: Mapping[str, Any], per_host: int) -> "InstrumentedAdapter":
+        """Return the process-wide adapter, creating it from ``settings`` on first use.
+
+        Later callers can only grow its pools (see :meth:`grow`).
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls.from_config(settings, per_host)
+                return cls._shared
+            adapter = cls._shared
+        adapter.grow(
+            int(settings.get("per_host", per_host)),
+            int(settings.get("hosts", settings.get("per_host", per_host))),
+        )
+        return adapter
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: Any
+    ) -> None:
+        """Create an instrumented pool manager (called by ``HTTPAdapter``)."""
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = _InstrumentedPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            metrics=self.metrics,
+            idle_timeout=self.idle_timeout,
+            **pool_kwargs,
+        )
+
+    @property
+    def per_host(self) -> int:
+        """Connections kept per host."""
+        return self._pool_maxsize
+
+    @property
+    def hosts(self) -> int:
+        """Number of host pools kept."""
+        return self._pool_connections
+
+    def grow(self, per_host: int, hosts: Optional[int] = None) -> None:
+        """Enlarge the pools to at least ``per_host`` and ``hosts``.
+
+        Pools are recreated, so idle connections are closed once; requests
+        in flight finish on their old connections.
+        """
+        hosts = max(self._pool_connections, int(hosts or 0))
+        per_host = max(self._pool_maxsize, int(per_host))
+        with self._resize_lock:
+            if per_host == self._pool_maxsize and hosts == self._pool_connections:
+                return
+            old = self.poolmanager
+            self.init_poolmanager(hosts, per_host, self._pool_block)
+        old.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return :meth:`PoolMetrics.stats` for all hosts."""
+        return self.metrics.stats()
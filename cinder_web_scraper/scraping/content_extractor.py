@@ -2,23 +2,134 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+from bs4.element import Tag
+
+from .css_selectors import SelectorSet, compile_selector, strainer_for
+from .parsers import DEFAULT_PARSER, resolve_parser
+from .structured_parser import extract_structured_stream
 
 from cinder_web_scraper.utils.logger import default_logger as logger
 
+# Raw markup or an already parsed document accepted by the extractor.
+Document = Union[str, bytes, Tag]
+
+# Elements read by ``extract_structured`` when the page text is not needed.
+_STRUCTURED_SELECTORS = ("title", "a", "img")
+
+
 class ContentExtractor:
-    """Parse HTML and return structured data or text from selected elements."""
+    """Parse HTML and return structured data or text from selected elements.
+
+    Every method accepts either raw markup (``str`` or ``bytes``) or a
+    document returned by :meth:`parse`, so callers that need several
+    extractions from one page only pay for parsing once.
+
+    The ``BeautifulSoup`` tree builder is pluggable: ``"html.parser"`` (the
+    default), ``"lxml"``, ``"html5lib"`` or ``"auto"`` for the fastest
+    installed backend. Unavailable backends fall back to ``"html.parser"``.
+
+    With ``partial=True`` targeted extractions only build the subtrees their
+    selectors can reach (see :func:`strainer_for`), which saves time and
+    memory on large pages. With ``streaming=True``
+    :meth:`extract_structured` tokenizes raw markup without building a tree
+    (see :class:`StructuredParser`).
+    """
+
+    parser: str = DEFAULT_PARSER
+    partial: bool = False
+    streaming: bool = False
+
+    def __init__(
+        self,
+        parser: Optional[str] = DEFAULT_PARSER,
+        partial: bool = False,
+        streaming: bool = False,
+    ) -> None:
+        """Initialize the extractor.
+
+        Args:
+            parser: Name of the parser backend to use by default.
+            partial: Parse only the parts of a page needed by the selectors
+                of targeted extractions.
+            streaming: Use the tree-free fast path of
+                :meth:`extract_structured` for raw markup.
+        """
+        self.parser = resolve_parser(parser)
+        self.partial = partial
+        self.streaming = streaming
+
+    def parse(
+        self,
+        markup: Document,
+        encoding: Optional[str] = None,
+        parser: Optional[str] = None,
+        parse_only: Optional[SoupStrainer] = None,
+    ) -> Tag:
+        """Parse ``markup`` into a ``BeautifulSoup`` document.
+
+        Already parsed documents (or any ``Tag``) are returned unchanged.
+
+        Args:
+            markup: Raw HTML text or bytes, or a parsed document.
+            encoding: Optional encoding of ``bytes`` markup. When omitted
+                ``BeautifulSoup`` detects it.
+            parser: Optional backend overriding the extractor default, e.g.
+                from a site's ``parser`` setting.
+            parse_only: Optional ``SoupStrainer`` restricting which parts of
+                the document are built. Ignored by ``html5lib``, which does
+                not support it.
+        """
+        if isinstance(markup, Tag):
+            return markup
+        backend = resolve_parser(parser) if parser else self.parser
+        if backend == "html5lib":
+            parse_only = None
+        try:
+            return BeautifulSoup(
+                markup, backend, from_encoding=encoding, parse_only=parse_only
+            )
+        except FeatureNotFound:
+            logger.warning(f"HTML parser '{backend}' failed to load; using {DEFAULT_PARSER}")
+            return BeautifulSoup(
+                markup, DEFAULT_PARSER, from_encoding=encoding, parse_only=parse_only
+            )
+
+    def parse_for(
+        self,
+        markup: Document,
+        selectors: Iterable[str],
+        parser: Optional[str] = None,
+    ) -> Tag:
+        """Parse ``markup`` for a targeted extraction with ``selectors``.
+
+        When the extractor was created with ``partial=True`` and a safe
+        strainer can be derived from ``selectors``, only the subtrees those
+        selectors can match in are built. Otherwise (or for an already
+        parsed document) this behaves like :meth:`parse`. The result must
+        only be queried with the same ``selectors``.
 
-    def extract(self, html: str, selector: Optional[str] = None) -> List[str]:
+        Args:
+            markup: Raw HTML text or bytes, or a parsed document.
+            selectors: CSS selectors the document will be queried with.
+            parser: Optional backend overriding the extractor default.
+        """
+        strainer = None
+        if self.partial and not isinstance(markup, Tag):
+            strainer = strainer_for(selectors)
+        return self.parse(markup, parser=parser, parse_only=strainer)
+
+    def extract(self, html: Document, selector: Optional[str] = None) -> List[str]:
         """Extract information from ``html``.
 
-        This method parses ``html`` using ``BeautifulSoup`` and returns a
-        list of text strings from the specified selector or the entire page.
+        This method parses ``html`` using ``BeautifulSoup`` (unless it is
+        already a parsed document) and returns a list of text strings from
+        the specified selector or the entire page.
 
         Args:
-            html: Raw HTML string to parse.
+            html: Raw HTML string or bytes, or a document from :meth:`parse`.
             selector: Optional CSS selector. When provided, text from matching
                 elements is returned; otherwise the entire page text is
                 returned.
@@ -26,21 +137,60 @@ class ContentExtractor:
         Returns:
             A list of text strings extracted from the HTML.
         """
-        soup = BeautifulSoup(html, "html.parser")
         if selector:
-            elements = soup.select(selector)
+            soup = self.parse_for(html, [selector])
+            elements = compile_selector(selector).select(soup)
             return [element.get_text(strip=True) for element in elements]
-        return [soup.get_text(strip=True)]
+        return [self.parse(html).get_text(strip=True)]
 
-    def extract_structured(self, html: str) -> Dict[str, Any]:
+    def extract_fields(
+        self, html: Document, selectors: Mapping[str, str]
+    ) -> Dict[str, List[str]]:
+        """Extract several named fields from ``html`` in one traversal.
+
+        All selectors are compiled once (and cached process-wide, see
+        :func:`compile_selector`) and matched while walking the
+        document a single time, instead of running one full ``select`` per
+        field. This is the extraction used for the ``selectors`` mapping of
+        a ``websites.json`` entry.
+
+        Args:
+            html: Raw HTML string or bytes, or a document from :meth:`parse`.
+            selectors: Mapping of field name to CSS selector, e.g.
+                ``{"title": "h1", "content": ".content"}``.
+
+        Returns:
+            Dict[str, List[str]]: A record mapping every field name to the
+            text of its matching elements in document order, ready to be
+            passed to :meth:`OutputManager.save`.
+        """
+        soup = self.parse_for(html, selectors.values())
+        selector_set = SelectorSet(selectors)
+        record: Dict[str, List[str]] = {field: [] for field in selectors}
+        for element in soup.descendants:
+            if isinstance(element, Tag):
+                for field in selector_set.matching_fields(element):
+                    record[field].append(element.get_text(strip=True))
+        return record
+
+    def extract_structured(
+        self, html: Document, include_text: bool = True
+    ) -> Dict[str, Any]:
         """Extract structured information from HTML content.
 
-        This method parses ``html`` using ``BeautifulSoup`` and returns a
-        dictionary containing the page title, all link URLs, image sources and
-        the visible text.
+        This method parses ``html`` using ``BeautifulSoup`` (unless it is
+        already a parsed document) and returns a dictionary containing the
+        page title, all link URLs, image sources and the visible text.
+
+        When the extractor has ``streaming`` enabled raw markup is processed
+        by :class:`StructuredParser` instead, which returns the same result
+        as the ``html.parser`` backend without building a tree.
 
         Args:
-            html: Raw HTML string to parse.
+            html: Raw HTML string or bytes, or a document from :meth:`parse`.
+            include_text: When ``False`` the visible text is skipped and
+                ``text`` is an empty string; with ``partial=True`` only the
+                ``<title>``, ``<a>`` and ``<img>`` elements are then parsed.
 
         Returns:
             Dict[str, Any]: A mapping with the following keys:
@@ -57,7 +207,12 @@ class ContentExtractor:
         logger.log("Extracting content from HTML")
         # Actual extraction logic would go here
 
-        soup = BeautifulSoup(html, "html.parser")
+        if self.streaming and not isinstance(html, Tag):
+            return extract_structured_stream(html, include_text=include_text)
+        if include_text:
+            soup = self.parse(html)
+        else:
+            soup = self.parse_for(html, _STRUCTURED_SELECTORS)
 
         title: Optional[str] = None
         if soup.title and soup.title.string:
@@ -68,7 +223,9 @@ class ContentExtractor:
         images: List[str] = [img["src"] for img in soup.find_all("img")
                              if img.get("src")]
 
-        if soup.body:
+        if not include_text:
+            text = ""
+        elif soup.body:
             text = soup.body.get_text(separator=" ", strip=True)
         else:
             text = soup.get_text(separator=" ", strip=True)
@@ -0,0 +1,350 @@
+"""Compiled CSS selectors with cheap pre-filtering for single-pass matching."""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import soupsieve
+from bs4 import SoupStrainer
+from bs4.element import Tag
+
+# A compound selector made only of a type, classes and an id, e.g. ``div.a#b``.
+_SIMPLE_COMPOUND = re.compile(
+    r"(?P<name>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:[.#][\w-]+)*)"
+)
+_COMBINATORS = re.compile(r"\s*[\s>+~]\s*")
+# Attribute selectors and (non-nested) pseudo-classes only narrow a match.
+_NARROWING = re.compile(r"\[[^\]]*\]|::?[\w-]+(?:\([^()]*\))?")
+
+
+class SelectorKey(NamedTuple):
+    """Necessary conditions for an element to match one selector branch."""
+
+    name: Optional[str]
+    classes: FrozenSet[str]
+    id: Optional[str]
+
+    def accepts(self, tag: Tag) -> bool:
+        if self.name is not None and tag.name != self.name:
+            return False
+        if self.id is not None and tag.get("id") != self.id:
+            return False
+        if self.classes and not self.classes.issubset(tag.get("class") or ()):
+            return False
+        return True
+
+    def accepts_raw(self, name: str, attrs: Mapping[str, Any]) -> bool:
+        """Like :meth:`accepts` for a tag that has not been built yet."""
+        if self.name is not None and name != self.name:
+            return False
+        if self.id is not None and attrs.get("id") != self.id:
+            return False
+        if self.classes:
+            classes = attrs.get("class") or ""
+            if isinstance(classes, str):
+                classes = classes.split()
+            if not self.classes.issubset(classes):
+                return False
+        return True
+
+
+def _compound_key(compound: str) -> Optional[SelectorKey]:
+    match = _SIMPLE_COMPOUND.fullmatch(compound)
+    if not match or not compound:
+        return None
+    if compound == "*":
+        return SelectorKey(None, frozenset(), None)
+    name = match.group("name")
+    classes = re.findall(r"\.([\w-]+)", match.group("rest"))
+    ids = re.findall(r"#([\w-]+)", match.group("rest"))
+    return SelectorKey(
+        None if name in (None, "*") else name.lower(),
+        frozenset(classes),
+        ids[0] if ids else None,
+    )
+
+
+def split_selector(selector: str) -> Optional[List[List[str]]]:
+    """Split a simple selector list into branches of compound selectors.
+
+    ``"div.a > p, h1"`` becomes ``[["div.a", "p"], ["h1"]]``. ``None`` is
+    returned for selectors using attribute, pseudo-class or other syntax
+    that cannot be reasoned about without a full CSS parser.
+    """
+    if any(char in selector for char in "[]():\\\"'|"):
+        return None
+    branches = []
+    for branch in selector.split(","):
+        compounds = [part for part in _COMBINATORS.split(branch.strip()) if part]
+        if not compounds or any(_compound_key(part) is None for part in compounds):
+            return None
+        branches.append(compounds)
+    return branches
+
+
+def prefilter_keys(selector: str) -> Optional[Tuple[SelectorKey, ...]]:
+    """Return one :class:`SelectorKey` per branch of ``selector``.
+
+    Each key describes the type, classes and id required of the subject
+    (right-most compound) of a branch; attribute selectors and pseudo-classes
+    are ignored because they can only narrow a match further. An element
+    that satisfies none of the keys cannot match the selector. ``None``
+    means no cheap pre-filter could be derived.
+    """
+    if any(char in selector for char in "\\\"'|"):
+        return None
+    # Keep a marker where narrowing syntax was so compound boundaries survive.
+    simplified = _NARROWING.sub("\0", selector)
+    if any(char in simplified for char in "[]()"):
+        return None
+    keys = []
+    for branch in simplified.split(","):
+        compounds = [part for part in _COMBINATORS.split(branch.strip()) if part]
+        if not compounds:
+            return None
+        key = _compound_key(compounds[-1].replace("\0", "") or "*")
+        if key is None:
+            return None
+        keys.append(key)
+    return tuple(keys)
+
+
+class CompiledSelector:
+    """A ``soupsieve`` selector compiled once together with its pre-filter."""
+
+    def __init__(
+        self,
+        selector: str,
+        namespaces: Optional[Mapping[str, str]] = None,
+        flags: int = 0,
+    ) -> None:
+        self.selector = selector
+        self.matcher = soupsieve.compile(selector, namespaces, flags=flags)
+        self.keys = prefilter_keys(selector)
+        branches = split_selector(selector)
+        # Lists of plain ``type.class#id`` compounds are decided by the keys alone.
+        self.exact = branches is not None and all(len(b) == 1 for b in branches)
+
+    def could_match(self, tag: Tag) -> bool:
+        """Cheap test that is ``False`` only when ``tag`` cannot match."""
+        return self.keys is None or any(key.accepts(tag) for key in self.keys)
+
+    def match(self, tag: Tag) -> bool:
+        """Return ``True`` if ``tag`` matches the selector."""
+        if not self.could_match(tag):
+            return False
+        return self.exact or self.matcher.match(tag)
+
+    def select(self, doc: Tag) -> List[Tag]:
+        """Return all descendants of ``doc`` matching the selector."""
+        return self.matcher.select(doc)
+
+
+class SelectorCache:
+    """Thread-safe LRU cache of :class:`CompiledSelector` objects.
+
+    Entries are keyed by selector string, namespaces and flags. Once
+    ``maxsize`` entries are stored the least recently used one is evicted.
+    """
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self._entries: "OrderedDict[Tuple, CompiledSelector]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(
+        self,
+        selector: str,
+        namespaces: Optional[Mapping[str, str]] = None,
+        flags: int = 0,
+    ) -> CompiledSelector:
+        """Return the compiled form of ``selector``, compiling it on a miss."""
+        key = (selector, tuple(sorted((namespaces or {}).items())), flags)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return compiled
+            self._misses += 1
+        # Compile outside the lock; a concurrent duplicate compile is harmless.
+        compiled = CompiledSelector(selector, namespaces, flags)
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return compiled
+
+    def stats(self) -> Dict[str, float]:
+        """Return ``hits``, ``misses``, ``evictions``, ``size`` and ``hit_rate``."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self._hits / total if total else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Drop all cached selectors and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+# Process-wide cache shared by every ``ContentExtractor``.
+default_selector_cache = SelectorCache()
+
+
+def compile_selector(
+    selector: str,
+    namespaces: Optional[Mapping[str, str]] = None,
+    flags: int = 0,
+) -> CompiledSelector:
+    """Return a cached :class:`CompiledSelector` for ``selector``."""
+    return default_selector_cache.get(selector, namespaces, flags)
+
+
+class SelectorSet:
+    """Match many named selectors against each element of a single traversal.
+
+    Selectors are indexed by the id, first class or tag name of their
+    subject, so for each element only the few selectors that could possibly
+    match are evaluated. Selectors without a usable pre-filter are checked
+    against every element.
+    """
+
+    def __init__(self, selectors: Mapping[str, str]) -> None:
+        self.fields = list(selectors)
+        self._compiled: List[Tuple[str, CompiledSelector]] = [
+            (field, compile_selector(selector)) for field, selector in selectors.items()
+        ]
+        self._by_id: Dict[str, List[int]] = {}
+        self._by_class: Dict[str, List[int]] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._always: List[int] = []
+        for index, (_, compiled) in enumerate(self._compiled):
+            if compiled.keys is None or any(
+                key.id is None and not key.classes and key.name is None
+                for key in compiled.keys
+            ):
+                self._always.append(index)
+                continue
+            for key in compiled.keys:
+                if key.id is not None:
+                    self._by_id.setdefault(key.id, []).append(index)
+                elif key.classes:
+                    self._by_class.setdefault(min(key.classes), []).append(index)
+                else:
+                    self._by_name.setdefault(key.name, []).append(index)  # type: ignore[arg-type]
+
+    def _candidates(self, tag: Tag) -> Set[int]:
+        candidates: Set[int] = set(self._always)
+        candidates.update(self._by_name.get(tag.name, ()))
+        if self._by_class:
+            for cls in tag.get("class") or ():
+                candidates.update(self._by_class.get(cls, ()))
+        if self._by_id:
+            tag_id = tag.get("id")
+            if tag_id is not None:
+                candidates.update(self._by_id.get(tag_id, ()))
+        return candidates
+
+    def matching_fields(self, tag: Tag) -> List[str]:
+        """Return the fields whose selector matches ``tag``."""
+        return [
+            self._compiled[index][0]
+            for index in sorted(self._candidates(tag))
+            if self._compiled[index][1].match(tag)
+        ]
+
+
+class SelectorStrainer(SoupStrainer):
+    """``SoupStrainer`` keeping only subtrees rooted at elements matching keys.
+
+    Used as ``parse_only`` so that ``BeautifulSoup`` never builds the parts of
+    a page that the selectors cannot reach.
+    """
+
+    def __init__(self, keys: Iterable[SelectorKey]) -> None:
+        super().__init__()
+        self.keys = tuple(keys)
+
+    def allow_tag_creation(
+        self, nsprefix: Optional[str], name: str, attrs: Optional[Mapping[str, Any]]
+    ) -> bool:
+        attrs = attrs or {}
+        return any(key.accepts_raw(name, attrs) for key in self.keys)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+    @property
+    def includes_everything(self) -> bool:
+        return False
+
+    @property
+    def excludes_everything(self) -> bool:
+        return not self.keys
+
+
+@lru_cache(maxsize=256)
+def _strainer_for(selectors: Tuple[str, ...]) -> Optional[SelectorStrainer]:
+    keys: List[SelectorKey] = []
+    universal = SelectorKey(None, frozenset(), None)
+    for selector in selectors:
+        # Pseudo-classes may depend on siblings or ancestors and sibling
+        # combinators reach outside the kept subtrees.
+        if any(char in selector for char in "():+~\\\"'|"):
+            return None
+        # Attribute selectors only narrow a compound; keep a marker in place.
+        simplified = re.sub(r"\[[^\]]*\]", "\0", selector)
+        if "[" in simplified or "]" in simplified:
+            return None
+        for branch in simplified.split(","):
+            compounds = [part for part in _COMBINATORS.split(branch.strip()) if part]
+            if not compounds:
+                return None
+            parsed = [_compound_key(part.replace("\0", "") or "*") for part in compounds]
+            if any(key is None for key in parsed) or parsed[0] == universal:
+                return None
+            keys.append(parsed[0])  # type: ignore[arg-type]
+    return SelectorStrainer(keys) if keys else None
+
+
+def strainer_for(selectors: Iterable[str]) -> Optional[SelectorStrainer]:
+    """Derive a partial-parse strainer that is safe for ``selectors``.
+
+    Every element matched by a selector lies inside a subtree rooted at an
+    element matching the left-most compound of its branch, so only those
+    subtrees need to be built. ``None`` is returned when no safe strainer
+    can be derived (pseudo-classes, sibling combinators, a universal or
+    attribute-only left-most compound) or when the installed ``BeautifulSoup`` does not
+    support custom strainers; callers then parse the whole document.
+    """
+    if not hasattr(SoupStrainer, "allow_tag_creation"):
+        return None
+    return _strainer_for(tuple(selectors))
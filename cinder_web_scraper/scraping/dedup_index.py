@@ -0,0 +1,130 @@
+"""Persistent index of already fetched canonical URLs."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+
+class DedupIndex:
+    """Remember which canonical URLs were fetched, across runs.
+
+    :meth:`claim` atomically records a URL right before it is fetched, so
+    concurrent duplicates in one batch are caught as well. Failed fetches
+    are :meth:`release`\\ d so they can be retried. Entries older than
+    ``ttl`` seconds may be claimed again, letting scheduled re-scrapes of a
+    page proceed while duplicates within a crawl are skipped.
+    """
+
+    def __init__(
+        self, db_path: str = "data/dedup_index.db", ttl: Optional[float] = None
+    ) -> None:
+        """Open (and create if needed) the index database.
+
+        Args:
+            db_path: Location of the SQLite database file.
+            ttl: Seconds after which a URL counts as unseen again. ``None``
+                keeps entries forever.
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._init_db()
+        self._stats = {"claimed": 0, "saved": 0, "released": 0, "errors": 0}
+
+    def _init_db(self) -> None:
+        """Create required tables if they don't exist."""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fetched (
+                    canonical TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+
+    def claim(self, canonical: str, url: Optional[str] = None) -> bool:
+        """Record ``canonical`` as fetched now.
+
+        Returns:
+            ``True`` if the caller should fetch it, ``False`` if it is a
+            duplicate of a URL fetched within ``ttl``.
+        """
+        now = time.time()
+        cutoff = now - self.ttl if self.ttl is not None else float("-inf")
+        with self._lock:
+            try:
+                with self.conn:
+                    cursor = self.conn.execute(
+                        """
+                        INSERT INTO fetched (canonical, url, fetched_at) VALUES (?, ?, ?)
+                        ON CONFLICT (canonical) DO UPDATE
+                        SET url = excluded.url, fetched_at = excluded.fetched_at
+                        WHERE fetched.fetched_at < ?
+                        """,
+                        (canonical, url or canonical, now, cutoff),
+                    )
+            except sqlite3.Error as exc:
+                logger.error(f"Dedup index lookup failed for {canonical}: {exc}")
+                self._stats["errors"] += 1
+                return True
+            claimed = cursor.rowcount == 1
+            self._stats["claimed" if claimed else "saved"] += 1
+        return claimed
+
+    def release(self, canonical: str) -> None:
+        """Forget ``canonical`` so a later :meth:`claim` succeeds.
+
+        Database errors are logged rather than raised, since releases run
+        on failure and cleanup paths.
+        """
+        with self._lock:
+            try:
+                with self.conn:
+                    self.conn.execute("DELETE FROM fetched WHERE canonical = ?", (canonical,))
+            except sqlite3.Error as exc:
+                logger.error(f"Dedup index release failed for {canonical}: {exc}")
+                self._stats["errors"] += 1
+                return
+            self._stats["released"] += 1
+
+    def __contains__(self, canonical: str) -> bool:
+        cutoff = time.time() - self.ttl if self.ttl is not None else float("-inf")
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM fetched WHERE canonical = ? AND fetched_at >= ?",
+                (canonical, cutoff),
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM fetched").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """Return ``claimed``, ``released``, ``saved`` (skipped fetches) and ``errors`` counts."""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "DedupIndex":
+        """Return the index instance for context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Close the SQLite connection when exiting a ``with`` block."""
+        self.close()
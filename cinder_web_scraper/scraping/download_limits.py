@@ -0,0 +1,127 @@
+"""Size and content-type limits for streamed response bodies."""
+
+from __future__ import annotations
+
+import codecs
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+DEFAULT_MAX_BODY_BYTES = 10 * 1024 * 1024
+DEFAULT_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class DownloadRejected(Exception):
+    """Raised when a response body exceeds the limits of a download."""
+
+    def __init__(self, url: str, reason: str) -> None:
+        super().__init__(f"Rejected {url}: {reason}")
+        self.url = url
+        self.reason = reason
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """Return the lower-cased media type of a ``Content-Type`` header."""
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+class DownloadLimits:
+    """Bound the memory used by a single response.
+
+    Bodies are read in chunks and the download is aborted as soon as the
+    ``Content-Type`` is not allowed or more than ``max_body_bytes`` arrive,
+    so an unexpectedly large file never has to fit in memory.
+    """
+
+    def __init__(
+        self,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        content_types: Optional[Iterable[str]] = DEFAULT_CONTENT_TYPES,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Create limits.
+
+        Args:
+            max_body_bytes: Largest accepted body. ``0`` or less disables the
+                size check.
+            content_types: Accepted media types such as ``"text/html"``.
+                Empty or ``None`` accepts every type. Responses without a
+                ``Content-Type`` header are always accepted.
+            chunk_size: Number of bytes read from the socket at a time.
+        """
+        self.max_body_bytes = int(max_body_bytes)
+        self.content_types = frozenset(media_type(t) for t in content_types or ())
+        self.chunk_size = max(1, int(chunk_size))
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> Optional["DownloadLimits"]:
+        """Build limits from the ``stream_download`` mapping of ``config``.
+
+        Returns ``None`` when streaming downloads are not configured.
+        """
+        settings = config.get("stream_download")
+        if not settings:
+            return None
+        if not isinstance(settings, Mapping):
+            settings = {}
+        return cls(
+            settings.get("max_body_bytes", DEFAULT_MAX_BODY_BYTES),
+            settings.get("content_types", DEFAULT_CONTENT_TYPES),
+            settings.get("chunk_size", DEFAULT_CHUNK_SIZE),
+        )
+
+    def check_headers(self, url: str, headers: Mapping[str, str]) -> None:
+        """Reject ``url`` from its headers alone, before reading the body.
+
+        Raises:
+            DownloadRejected: If the content type is not allowed or the
+                declared ``Content-Length`` is too large.
+        """
+        kind = media_type(headers.get("Content-Type"))
+        if kind and self.content_types and kind not in self.content_types:
+            raise DownloadRejected(url, f"content type {kind!r} not allowed")
+        length = headers.get("Content-Length", "")
+        if length.isdigit():
+            self.check_size(url, int(length))
+
+    def check_size(self, url: str, size: int) -> None:
+        """Raise :class:`DownloadRejected` if ``size`` exceeds the limit."""
+        if 0 < self.max_body_bytes < size:
+            raise DownloadRejected(
+                url, f"body larger than {self.max_body_bytes} bytes"
+            )
+
+    def iter_content(self, response: Any) -> Iterator[bytes]:
+        """Yield the body of a ``stream=True`` response chunk by chunk.
+
+        Raises:
+            DownloadRejected: As soon as a limit is exceeded.
+        """
+        url = response.url or ""
+        self.check_headers(url, response.headers)
+        received = 0
+        for chunk in response.iter_content(self.chunk_size):
+            received += len(chunk)
+            self.check_size(url, received)
+            yield chunk
+
+    def read(self, response: Any) -> bytes:
+        """Return the complete body of ``response`` within the limits."""
+        body = bytearray()
+        for chunk in self.iter_content(response):
+            body += chunk
+        return bytes(body)
+
+
+def decode_chunks(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[str]:
+    """Incrementally decode ``chunks``, replacing undecodable bytes."""
+    try:
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
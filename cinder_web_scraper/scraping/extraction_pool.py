@@ -0,0 +1,204 @@
+"""Process pool that runs HTML extraction outside the fetching process."""
+
+from __future__ import annotations
+
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Mapping, Optional
+
+from .content_extractor import ContentExtractor
+from .parsers import DEFAULT_PARSER
+
+# Extractor of a worker process, created by ``_init_worker``.
+_EXTRACTOR: Optional[ContentExtractor] = None
+
+
+def _init_worker(
+    parser: Optional[str], partial: bool, streaming: bool, log_disable: int
+) -> None:
+    global _EXTRACTOR  # pylint: disable=global-statement
+    # Fresh interpreters do not inherit ``logging.disable`` from the parent.
+    logging.disable(log_disable)
+    _EXTRACTOR = ContentExtractor(parser, partial=partial, streaming=streaming)
+
+
+def extract_page(
+    html: str,
+    selectors: Optional[Mapping[str, str]] = None,
+    parser: Optional[str] = None,
+    extractor: Optional[ContentExtractor] = None,
+) -> Dict[str, Any]:
+    """Extract a record from ``html`` the way :meth:`ScraperEngine.scrape_site` does.
+
+    With ``selectors`` the record holds the named fields (see
+    :meth:`ContentExtractor.extract_fields`), otherwise it is the result of
+    :meth:`ContentExtractor.extract_structured`.
+    """
+    extractor = extractor or _EXTRACTOR or ContentExtractor()
+    if selectors:
+        doc = extractor.parse_for(html, selectors.values(), parser=parser)
+        return extractor.extract_fields(doc, selectors)
+    if parser:
+        return extractor.extract_structured(extractor.parse(html, parser=parser))
+    return extractor.extract_structured(html)
+
+
+def _extract_shared(
+    name: str,
+    size: int,
+    encoding: str,
+    selectors: Optional[Mapping[str, str]],
+    parser: Optional[str],
+) -> Dict[str, Any]:
+    """Decode a body straight out of shared memory block ``name`` and extract it."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        view = block.buf[:size]
+        try:
+            html = str(view, encoding, "replace")
+        finally:
+            view.release()
+    finally:
+        block.close()
+    return extract_page(html, selectors, parser)
+
+
+def _extract_bytes(
+    body: bytes,
+    encoding: str,
+    selectors: Optional[Mapping[str, str]],
+    parser: Optional[str],
+) -> Dict[str, Any]:
+    return extract_page(body.decode(encoding, errors="replace"), selectors, parser)
+
+
+def _context() -> Any:
+    """Prefer ``forkserver``: workers never inherit the fetch threads' locks."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class ExtractionPool:
+    """Parse and extract page bodies in a pool of worker processes.
+
+    BeautifulSoup parsing holds the GIL, so threads fetching pages cannot
+    extract them on more than one core. :meth:`submit` hands a raw body to
+    one of ``processes`` workers and returns a future of the record.
+
+    Bodies are written once into a :mod:`multiprocessing.shared_memory`
+    block that the worker decodes in place; only the block's name crosses
+    the process boundary, instead of pickling the body through a pipe.
+    Blocks are unlinked as soon as their job finishes. At most
+    ``max_pending`` jobs are in flight: further calls to :meth:`submit`
+    block, which keeps fetching from outrunning extraction.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        parser: Optional[str] = DEFAULT_PARSER,
+        partial: bool = False,
+        streaming: bool = False,
+        max_pending: Optional[int] = None,
+        shared: bool = True,
+    ) -> None:
+        """Start the worker processes.
+
+        Args:
+            processes: Number of workers. Defaults to the number of CPUs.
+            parser: Parser backend of the workers' :class:`ContentExtractor`.
+            partial: Build only what the selectors need (see
+                :meth:`ContentExtractor.parse_for`).
+            streaming: Tree-free ``extract_structured`` in the workers.
+            max_pending: Jobs queued or running before :meth:`submit`
+                blocks. Defaults to twice ``processes``.
+            shared: Pass bodies through shared memory. ``False`` pickles
+                them instead, which is mainly useful for comparison.
+        """
+        self.processes = max(1, int(processes or os.cpu_count() or 1))
+        self.shared = shared
+        self._slots = threading.BoundedSemaphore(
+            max(1, int(max_pending or self.processes * 2))
+        )
+        self._executor = ProcessPoolExecutor(
+            self.processes,
+            mp_context=_context(),
+            initializer=_init_worker,
+            initargs=(parser, partial, streaming, logging.root.manager.disable),
+        )
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "bytes": 0}
+
+    def submit(
+        self,
+        body: bytes,
+        encoding: str = "utf-8",
+        selectors: Optional[Mapping[str, str]] = None,
+        parser: Optional[str] = None,
+    ) -> "Future[Dict[str, Any]]":
+        """Queue extraction of ``body`` and return a future of its record.
+
+        Args:
+            body: Raw page body.
+            encoding: Encoding used to decode ``body``.
+            selectors: Optional mapping of field name to CSS selector (see
+                :func:`extract_page`).
+            parser: Optional parser backend overriding the pool's default.
+        """
+        self._slots.acquire()
+        block = None
+        try:
+            if self.shared:
+                block = shared_memory.SharedMemory(create=True, size=max(1, len(body)))
+                block.buf[: len(body)] = body
+                future = self._executor.submit(
+                    _extract_shared, block.name, len(body), encoding,
+                    dict(selectors) if selectors else None, parser,
+                )
+            else:
+                future = self._executor.submit(
+                    _extract_bytes, body, encoding,
+                    dict(selectors) if selectors else None, parser,
+                )
+        except BaseException:
+            self._slots.release()
+            if block is not None:
+                block.close()
+                block.unlink()
+            raise
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._stats["bytes"] += len(body)
+        future.add_done_callback(functools.partial(self._done, block))
+        return future
+
+    def _done(self, block: Optional[shared_memory.SharedMemory], future: Future) -> None:
+        if block is not None:
+            block.close()
+            block.unlink()
+        self._slots.release()
+        failed = future.cancelled() or future.exception() is not None
+        with self._lock:
+            self._stats["failed" if failed else "completed"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return ``submitted``, ``completed`` and ``failed`` jobs and ``bytes`` shipped."""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        """Wait for running jobs and stop the workers."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ExtractionPool":
+        """Return the pool for context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Stop the workers when exiting a ``with`` block."""
+        self.close()
@@ -0,0 +1,229 @@
+"""Per-URL content fingerprints used to skip repeated work."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+from .near_duplicates import NearDuplicateDetector, record_text
+from .output_manager import OutputManager
+
+
+def content_hash(data: Union[str, bytes], context: str = "") -> str:
+    """Return a short hex digest of ``data``, salted with ``context``."""
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    digest = hashlib.blake2b(context.encode("utf-8"), digest_size=16)
+    digest.update(b"\0")
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def record_json(record: Any) -> str:
+    """Serialize ``record`` deterministically for hashing and storage."""
+    return json.dumps(record, sort_keys=True, default=str, ensure_ascii=False)
+
+
+class FingerprintStore:
+    """Remember a hash of each URL's body and of the record extracted from it.
+
+    :meth:`check_body` returns the previously extracted record when the body
+    hash is unchanged, so extraction can be skipped. :meth:`check_record`
+    reports whether a freshly extracted record differs from the stored one,
+    so writing identical output can be skipped. :meth:`stats` counts both
+    kinds of saved work for the lifetime of the store (one run).
+    """
+
+    def __init__(self, db_path: str = "data/fingerprints.db") -> None:
+        """Open (and create if needed) the fingerprint database.
+
+        Args:
+            db_path: Location of the SQLite database file.
+        """
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._init_db()
+        self._stats = {
+            "extracted": 0,
+            "extractions_skipped": 0,
+            "written": 0,
+            "writes_skipped": 0,
+        }
+
+    def _init_db(self) -> None:
+        """Create required tables if they don't exist."""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    url TEXT PRIMARY KEY,
+                    body_hash TEXT,
+                    record_hash TEXT,
+                    record TEXT,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    def check_body(
+        self, url: str, body: Union[str, bytes], context: str = ""
+    ) -> Tuple[str, Optional[Any]]:
+        """Hash ``body`` and look for the record extracted from the same body.
+
+        Args:
+            url: Page URL.
+            body: Page content.
+            context: Describes how records are extracted (for example the
+                site's selectors); a different context never matches.
+
+        Returns:
+            ``(body_hash, record)`` where ``record`` is the stored record if
+            the body is unchanged, otherwise ``None``.
+        """
+        body_hash = content_hash(body, context)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT body_hash, record FROM fingerprints WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None or row[0] != body_hash or row[1] is None:
+                self._stats["extracted"] += 1
+                return body_hash, None
+            self._stats["extractions_skipped"] += 1
+        try:
+            return body_hash, json.loads(row[1])
+        except ValueError as exc:
+            logger.error(f"Corrupt fingerprint record for {url}: {exc}")
+            return body_hash, None
+
+    def check_record(
+        self, url: str, record: Any, body_hash: Optional[str] = None
+    ) -> bool:
+        """Store ``record`` for ``url`` and return ``True`` if it changed.
+
+        ``body_hash`` is the hash from :meth:`check_body`; without it the
+        next :meth:`check_body` for ``url`` always extracts again.
+        """
+        text = record_json(record)
+        record_hash = content_hash(text)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT record_hash FROM fingerprints WHERE url = ?", (url,)
+            ).fetchone()
+            changed = row is None or row[0] != record_hash
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        """
+                        INSERT INTO fingerprints (url, body_hash, record_hash, record, updated_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT (url) DO UPDATE SET
+                            body_hash = excluded.body_hash,
+                            record_hash = excluded.record_hash,
+                            record = excluded.record,
+                            updated_at = excluded.updated_at
+                        """,
+                        (url, body_hash, record_hash, text, time.time()),
+                    )
+            except sqlite3.Error as exc:
+                logger.error(f"Failed to store fingerprint for {url}: {exc}")
+        return changed
+
+    def count_write(self, skipped: bool) -> None:
+        """Count an output write that was performed or ``skipped``."""
+        with self._lock:
+            self._stats["writes_skipped" if skipped else "written"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return ``extracted``, ``extractions_skipped``, ``written`` and ``writes_skipped``."""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "FingerprintStore":
+        """Return the store instance for context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Close the SQLite connection when exiting a ``with`` block."""
+        self.close()
+
+
+def process_page(
+    store: Optional[FingerprintStore],
+    output_manager: OutputManager,
+    url: str,
+    html: str,
+    output_path: Optional[str],
+    extract: Callable[[str], Any],
+    context: str,
+    detector: Optional[NearDuplicateDetector] = None,
+) -> Any:
+    """Run ``extract`` on ``html`` and save the result to ``output_path``.
+
+    With a ``store``, a page whose body (and extraction ``context``) is
+    unchanged since it was last processed reuses the stored record instead
+    of being extracted again. Writes go through :func:`save_record`, which
+    also applies the near-duplicate ``detector``.
+    """
+    body_hash = None
+    data = None
+    if store is not None:
+        body_hash, data = store.check_body(url, html, context)
+    if data is None:
+        data = extract(html)
+    save_record(store, output_manager, url, data, output_path, body_hash, detector)
+    return data
+
+
+def save_record(
+    store: Optional[FingerprintStore],
+    output_manager: OutputManager,
+    url: str,
+    data: Any,
+    output_path: Optional[str],
+    body_hash: Optional[str] = None,
+    detector: Optional[NearDuplicateDetector] = None,
+) -> None:
+    """Save ``data`` to ``output_path`` unless the write would be redundant.
+
+    Writes are skipped when ``detector`` has seen a near duplicate of the
+    record's text, or when ``store`` says the same record was already
+    written to ``output_path``. A record whose ``output_path`` already
+    exists is an update of that page, so it is only added to ``detector``:
+    it would otherwise match the earlier version of itself and never be
+    written.
+    """
+    changed = store.check_record(url, data, body_hash) if store is not None else True
+    if not output_path:
+        return
+    if detector is not None:
+        if output_manager.exists(output_path):
+            detector.add(record_text(data))
+        elif detector.seen(record_text(data)):
+            logger.log(
+                f"{url} is a near duplicate of an earlier page; not writing {output_path}"
+            )
+            return
+    if store is None:
+        output_manager.save(data, output_path)
+        return
+    if not changed and output_manager.exists(output_path):
+        logger.log(f"Output for {url} is unchanged; not rewriting {output_path}")
+        store.count_write(skipped=True)
+        return
+    output_manager.save(data, output_path)
+    store.count_write(skipped=False)
@@ -0,0 +1,293 @@
+"""On-disk HTTP cache supporting conditional requests and ``max-age``."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, NamedTuple, Optional
+
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+
+class CacheEntry(NamedTuple):
+    """A cached response body together with its validators."""
+
+    url: str
+    body: bytes
+    encoding: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires: float
+
+    @property
+    def fresh(self) -> bool:
+        """``True`` while the entry may be served without contacting the server."""
+        return self.expires > time.time()
+
+    @property
+    def text(self) -> str:
+        """The body decoded with the encoding of the original response."""
+        try:
+            return self.body.decode(self.encoding or "utf-8", errors="replace")
+        except LookupError:
+            return self.body.decode("utf-8", errors="replace")
+
+    def validators(self) -> Dict[str, str]:
+        """Return ``If-None-Match``/``If-Modified-Since`` request headers."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def freshness_deadline(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+    """Return the UNIX time until which a response is fresh.
+
+    ``Cache-Control: max-age`` takes precedence over ``Expires``. Responses
+    marked ``no-store`` return ``None`` (must not be cached) and
+    ``no-cache`` responses are stale immediately so they are always
+    revalidated.
+    """
+    now = time.time() if now is None else now
+    directives = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return now
+    max_age = directives.get("max-age", "")
+    if max_age.isdigit():
+        return now + int(max_age)
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return now
+    return now
+
+
+class HttpCache:
+    """Size-bounded HTTP response cache persisted in SQLite.
+
+    Bodies are stored together with their ``ETag``/``Last-Modified``
+    validators and freshness deadline, keyed by URL. When the total size of
+    stored bodies exceeds ``max_bytes`` the least recently used entries are
+    evicted. Counters returned by :meth:`stats` report how often pages were
+    served from the cache and how many body bytes were not re-downloaded.
+    """
+
+    def __init__(
+        self, db_path: str = "data/http_cache.db", max_bytes: int = 256 * 1024 * 1024
+    ) -> None:
+        """Open (and create if needed) the cache database.
+
+        Args:
+            db_path: Location of the SQLite database file.
+            max_bytes: Maximum combined size of cached bodies.
+        """
+        self.db_path = db_path
+        self.max_bytes = int(max_bytes)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._init_db()
+        row = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._total_bytes: int = row[0]
+        self._stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "evictions": 0,
+            "bytes_saved": 0,
+        }
+
+    def _init_db(self) -> None:
+        """Create required tables if they don't exist."""
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    encoding TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    expires REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed REAL NOT NULL
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Return the cached entry for ``url`` (fresh or stale) if present."""
+        with self._lock:
+            row = self.conn.execute(
+                """
+                SELECT body, encoding, etag, last_modified, expires
+                FROM responses WHERE url = ?
+                """,
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE responses SET accessed = ? WHERE url = ?", (time.time(), url)
+                )
+        return CacheEntry(url, *row)
+
+    def record_hit(self, entry: CacheEntry) -> None:
+        """Count ``entry`` as served without any network request."""
+        with self._lock:
+            self._stats["hits"] += 1
+            self._stats["bytes_saved"] += len(entry.body)
+
+    def revalidate(self, entry: CacheEntry, headers: Mapping[str, str]) -> CacheEntry:
+        """Handle a ``304 Not Modified`` answer for ``entry``.
+
+        The freshness deadline and any updated validators from ``headers``
+        are persisted and the refreshed entry is returned.
+        """
+        expires = freshness_deadline(headers)
+        updated = entry._replace(
+            etag=headers.get("ETag") or entry.etag,
+            last_modified=headers.get("Last-Modified") or entry.last_modified,
+            expires=expires if expires is not None else time.time(),
+        )
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    """
+                    UPDATE responses
+                    SET etag = ?, last_modified = ?, expires = ?, accessed = ?
+                    WHERE url = ?
+                    """,
+                    (
+                        updated.etag,
+                        updated.last_modified,
+                        updated.expires,
+                        time.time(),
+                        entry.url,
+                    ),
+                )
+            self._stats["revalidated"] += 1
+            self._stats["bytes_saved"] += len(entry.body)
+        return updated
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        headers: Mapping[str, str],
+        encoding: Optional[str] = None,
+    ) -> bool:
+        """Record a full download of ``url`` and cache it when allowed.
+
+        Responses are only stored when they can be reused later, i.e. they
+        carry a validator or a future freshness deadline and are not marked
+        ``no-store``.
+
+        Returns:
+            ``True`` if the response was cached.
+        """
+        with self._lock:
+            self._stats["misses"] += 1
+        expires = freshness_deadline(headers)
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        size = len(body)
+        if expires is None or size > self.max_bytes:
+            self.discard(url)
+            return False
+        if not (etag or last_modified or expires > time.time()):
+            return False
+
+        with self._lock:
+            try:
+                with self.conn:
+                    old = self.conn.execute(
+                        "SELECT size FROM responses WHERE url = ?", (url,)
+                    ).fetchone()
+                    self.conn.execute(
+                        """
+                        INSERT OR REPLACE INTO responses
+                        (url, body, encoding, etag, last_modified, expires, size, accessed)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (url, body, encoding, etag, last_modified, expires, size, time.time()),
+                    )
+                self._total_bytes += size - (old[0] if old else 0)
+                self._evict()
+            except sqlite3.Error as exc:
+                logger.error(f"Failed to cache response for {url}: {exc}")
+                return False
+        return True
+
+    def discard(self, url: str) -> None:
+        """Remove ``url`` from the cache if present."""
+        with self._lock:
+            with self.conn:
+                row = self.conn.execute(
+                    "SELECT size FROM responses WHERE url = ?", (url,)
+                ).fetchone()
+                if row:
+                    self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                    self._total_bytes -= row[0]
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the size bound holds."""
+        while self._total_bytes > self.max_bytes:
+            rows = self.conn.execute(
+                "SELECT url, size FROM responses ORDER BY accessed LIMIT 32"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            with self.conn:
+                for url, size in rows:
+                    if self._total_bytes <= self.max_bytes:
+                        break
+                    self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                    self._total_bytes -= size
+                    self._stats["evictions"] += 1
+
+    @property
+    def size(self) -> int:
+        """Combined size in bytes of all cached bodies."""
+        return self._total_bytes
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters, the hit ratio and bytes saved."""
+        with self._lock:
+            stats: Dict[str, float] = dict(self._stats)
+        served = stats["hits"] + stats["revalidated"]
+        total = served + stats["misses"]
+        stats["hit_rate"] = served / total if total else 0.0
+        stats["size"] = self._total_bytes
+        return stats
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "HttpCache":
+        """Return the cache instance for context manager support."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Close the SQLite connection when exiting a ``with`` block."""
+        self.close()
@@ -0,0 +1,233 @@
+"""Near-duplicate detection with MinHash and LSH banding."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from cinder_web_scraper.crawling.bloom_filter import BloomFilter
+
+_MASK = (1 << 64) - 1
+_EMPTY = _MASK
+_WORD = re.compile(r"\w+")
+
+
+def _mix(value: int) -> int:
+    """SplitMix64 finalizer: spread the bits of a 64-bit integer."""
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & _MASK
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & _MASK
+    return value ^ (value >> 31)
+
+
+def shingle_hashes(text: str, size: int = 3) -> List[int]:
+    """Return 64-bit hashes of the overlapping ``size``-word shingles of ``text``.
+
+    Words are lower-cased and hashed once each; shingle hashes are derived
+    from the word hashes, so the cost is linear in the length of ``text``.
+    """
+    cache: Dict[str, int] = {}
+    words = []
+    for word in _WORD.findall(text.lower()):
+        value = cache.get(word)
+        if value is None:
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            value = cache[word] = int.from_bytes(digest, "little")
+        words.append(value)
+    if not words:
+        return []
+    size = max(1, min(size, len(words)))
+    hashes = []
+    for start in range(len(words) - size + 1):
+        value = 0
+        for word in words[start : start + size]:
+            value = (value * 0x100000001B3 + word) & _MASK
+        hashes.append(_mix(value))
+    return hashes
+
+
+def minhash(hashes: Iterable[int], num_bins: int) -> Optional[List[int]]:
+    """One-permutation MinHash signature of a set of 64-bit ``hashes``.
+
+    Each hash falls into one of ``num_bins`` bins and every bin keeps its
+    minimum, so the signature costs one pass instead of one per bin. Empty
+    bins borrow from the next filled bin (rotation densification). Returns
+    ``None`` for an empty set.
+    """
+    bins = [_EMPTY] * num_bins
+    for value in hashes:
+        index = value % num_bins
+        rest = value // num_bins
+        if rest < bins[index]:
+            bins[index] = rest
+    filled = [i for i, value in enumerate(bins) if value != _EMPTY]
+    if not filled:
+        return None
+    if len(filled) < num_bins:
+        offset = (_MASK // num_bins) + 1
+        source = filled[0] + num_bins
+        for index in range(num_bins - 1, -1, -1):
+            if bins[index] != _EMPTY:
+                source = index
+            else:
+                bins[index] = (bins[source % num_bins] + (source - index) * offset) & _MASK
+    return bins
+
+
+def choose_bands(threshold: float, num_bins: int) -> Tuple[int, int]:
+    """Pick ``(bands, rows)`` whose LSH threshold ``(1/bands)**(1/rows)`` is closest."""
+    best = (1, num_bins)
+    best_error = float("inf")
+    for rows in range(1, num_bins + 1):
+        bands = num_bins // rows
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+def jaccard_estimate(first: List[int], second: List[int]) -> float:
+    """Fraction of equal bins of two signatures, estimating their Jaccard similarity."""
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+def record_text(record: Any) -> str:
+    """Return the text of a record: its ``text`` or all of its string values."""
+    if isinstance(record, str):
+        return record
+    if isinstance(record, Mapping):
+        text = record.get("text")
+        if isinstance(text, str):
+            return text
+        record = list(record.values())
+    if isinstance(record, (list, tuple)):
+        return " ".join(record_text(item) for item in record)
+    return ""
+
+
+class NearDuplicateDetector:
+    """Answer "has something at least ``threshold`` similar been seen?".
+
+    Similarity is the Jaccard similarity of word shingles, estimated with a
+    ``num_bins`` MinHash signature that is split into LSH bands. A document
+    counts as a near duplicate when any band matches a band of an earlier
+    document, so pages at the threshold are caught with probability close
+    to 1 - 1/e and the probability rises steeply above it. Bands are kept in
+    a :class:`BloomFilter`, so memory is fixed by ``capacity`` (about 2.3 MiB
+    per band and million documents) and a lookup costs one hash per band.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        capacity: int = 1_000_000,
+        num_bins: int = 256,
+        shingle_size: int = 3,
+        error_rate: float = 0.0001,
+    ) -> None:
+        """Create an empty detector.
+
+        Args:
+            threshold: Jaccard similarity above which pages are duplicates.
+            capacity: Expected number of distinct documents.
+            num_bins: MinHash signature length.
+            shingle_size: Number of words per shingle.
+            error_rate: False positive rate of each band lookup at
+                ``capacity``.
+        """
+        self.threshold = float(threshold)
+        self.num_bins = max(1, int(num_bins))
+        self.shingle_size = max(1, int(shingle_size))
+        self.bands, self.rows = choose_bands(self.threshold, self.num_bins)
+        self._bloom = BloomFilter(int(capacity) * self.bands, error_rate)
+        self._band = struct.Struct(f"<H{self.rows}Q")
+        self._lock = threading.Lock()
+        self._stats = {"checked": 0, "duplicates": 0}
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> Optional["NearDuplicateDetector"]:
+        """Build a detector from ``config["near_duplicates"]`` or return ``None``.
+
+        The mapping may set ``threshold``, ``capacity``, ``num_bins`` and
+        ``shingle_size``.
+        """
+        settings = config.get("near_duplicates")
+        if not settings:
+            return None
+        if not isinstance(settings, Mapping):
+            settings = {}
+        return cls(
+            float(settings.get("threshold", 0.9)),
+            int(settings.get("capacity", 1_000_000)),
+            int(settings.get("num_bins", 256)),
+            int(settings.get("shingle_size", 3)),
+        )
+
+    def signature(self, text: str) -> Optional[List[int]]:
+        """Return the MinHash signature of ``text`` (``None`` if it has no words)."""
+        return minhash(shingle_hashes(text, self.shingle_size), self.num_bins)
+
+    def _keys(self, signature: List[int]) -> List[bytes]:
+        rows = self.rows
+        return [
+            self._band.pack(band, *signature[band * rows : (band + 1) * rows])
+            for band in range(self.bands)
+        ]
+
+    def matches(self, signature: List[int]) -> bool:
+        """Return ``True`` if any LSH band of ``signature`` was added before."""
+        return any(key in self._bloom for key in self._keys(signature))
+
+    def contains(self, text: str) -> bool:
+        """Return ``True`` if a near duplicate of ``text`` was added before."""
+        signature = self.signature(text)
+        return signature is not None and self.matches(signature)
+
+    def add(self, text: str) -> None:
+        """Remember ``text``."""
+        signature = self.signature(text)
+        if signature is not None:
+            for key in self._keys(signature):
+                self._bloom.add(key)
+
+    def seen(self, text: str) -> bool:
+        """Return ``True`` for a near duplicate; otherwise remember ``text``.
+
+        Texts without words are never duplicates.
+        """
+        signature = self.signature(text)
+        duplicate = False
+        if signature is not None:
+            with self._lock:
+                keys = self._keys(signature)
+                duplicate = any(key in self._bloom for key in keys)
+                if not duplicate:
+                    for key in keys:
+                        self._bloom.add(key)
+        with self._lock:
+            self._stats["checked"] += 1
+            self._stats["duplicates"] += duplicate
+        return duplicate
+
+    def filter(self, records: Iterable[Any]) -> Iterator[Any]:
+        """Yield the records of ``records`` that are not near duplicates.
+
+        The text of a record is its ``text`` key or, for other mappings
+        (such as :meth:`ContentExtractor.extract_fields` results), all of
+        its string values (see :func:`record_text`).
+        """
+        for record in records:
+            if not self.seen(record_text(record)):
+                yield record
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by the band filter."""
+        return self._bloom.size_bytes
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many texts were ``checked`` and how many were ``duplicates``."""
+        with self._lock:
+            return dict(self._stats)
@@ -15,6 +15,17 @@ class OutputManager:
 
     BASE_DIR = Path("output")
 
+    def resolve(self, path: str) -> Path:
+        """Return the file ``path`` refers to, relative to ``BASE_DIR`` if needed."""
+        dest = Path(path)
+        if not dest.is_absolute():
+            dest = self.BASE_DIR / dest
+        return dest
+
+    def exists(self, path: str) -> bool:
+        """Return ``True`` if output was already written to ``path``."""
+        return self.resolve(path).is_file()
+
     def save(self, data: Any, path: str) -> bool:
         """Save scraped ``data`` to ``path``.
 
@@ -37,12 +48,7 @@ class OutputManager:
         """
 
         logger.log(f"Saving data to {path}")
-        # Actual saving logic would go here
-
-
-        dest = Path(path)
-        if not dest.is_absolute():
-            dest = self.BASE_DIR / dest
+        dest = self.resolve(path)
 
         try:
             dest.parent.mkdir(parents=True, exist_ok=True)
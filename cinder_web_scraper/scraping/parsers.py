@@ -0,0 +1,59 @@
+"""Discovery and selection of ``BeautifulSoup`` parser backends."""
+
+from __future__ import annotations
+
+import importlib.util
+from functools import lru_cache
+from typing import List, Optional
+
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+# Backends known to the extractor mapped to the module they require.
+PARSER_MODULES = {
+    "lxml": "lxml",
+    "html5lib": "html5lib",
+    "html.parser": None,
+}
+
+# Preference order used by ``"auto"``. ``html5lib`` is the most lenient but
+# also the slowest backend, so it is only used when requested explicitly.
+AUTO_PREFERENCE = ("lxml", "html.parser")
+
+# Backends build different trees from malformed HTML, so the default never
+# depends on what happens to be installed.
+DEFAULT_PARSER = "html.parser"
+
+
+@lru_cache(maxsize=None)
+def is_available(name: str) -> bool:
+    """Return ``True`` if the parser backend ``name`` can be used."""
+    if name not in PARSER_MODULES:
+        return False
+    module = PARSER_MODULES[name]
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def available_parsers() -> List[str]:
+    """Return the names of all installed parser backends."""
+    return [name for name in PARSER_MODULES if is_available(name)]
+
+
+def resolve_parser(name: Optional[str] = DEFAULT_PARSER) -> str:
+    """Map a configured parser ``name`` to an installed backend.
+
+    ``None`` means :data:`DEFAULT_PARSER`; ``"auto"`` opts into the fastest
+    installed backend. Unknown or missing backends log a warning and fall
+    back to :data:`DEFAULT_PARSER`, so a configuration written for one
+    machine still works on another.
+    """
+    if not name:
+        return DEFAULT_PARSER
+    if name == "auto":
+        for candidate in AUTO_PREFERENCE:
+            if is_available(candidate):
+                return candidate
+        return DEFAULT_PARSER
+    if is_available(name):
+        return name
+    logger.warning(f"HTML parser '{name}' is not available; falling back")
+    return DEFAULT_PARSER
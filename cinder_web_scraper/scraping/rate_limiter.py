@@ -0,0 +1,234 @@
+"""Per-host token bucket rate limiting for polite scraping."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+from urllib.parse import urlsplit
+
+
+def host_of(url: str) -> str:
+    """Return the lower-cased host name for ``url``.
+
+    Bare host names (without a scheme) are returned unchanged apart from
+    case folding, so callers may pass either a URL or a host.
+    """
+    if "//" not in url:
+        return url.lower()
+    return (urlsplit(url).hostname or "").lower()
+
+
+class TokenBucket:
+    """Thread-safe token bucket supporting reservations.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``.
+    :meth:`reserve` always takes a token, letting the balance go negative,
+    and returns how long the caller must wait before using it. Reservations
+    keep callers ordered without holding the lock while they sleep.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a bucket.
+
+        Args:
+            rate: Tokens added per second. ``0`` or less disables limiting.
+            burst: Maximum number of tokens the bucket can hold.
+            clock: Monotonic time source, mainly useful for tests.
+        """
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` and return the seconds to wait before proceeding."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    @property
+    def tokens(self) -> float:
+        """Number of tokens currently available (negative when overbooked)."""
+        with self._lock:
+            self._refill(self._clock())
+            return self._tokens
+
+    def configure(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        tokens: Optional[float] = None,
+    ) -> None:
+        """Change the refill ``rate``, ``burst`` size and/or balance in place."""
+        with self._lock:
+            self._refill(self._clock())
+            if rate is not None:
+                self.rate = float(rate)
+            if burst is not None:
+                self.burst = max(1.0, float(burst))
+                self._tokens = min(self._tokens, self.burst)
+            if tokens is not None:
+                self._tokens = min(float(tokens), self.burst)
+
+
+class HostRateLimiter:
+    """Maintain an independent :class:`TokenBucket` for every host.
+
+    Waiting for one host never delays requests to another, so a slow rate
+    for a fragile site does not throttle the rest of a batch.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: float = 1.0,
+        overrides: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a limiter.
+
+        Args:
+            rate: Default requests per second for each host. ``0`` or less
+                means unlimited.
+            burst: Default number of requests a host may receive back to back.
+            overrides: Optional mapping of host to a dictionary with
+                ``requests_per_second`` and/or ``burst`` keys.
+            clock: Monotonic time source, mainly useful for tests.
+        """
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._overrides: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        for host, limits in (overrides or {}).items():
+            self.configure_host(
+                host, limits.get("requests_per_second"), limits.get("burst")
+            )
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], delay: float) -> "HostRateLimiter":
+        """Build a limiter from an engine configuration dictionary.
+
+        ``config["rate_limit"]`` may provide ``requests_per_second`` and
+        ``burst`` defaults; otherwise the rate is derived from ``delay``.
+        Site entries listed under ``config["websites"]`` are applied as
+        per-host overrides (see :meth:`configure_sites`).
+        """
+        limits = config.get("rate_limit") or {}
+        default_rate = 1.0 / delay if delay > 0 else 0.0
+        limiter = cls(
+            rate=float(limits.get("requests_per_second", default_rate)),
+            burst=float(limits.get("burst", 1.0)),
+        )
+        limiter.configure_sites(config.get("websites") or [])
+        return limiter
+
+    def configure_sites(self, sites: Iterable[Mapping[str, Any]]) -> None:
+        """Apply ``rate_limit`` overrides from ``websites.json`` style entries.
+
+        Each entry with a ``url`` and a ``rate_limit`` mapping such as
+        ``{"requests_per_second": 0.5, "burst": 2}`` configures its host.
+        """
+        for site in sites:
+            if not isinstance(site, Mapping):
+                continue
+            limits = site.get("rate_limit")
+            if site.get("url") and limits:
+                self.configure_host(
+                    host_of(site["url"]),
+                    limits.get("requests_per_second"),
+                    limits.get("burst"),
+                )
+
+    def configure_host(
+        self, host: str, rate: Optional[float] = None, burst: Optional[float] = None
+    ) -> None:
+        """Override the ``rate`` and/or ``burst`` for a single ``host``."""
+        host = host_of(host)
+        with self._lock:
+            override = self._overrides.setdefault(host, {})
+            if rate is not None:
+                override["rate"] = float(rate)
+            if burst is not None:
+                override["burst"] = float(burst)
+            bucket = self._buckets.get(host)
+        if bucket is not None:
+            bucket.configure(rate, burst)
+
+    def bucket(self, url: str) -> TokenBucket:
+        """Return the bucket for the host of ``url``, creating it if needed."""
+        host = host_of(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                override = self._overrides.get(host, {})
+                bucket = TokenBucket(
+                    override.get("rate", self.rate),
+                    override.get("burst", self.burst),
+                    self._clock,
+                )
+                self._buckets[host] = bucket
+            return bucket
+
+    def reserve(self, url: str) -> float:
+        """Reserve a request slot for ``url`` and return the required wait."""
+        return self.bucket(url).reserve()
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to ``url`` is allowed.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """Asynchronous variant of :meth:`acquire` using :func:`asyncio.sleep`."""
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def restore(self, limits: Mapping[str, Mapping[str, float]]) -> None:
+        """Reapply a :meth:`limits` snapshot, e.g. from a crawl checkpoint.
+
+        Hosts get their saved ``rate`` and ``burst`` as overrides and start
+        with the saved token balance, so a resumed run does not burst at
+        hosts the interrupted one had already used up.
+        """
+        for host, state in limits.items():
+            self.configure_host(host, state.get("rate"), state.get("burst"))
+            if state.get("tokens") is not None:
+                self.bucket(host).configure(tokens=state["tokens"])
+
+    def limits(self) -> Dict[str, Dict[str, float]]:
+        """Return the effective ``rate``/``burst``/``tokens`` for known hosts."""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            host: {"rate": b.rate, "burst": b.burst, "tokens": b.tokens}
+            for host, b in buckets.items()
+        }
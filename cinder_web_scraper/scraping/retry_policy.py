@@ -0,0 +1,132 @@
+"""Retry timing with exponential backoff, jitter and ``Retry-After`` support."""
+
+from __future__ import annotations
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Collection, Mapping, Optional
+
+# Statuses that signal a transient problem worth retrying.
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Convert a ``Retry-After`` header into seconds to wait.
+
+    Both the delta-seconds and the HTTP-date forms are understood.
+
+    Args:
+        value: Raw header value, or ``None`` when the header is absent.
+        now: Current UNIX timestamp used for HTTP dates. Defaults to
+            :func:`time.time`.
+
+    Returns:
+        The non-negative number of seconds to wait, or ``None`` if the header
+        is missing or cannot be parsed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    current = time.time() if now is None else now
+    return max(0.0, retry_at.timestamp() - current)
+
+
+class RetryPolicy:
+    """Decide whether and when a failed request should be retried.
+
+    Delays grow exponentially with each attempt and use "full jitter"
+    (a random value between zero and the exponential cap) so that workers
+    retrying the same host spread out instead of hitting it in lockstep.
+    A server supplied ``Retry-After`` is treated as a lower bound.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        retry_statuses: Collection[int] = RETRYABLE_STATUSES,
+        random_func: Callable[[], float] = random.random,
+    ) -> None:
+        """Create a policy.
+
+        Args:
+            max_attempts: Total number of attempts including the first one.
+            base_delay: Backoff before the first retry, in seconds.
+            max_delay: Upper bound for any single wait. A ``Retry-After``
+                longer than this aborts the retries instead of waiting.
+            multiplier: Growth factor applied per attempt.
+            jitter: Whether to randomise delays between zero and the cap.
+            retry_statuses: HTTP status codes considered transient.
+            random_func: Source of random numbers in ``[0, 1)``.
+        """
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = max(0.0, float(max_delay))
+        self.multiplier = max(1.0, float(multiplier))
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self._random = random_func
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], delay: float) -> "RetryPolicy":
+        """Build a policy from an engine configuration dictionary.
+
+        Recognised keys are ``retries``, ``backoff_base`` (defaults to
+        ``delay``), ``backoff_max``, ``backoff_multiplier`` and ``jitter``.
+        """
+        return cls(
+            max_attempts=int(config.get("retries", 3)),
+            base_delay=float(config.get("backoff_base", delay)),
+            max_delay=float(config.get("backoff_max", 60.0)),
+            multiplier=float(config.get("backoff_multiplier", 2.0)),
+            jitter=bool(config.get("jitter", True)),
+        )
+
+    def is_retryable_status(self, status: Optional[int]) -> bool:
+        """Return ``True`` if ``status`` is transient.
+
+        ``None`` stands for a connection level failure and is retryable.
+        """
+        return status is None or status in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Return the backoff to apply after failed ``attempt`` (1-based)."""
+        cap = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            return cap * self._random()
+        return cap
+
+    def next_delay(
+        self,
+        attempt: int,
+        status: Optional[int] = None,
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        """Return how long to wait before retrying, or ``None`` to give up.
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based).
+            status: HTTP status of the failure, ``None`` for network errors.
+            retry_after: Raw ``Retry-After`` header from the response.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable_status(status):
+            return None
+        delay = self.backoff(attempt)
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            if server_delay > self.max_delay:
+                return None
+            delay = max(delay, server_delay)
+        return delay
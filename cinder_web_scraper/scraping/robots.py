@@ -0,0 +1,236 @@
+"""Shared, TTL-bounded cache of parsed ``robots.txt`` files."""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+from requests.exceptions import RequestException
+
+from .rate_limiter import HostRateLimiter, host_of
+
+from cinder_web_scraper.utils.logger import default_logger as logger
+
+# Seconds a fetched robots.txt is trusted.
+DEFAULT_TTL = 24 * 60 * 60
+# Seconds before a robots.txt that could not be fetched is tried again.
+ERROR_TTL = 5 * 60
+# Larger files are cut off, as RFC 9309 permits (500 KiB).
+MAX_ROBOTS_BYTES = 500 * 1024
+
+
+def robots_url(url: str) -> str:
+    """Return the ``robots.txt`` location governing ``url``."""
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}/robots.txt"
+
+
+class RobotsRules:
+    """Parsed rules of one origin and when they expire."""
+
+    def __init__(self, parser: RobotFileParser, expires: float) -> None:
+        self.parser = parser
+        self.expires = expires
+        # Rate limiters that already received this file's delay.
+        self._applied: "weakref.WeakSet[HostRateLimiter]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def can_fetch(self, user_agent: str, url: str) -> bool:
+        """Return ``True`` if ``user_agent`` may fetch ``url``."""
+        return self.parser.can_fetch(user_agent, url)
+
+    def delay(self, user_agent: str) -> Optional[float]:
+        """Seconds to wait between requests from ``Crawl-delay``/``Request-rate``."""
+        delays = []
+        crawl_delay = self.parser.crawl_delay(user_agent)
+        if crawl_delay is not None:
+            delays.append(float(crawl_delay))
+        rate = self.parser.request_rate(user_agent)
+        if rate is not None and rate.requests > 0:
+            delays.append(rate.seconds / rate.requests)
+        return max(delays) if delays else None
+
+    def apply_delay(self, url: str, user_agent: str, limiter: HostRateLimiter) -> None:
+        """Slow ``limiter`` down for the host of ``url`` to honour :meth:`delay`.
+
+        Each limiter is adjusted once per fetched file, and only ever made
+        slower than its configured rate.
+        """
+        with self._lock:
+            if limiter in self._applied:
+                return
+            self._applied.add(limiter)
+        delay = self.delay(user_agent)
+        if not delay or delay <= 0:
+            return
+        rate = 1.0 / delay
+        current = limiter.bucket(url).rate
+        if current <= 0 or rate < current:
+            logger.log(f"Applying robots.txt delay of {delay:g}s to {host_of(url)}")
+            limiter.configure_host(url, rate, 1.0)
+
+
+class RobotsCache:
+    """Fetch each origin's ``robots.txt`` at most once per ``ttl``.
+
+    Parsed :class:`RobotsRules` stay in memory, least recently used first
+    out once ``max_hosts`` origins are cached. Concurrent lookups for an
+    origin that is not cached wait for a single download. ``401``/``403``
+    responses disallow everything, other ``4xx`` responses allow
+    everything, and server or network errors disallow the origin for
+    :data:`ERROR_TTL` seconds, as RFC 9309 recommends.
+
+    :meth:`shared` returns one process-wide instance so every engine
+    benefits from files fetched by the others.
+    """
+
+    _shared: Optional["RobotsCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_hosts: int = 4096,
+        timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            ttl: Seconds a fetched ``robots.txt`` is reused.
+            max_hosts: Number of origins kept in memory.
+            timeout: Timeout for downloading a ``robots.txt``.
+            clock: Monotonic time source, mainly useful for tests.
+        """
+        self.ttl = float(ttl)
+        self.max_hosts = max(1, int(max_hosts))
+        self.timeout = timeout
+        self._clock = clock
+        self._rules: "OrderedDict[str, RobotsRules]" = OrderedDict()
+        self._fetching: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "fetches": 0, "errors": 0}
+
+    @classmethod
+    def shared(cls) -> "RobotsCache":
+        """Return the process-wide cache, creating it on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def rules_for(
+        self, url: str, session: Any = None, user_agent: Optional[str] = None
+    ) -> RobotsRules:
+        """Return the rules for the origin of ``url``, fetching them if needed.
+
+        Args:
+            url: Any URL of the origin.
+            session: Optional ``requests.Session`` used for the download.
+            user_agent: ``User-Agent`` header sent with the download.
+        """
+        location = robots_url(url)
+        rules = self._cached(location)
+        if rules is not None:
+            return rules
+
+        with self._lock:
+            fetch_lock = self._fetching.setdefault(location, threading.Lock())
+        with fetch_lock:
+            # Another thread may have fetched the file while we waited.
+            rules = self._cached(location)
+            if rules is None:
+                rules = self._fetch(location, session, user_agent)
+                self._store(location, rules)
+        with self._lock:
+            self._fetching.pop(location, None)
+        return rules
+
+    def allowed(
+        self,
+        url: str,
+        user_agent: str,
+        session: Any = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+    ) -> bool:
+        """Return ``True`` if ``robots.txt`` lets ``user_agent`` fetch ``url``.
+
+        When ``rate_limiter`` is given, the file's ``Crawl-delay`` or
+        ``Request-rate`` is applied to it (see :meth:`RobotsRules.apply_delay`).
+        """
+        rules = self.rules_for(url, session, user_agent)
+        if rate_limiter is not None:
+            rules.apply_delay(url, user_agent, rate_limiter)
+        return rules.can_fetch(user_agent, url)
+
+    def _cached(self, location: str) -> Optional[RobotsRules]:
+        with self._lock:
+            rules = self._rules.get(location)
+            if rules is None or rules.expires <= self._clock():
+                return None
+            self._rules.move_to_end(location)
+            self._stats["hits"] += 1
+            return rules
+
+    def _store(self, location: str, rules: RobotsRules) -> None:
+        with self._lock:
+            self._rules[location] = rules
+            self._rules.move_to_end(location)
+            while len(self._rules) > self.max_hosts:
+                self._rules.popitem(last=False)
+
+    def _fetch(
+        self, location: str, session: Any, user_agent: Optional[str]
+    ) -> RobotsRules:
+        """Download and parse ``location``."""
+        parser = RobotFileParser(location)
+        ttl = self.ttl
+        headers = {"User-Agent": user_agent} if user_agent else None
+        response = None
+        try:
+            response = (session or requests).get(
+                location, timeout=self.timeout, headers=headers, stream=True
+            )
+            if response.status_code >= 500:
+                raise RequestException(f"HTTP {response.status_code}")
+            body = response.raw.read(MAX_ROBOTS_BYTES, decode_content=True)
+        except (RequestException, OSError) as exc:
+            logger.warning(f"Could not fetch {location}: {exc}; disallowing for now")
+            parser.disallow_all = True
+            ttl = min(ttl, ERROR_TTL)
+            with self._lock:
+                self._stats["errors"] += 1
+        else:
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif response.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(body.decode("utf-8", errors="replace").splitlines())
+        finally:
+            if response is not None:
+                response.close()
+        parser.modified()
+        with self._lock:
+            self._stats["fetches"] += 1
+        return RobotsRules(parser, self._clock() + ttl)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rules)
+
+    def clear(self) -> None:
+        """Forget every cached origin."""
+        with self._lock:
+            self._rules.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return ``hits``, ``fetches`` and ``errors`` counts."""
+        with self._lock:
+            return dict(self._stats)
@@ -2,20 +2,64 @@
 
 from __future__ import annotations
 
+import functools
+import heapq
+import itertools
 import logging
 import time
-from typing import Any, Dict, Optional
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
 import requests
 from requests import Response
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
-from bs4 import BeautifulSoup
 
+from .adaptive_concurrency import AdaptiveConcurrency
+from .charset import CharsetDetector
 from .content_extractor import ContentExtractor
+from .dedup_index import DedupIndex
+from .circuit_breaker import CircuitBreaker
+from .connection_pool import InstrumentedAdapter
+from .download_limits import DownloadLimits, DownloadRejected, decode_chunks
+from .extraction_pool import ExtractionPool
+from .fingerprints import FingerprintStore, content_hash, process_page, save_record
+from .near_duplicates import NearDuplicateDetector
+from .http_cache import CacheEntry, HttpCache
 from .output_manager import OutputManager
+from .parsers import DEFAULT_PARSER
+from .rate_limiter import HostRateLimiter, host_of
+from .retry_policy import RetryPolicy
+from .robots import RobotsCache
+from .single_flight import SingleFlight
+from .structured_parser import StructuredParser
+from .url_normalizer import UrlNormalizer
 
 from cinder_web_scraper.utils.logger import default_logger as logger
 
+# Reasons given to ``on_skip`` callbacks, besides ``DownloadRejected.reason``.
+SKIP_DUPLICATE = "duplicate"
+SKIP_ROBOTS = "disallowed by robots.txt"
+
+
 class ScraperEngine:
     """Download pages and extract data using provided helpers with retry support."""
 
@@ -32,10 +76,57 @@ class ScraperEngine:
             extractor: ``ContentExtractor`` instance for parsing HTML.
             output_manager: ``OutputManager`` instance for persisting data.
             config: Optional configuration dictionary. Supported keys are
-                ``user_agent``, ``delay``, ``timeout``, and ``retries``.
-            delay: Seconds to wait between requests (fallback if not in config).
+                ``user_agent``, ``delay``, ``timeout``, ``retries``,
+                ``concurrency``, ``rate_limit`` (``requests_per_second`` and
+                ``burst`` applied to every host), ``websites`` (site
+                entries whose ``rate_limit`` overrides the default per host),
+                the backoff settings read by :meth:`RetryPolicy.from_config`,
+                ``circuit_breaker`` (see :meth:`CircuitBreaker.from_config`),
+                ``http_cache`` (a mapping with ``path`` and ``max_bytes``
+                enabling the on-disk :class:`HttpCache`), ``parser`` (the
+                HTML parser backend of the default extractor, ``html.parser``
+                unless set; ``auto`` picks the fastest installed one),
+                ``partial_parse`` (only build the parts of a page that site
+                selectors can match), ``streaming_extract`` (tree-free
+                ``extract_structured``), ``stream_download`` (a mapping
+                with ``max_body_bytes``, ``content_types`` and
+                ``chunk_size`` enabling bounded streaming downloads, see
+                :class:`DownloadLimits`), ``charset_sample_bytes`` (how
+                much of a page statistical charset detection may look at),
+                ``url_rules`` (default :class:`UrlRules`, overridable by a
+                site's ``url_rules``), ``dedup_index`` (a mapping with
+                ``path`` and ``ttl`` enabling the persistent
+                :class:`DedupIndex` of fetched canonical URLs),
+                ``fingerprints`` (a mapping with ``path`` enabling the
+                :class:`FingerprintStore` that skips re-extracting unchanged
+                pages and rewriting unchanged records), ``near_duplicates``
+                (a mapping with ``threshold`` and ``capacity`` enabling the
+                :class:`NearDuplicateDetector` that keeps near-identical
+                records out of the output), ``respect_robots`` (obey
+                ``robots.txt`` through the shared :class:`RobotsCache`,
+                applying its ``Crawl-delay``), ``extract_processes`` (worker
+                processes of :meth:`extract_many`, defaulting to the CPU
+                count), ``coalesce`` (``True`` or a mapping with ``ttl``: share
+                concurrent fetches and extractions of the same canonical URL
+                through the process-wide :class:`SingleFlight` with engines
+                that fetch and parse alike, and reuse results for ``ttl``
+                seconds, default 2),
+                ``connection_pool`` (a mapping with ``per_host``, ``hosts``,
+                ``block``, ``idle_timeout`` and ``shared`` configuring the
+                :class:`InstrumentedAdapter`, shared across engines unless
+                ``shared`` is false; without it a stock ``HTTPAdapter`` is
+                used) and ``adaptive_concurrency`` (``True``
+                or a mapping for :meth:`AdaptiveConcurrency.from_config`:
+                batch modes then adjust the requests in flight per host,
+                up to ``concurrency``).
+            delay: Seconds to wait between requests to the same host
+                (fallback if not in config).
         """
-        self.extractor = extractor or ContentExtractor()
+        self.extractor = extractor or ContentExtractor(
+            (config or {}).get("parser", DEFAULT_PARSER),
+            partial=bool((config or {}).get("partial_parse", False)),
+            streaming=bool((config or {}).get("streaming_extract", False)),
+        )
         self.output_manager = output_manager or OutputManager()
         self.config = config or {}
 
@@ -46,11 +137,100 @@ class ScraperEngine:
         self.delay: float = float(self.config.get("delay", delay))
         self.timeout: int = int(self.config.get("timeout", 30))
         self.retries: int = int(self.config.get("retries", 3))
+        self.concurrency: int = max(1, int(self.config.get("concurrency", 8)))
+        self.rate_limiter = HostRateLimiter.from_config(self.config, self.delay)
+        self.retry_policy = RetryPolicy.from_config(self.config, self.delay)
+        self.circuit_breaker = CircuitBreaker.from_config(self.config)
+        self.http_cache: Optional[HttpCache] = None
+        cache_config = self.config.get("http_cache")
+        if cache_config:
+            self.http_cache = HttpCache(
+                cache_config.get("path", "data/http_cache.db"),
+                int(cache_config.get("max_bytes", 256 * 1024 * 1024)),
+            )
+        self.download_limits = DownloadLimits.from_config(self.config)
+        self.charset_detector = CharsetDetector(
+            int(self.config.get("charset_sample_bytes", 64 * 1024))
+        )
+        self.url_normalizer = UrlNormalizer.from_config(self.config)
+        self.dedup_index: Optional[DedupIndex] = None
+        dedup_config = self.config.get("dedup_index")
+        if dedup_config:
+            ttl = dedup_config.get("ttl")
+            self.dedup_index = DedupIndex(
+                dedup_config.get("path", "data/dedup_index.db"),
+                float(ttl) if ttl is not None else None,
+            )
+        self.fingerprints: Optional[FingerprintStore] = None
+        fingerprint_config = self.config.get("fingerprints")
+        if fingerprint_config:
+            self.fingerprints = FingerprintStore(
+                fingerprint_config.get("path", "data/fingerprints.db")
+            )
+        self.near_duplicates = NearDuplicateDetector.from_config(self.config)
+        self.robots: Optional[RobotsCache] = (
+            RobotsCache.shared() if self.config.get("respect_robots") else None
+        )
+        coalesce = self.config.get("coalesce")
+        self.single_flight: Optional[SingleFlight] = (
+            SingleFlight.shared() if coalesce else None
+        )
+        self.coalesce_ttl = float(
+            coalesce.get("ttl", 2.0) if isinstance(coalesce, Mapping) else 2.0
+        )
+        pool_config = self.config.get("connection_pool")
+        pool_settings = pool_config if isinstance(pool_config, Mapping) else {}
+        self.adapter: Optional[InstrumentedAdapter] = None
+        self._pool_size = 0
+        if pool_config:
+            if pool_settings.get("shared", True):
+                self.adapter = InstrumentedAdapter.shared(pool_settings, self.concurrency)
+            else:
+                self.adapter = InstrumentedAdapter.from_config(pool_settings, self.concurrency)
+            self.session.mount("http://", self.adapter)
+            self.session.mount("https://", self.adapter)
+        else:
+            self._ensure_pool_size(self.concurrency)
+        self.adaptive_concurrency = AdaptiveConcurrency.from_config(
+            self.config, self.concurrency
+        )
+
+    def _ensure_pool_size(self, size: int) -> None:
+        """Keep at least ``size`` connections per host."""
+        if self.adapter is not None:
+            self.adapter.grow(size)
+            return
+        if size <= self._pool_size:
+            return
+        adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pool_size = size
+
+    def connection_stats(self) -> Dict[str, float]:
+        """Return connection reuse, TLS handshake and pool wait counters.
+
+        See :class:`PoolMetrics`; with a shared pool the counters cover
+        every engine using it. Empty unless ``connection_pool`` is set.
+        """
+        if self.adapter is None:
+            return {}
+        return self.adapter.stats()
+
+    def concurrency_limits(self) -> Dict[str, Dict[str, float]]:
+        """Return the adaptive per-host concurrency limits of batch modes.
+
+        See :meth:`AdaptiveConcurrency.limits`; empty unless
+        ``adaptive_concurrency`` is configured.
+        """
+        if self.adaptive_concurrency is None:
+            return {}
+        return self.adaptive_concurrency.limits()
 
     def scrape(self, url: str, output_path: Optional[str] = None) -> Optional[str]:
         """Scrape ``url`` and return the HTML content with retry support.
 
-        The method respects the configured request delay and handles common
+        The method respects the per-host rate limit and handles common
         network errors gracefully. If output_path is provided, extracted data
         is also saved.
 
@@ -61,32 +241,637 @@ class ScraperEngine:
         Returns:
             The raw HTML on success, otherwise ``None``.
         """
+        return self._scrape(url, output_path)
+
+    def _scrape(
+        self,
+        url: str,
+        output_path: Optional[str] = None,
+        reserved: bool = False,
+        consume: Optional[Callable[[Response], Any]] = None,
+        claimed: bool = False,
+        on_skip: Optional[Callable[[str, str], None]] = None,
+    ) -> Any:
+        """Implementation of :meth:`scrape`.
+
+        URLs disallowed by ``robots.txt`` (with ``respect_robots``) and
+        responses rejected by the ``download_limits`` return ``None``. With
+        a :attr:`dedup_index` the canonical form of ``url`` is claimed first
+        and ``None`` is returned for duplicates; ``claimed`` means the
+        caller already did so. Claims of failed fetches are released.
+        ``on_skip`` is called with ``url`` and the reason when the page is
+        skipped for one of these permanent reasons rather than failing.
+        """
+        if self.robots is not None and not self._robots_allow(url):
+            if claimed and self.dedup_index is not None:
+                self.dedup_index.release(self.url_normalizer.normalize(url))
+            if on_skip is not None:
+                on_skip(url, SKIP_ROBOTS)
+            return None
+        if self.dedup_index is not None and not claimed and not self._claim(url):
+            if on_skip is not None:
+                on_skip(url, SKIP_DUPLICATE)
+            return None
+        try:
+            result = self._fetch_shared(url, output_path, reserved, consume)
+        except DownloadRejected as exc:
+            logger.warning(str(exc))
+            if on_skip is not None:
+                on_skip(url, exc.reason)
+            result = None
+        if result is None and self.dedup_index is not None:
+            self.dedup_index.release(self.url_normalizer.normalize(url))
+        return result
+
+    def _robots_allow(self, url: str) -> bool:
+        """Check ``robots.txt`` for ``url``, applying its crawl delay."""
+        user_agent = str(self.session.headers.get("User-Agent", ""))
+        allowed = self.robots.allowed(  # type: ignore[union-attr]
+            url, user_agent, self.session, self.rate_limiter
+        )
+        if allowed:
+            return True
+        logger.warning(f"Skipping {url}: disallowed by robots.txt")
+        return False
+
+    def _claim(self, url: str) -> bool:
+        """Record ``url`` in the dedup index; ``False`` if it is a duplicate."""
+        index = self.dedup_index
+        assert index is not None
+        if index.claim(self.url_normalizer.normalize(url), url):
+            return True
+        logger.log(f"Skipping duplicate URL: {url}")
+        return False
+
+    def _fetch_shared(
+        self,
+        url: str,
+        output_path: Optional[str],
+        reserved: bool,
+        consume: Optional[Callable[[Response], Any]],
+    ) -> Any:
+        """:meth:`_fetch`, coalesced with concurrent fetches of the same page.
+
+        With ``coalesce`` enabled the HTML is fetched through the shared
+        :class:`SingleFlight`, keyed by canonical URL and
+        :meth:`_coalesce_profile`; every caller then extracts and saves it
+        to its own ``output_path``. ``consume`` fetches are not coalesced.
+        """
+        if self.single_flight is None or consume is not None:
+            return self._fetch(url, output_path, reserved, consume)
+        html = self.single_flight.do(
+            ("html", self._coalesce_profile(), self.url_normalizer.normalize(url)),
+            lambda: self._fetch(url, None, reserved, None),
+            self.coalesce_ttl,
+        )
+        if html is None or not output_path:
+            return html
+        try:
+            return self._finish(url, html, output_path)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error(f"Unexpected error scraping {url}: {exc}")
+            return None
+
+    def _coalesce_profile(self) -> str:
+        """Return a digest of the settings that shape fetched pages and records.
+
+        The :class:`SingleFlight` group is process-wide, so engines only
+        share work they would do identically: same request headers and
+        cookies, download limits, charset sampling and parser settings.
+        """
+        limits = self.download_limits
+        return content_hash(repr((
+            sorted(self.session.headers.items()),
+            sorted(self.session.cookies.items()),
+            (limits.max_body_bytes, sorted(limits.content_types)) if limits else None,
+            self.charset_detector.sample_size,
+            (self.extractor.parser, self.extractor.partial, self.extractor.streaming),
+        )))
+
+    def _shared_extract(
+        self, url: str, context: str, extract: Callable[[str], Any]
+    ) -> Callable[[str], Any]:
+        """Wrap ``extract`` so identical pages are extracted once (see ``coalesce``).
+
+        Results are keyed by canonical URL, :meth:`_coalesce_profile`,
+        extraction ``context`` and a hash of the page, so a changed page is
+        always extracted again.
+        """
+        if self.single_flight is None:
+            return extract
+        flight = self.single_flight
+        canonical = self.url_normalizer.normalize(url)
+        profile = self._coalesce_profile()
+
+        def shared(html: str) -> Any:
+            key = ("record", profile, canonical, content_hash(html, context))
+            return flight.do(key, lambda: extract(html), self.coalesce_ttl)
+
+        return shared
+
+    def _fetch(
+        self,
+        url: str,
+        output_path: Optional[str],
+        reserved: bool,
+        consume: Optional[Callable[[Response], Any]],
+    ) -> Any:
+        """Download ``url`` with caching, retries and rate limiting.
+
+        ``reserved`` indicates that the caller already took a rate limit
+        token for the first attempt. ``consume`` replaces reading the body:
+        it receives the successful response and its return value is
+        returned instead of the HTML. It is not used for cached pages.
+        """
+        cached = self.http_cache.lookup(url) if self.http_cache else None
+        if cached is not None and cached.fresh:
+            logger.log(f"Serving {url} from cache")
+            self.http_cache.record_hit(cached)
+            try:
+                return self._finish(url, cached.text, output_path)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error(f"Unexpected error scraping {url}: {exc}")
+                return None
+
+        request_headers = cached.validators() if cached is not None else {}
         for attempt in range(1, self.retries + 1):
+            if not self.circuit_breaker.allow(url):
+                logger.error(f"Circuit open for {host_of(url)}; skipping {url}")
+                return None
+            fetched = False
+            # One adaptive concurrency sample per attempt: the time until the
+            # headers arrived and the final status (``None`` if it failed).
+            started: Optional[float] = None
+            latency = 0.0
+            status: Optional[int] = None
             try:
                 logger.log(f"Scraping URL: {url} (attempt {attempt})")
-                time.sleep(self.delay)
-
-                response: Response = self.session.get(url, timeout=self.timeout)
-                response.raise_for_status()
+                if attempt > 1 or not reserved:
+                    self.rate_limiter.acquire(url)
 
-                # If output_path is provided, extract and save data
-                if output_path:
-                    data = self._extract_data(response.text)
-                    self.output_manager.save(data, output_path)
-
-                return response.text
+                # Streamed bodies are read within ``download_limits``.
+                stream = {"stream": True} if self.download_limits is not None else {}
+                started = time.monotonic()
+                response: Response = self.session.get(
+                    url, timeout=self.timeout, headers=request_headers or None, **stream
+                )
+                latency = time.monotonic() - started
+                status = response.status_code
+                try:
+                    response.raise_for_status()
+                    self.circuit_breaker.record_success(url)
+                    fetched = True
+                    return self._read_response(
+                        url, response, cached, output_path, consume
+                    )
+                finally:
+                    if stream:
+                        response.close()
 
+            except DownloadRejected:
+                # Permanent; :meth:`_scrape` reports it and nothing is retried.
+                raise
             except RequestException as exc:
                 logger.error(f"Request failed for {url} (attempt {attempt}): {exc}")
-                if attempt == self.retries:
+                failed = exc.response
+                # Also ``None`` when the body broke off after the headers.
+                status = failed.status_code if failed is not None else None
+                if self.retry_policy.is_retryable_status(status):
+                    self.circuit_breaker.record_failure(url)
+                else:
+                    self.circuit_breaker.record_success(url)
+                wait_for = self.retry_policy.next_delay(
+                    attempt,
+                    status,
+                    failed.headers.get("Retry-After") if failed is not None else None,
+                )
+                if wait_for is None or attempt == self.retries:
                     return None
             except Exception as exc:  # pylint: disable=broad-except
                 logger.error(f"Unexpected error scraping {url}: {exc}")
+                if not fetched:
+                    self.circuit_breaker.record_failure(url)
                 return None
+            finally:
+                if started is not None and self.adaptive_concurrency is not None:
+                    self.adaptive_concurrency.record(url, latency, status)
+            # Only a retryable request failure gets here.
+            if wait_for > 0:
+                time.sleep(wait_for)
 
         return None
 
+    def _read_response(
+        self,
+        url: str,
+        response: Response,
+        cached: Optional[CacheEntry],
+        output_path: Optional[str],
+        consume: Optional[Callable[[Response], Any]],
+    ) -> Any:
+        """Read the body of a successful ``response`` and update the cache."""
+        if self.http_cache is not None and response.status_code == 304 and cached is not None:
+            cached = self.http_cache.revalidate(cached, response.headers)
+            return self._finish(url, cached.text, output_path)
+        if consume is not None:
+            return consume(response)
+
+        body, encoding = self._read_body(url, response)
+        html = body.decode(encoding, errors="replace")
+        return self._finish(url, html, output_path)
+
+    def _read_body(self, url: str, response: Response) -> Tuple[bytes, str]:
+        """Return the raw body of ``response`` and its encoding, caching them."""
+        if self.download_limits is None:
+            body = response.content
+        else:
+            body = self.download_limits.read(response)
+        encoding = self.charset_detector.encoding_for(
+            url, body, response.headers.get("Content-Type")
+        )
+        if self.http_cache is not None:
+            self.http_cache.store(url, body, response.headers, encoding)
+        return body, encoding
+
+    def scrape_structured(
+        self, url: str, output_path: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Scrape ``url`` and return :meth:`ContentExtractor.extract_structured` data.
+
+        With ``stream_download`` configured (and no HTTP cache, which needs
+        the complete body) the response is decoded chunk by chunk and fed
+        straight into a :class:`StructuredParser`, so the page is never held
+        in memory as one string. Otherwise the page is downloaded with
+        :meth:`scrape` and extracted afterwards.
+
+        Args:
+            url: The target URL to scrape.
+            output_path: Optional file path where the record should be saved.
+
+        Returns:
+            The record, or ``None`` if the page could not be scraped.
+        """
+        if self.download_limits is not None and self.http_cache is None:
+            record = self._scrape(url, consume=self._parse_stream)
+            if record is not None:
+                save_record(
+                    self.fingerprints, self.output_manager, url, record, output_path,
+                    detector=self.near_duplicates,
+                )
+            return record
+
+        html = self.scrape(url)
+        if html is None:
+            return None
+        try:
+            return process_page(
+                self.fingerprints, self.output_manager, url, html, output_path,
+                self._shared_extract(url, "structured", self.extractor.extract_structured),
+                "structured", self.near_duplicates,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error(f"Failed to extract data from {url}: {exc}")
+            return None
+
+    def _parse_stream(self, response: Response) -> Dict[str, Any]:
+        """Feed a streamed response body into a :class:`StructuredParser`."""
+        parser = StructuredParser()
+        chunks = self.download_limits.iter_content(response)  # type: ignore[union-attr]
+        # Buffer just enough of the body to pick its encoding.
+        head = bytearray()
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= self.charset_detector.sample_size:
+                break
+        encoding = self.charset_detector.encoding_for(
+            response.url or "", bytes(head), response.headers.get("Content-Type")
+        )
+        for text in decode_chunks(itertools.chain([bytes(head)], chunks), encoding):
+            parser.feed(text)
+        parser.close()
+        return parser.result()
+
+    def scrape_site(
+        self, site: Mapping[str, Any], output_path: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Scrape a ``websites.json`` entry and return its extracted record.
+
+        The page is parsed once with the site's ``parser`` (if set). When the
+        entry declares a ``selectors`` mapping every field is collected in a
+        single traversal via :meth:`ContentExtractor.extract_fields` (from a
+        partial parse when the extractor has ``partial`` enabled); otherwise
+        :meth:`ContentExtractor.extract_structured` is used, streaming the
+        download into the parser when the extractor has ``streaming``
+        enabled (see :meth:`scrape_structured`).
+
+        Args:
+            site: Site entry with at least a ``url`` key.
+            output_path: Optional file path for the record. Defaults to the
+                site's ``output`` value when present.
+
+        Returns:
+            The extracted record, or ``None`` if the page could not be fetched.
+        """
+        selectors = site.get("selectors")
+        if not selectors and self.extractor.streaming:
+            return self.scrape_structured(site["url"], output_path or site.get("output"))
+
+        html = self.scrape(site["url"])
+        if html is None:
+            return None
+
+        def extract(html: str) -> Dict[str, Any]:
+            if selectors:
+                doc = self.extractor.parse_for(
+                    html, selectors.values(), parser=site.get("parser")
+                )
+                return self.extractor.extract_fields(doc, selectors)
+            doc = self.extractor.parse(html, parser=site.get("parser"))
+            return self.extractor.extract_structured(doc)
+
+        context = f"site:{site.get('parser')}:{sorted((selectors or {}).items())}"
+        try:
+            return process_page(
+                self.fingerprints, self.output_manager, site["url"], html,
+                output_path or site.get("output"),
+                self._shared_extract(site["url"], context, extract), context,
+                self.near_duplicates,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error(f"Failed to extract data from {site['url']}: {exc}")
+            return None
+
+    def scrape_many(
+        self,
+        urls: Iterable[str],
+        concurrency: Optional[int] = None,
+        output_paths: Optional[Mapping[str, str]] = None,
+        on_skip: Optional[Callable[[str, str], None]] = None,
+    ) -> Iterator[Tuple[str, Optional[str]]]:
+        """Scrape ``urls`` concurrently and yield results as they complete.
+
+        Each URL is handled by :meth:`scrape`, so retries, rate limits and
+        output saving behave exactly as for a single page. Requests share the
+        engine's ``requests.Session`` whose connection pool is sized to the
+        number of workers. ``urls`` is consumed lazily and only a bounded
+        number of pages are in flight at any time, so arbitrarily long
+        iterables can be streamed through the engine.
+
+        URLs whose host has no rate limit token available are parked until
+        their reservation comes due instead of occupying a worker, so a slow
+        host never stalls pages from other hosts. With a :attr:`dedup_index`
+        duplicates are yielded with ``None`` before taking a token.
+
+        Args:
+            urls: URLs to scrape.
+            concurrency: Maximum number of simultaneous requests. Defaults to
+                the ``concurrency`` configuration value.
+            output_paths: Optional mapping of URL to the file path where the
+                extracted content for that URL should be saved.
+            on_skip: Optional ``(url, reason)`` callback for pages that are
+                not fetched for a permanent reason: :data:`SKIP_DUPLICATE`,
+                :data:`SKIP_ROBOTS` or the :class:`DownloadRejected` reason.
+                It may be called from worker threads, always before the
+                page's ``None`` result is yielded.
+
+        Yields:
+            ``(url, html)`` pairs in completion order. ``html`` is ``None``
+            when the page could not be scraped.
+        """
+        workers = max(1, int(concurrency or self.concurrency))
+        self._ensure_pool_size(workers)
+        paths = output_paths or {}
+        yield from self._run_many(
+            urls,
+            workers,
+            lambda url: self._scrape(url, paths.get(url), True, None, True, on_skip),
+            on_skip,
+        )
+
+    def extract_many(
+        self,
+        urls: Iterable[str],
+        selectors: Optional[Mapping[str, str]] = None,
+        concurrency: Optional[int] = None,
+        processes: Optional[int] = None,
+        output_paths: Optional[Mapping[str, str]] = None,
+        parser: Optional[str] = None,
+        on_skip: Optional[Callable[[str, str], None]] = None,
+    ) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Fetch ``urls`` on I/O threads and extract them in worker processes.
+
+        Pages are downloaded exactly as by :meth:`scrape_many`, but instead
+        of being parsed on the fetching threads (where BeautifulSoup holds
+        the GIL) their raw bodies are shipped through shared memory to an
+        :class:`ExtractionPool`, so extraction scales with the number of
+        cores. Fetch threads wait while the pool is saturated.
+
+        Args:
+            urls: URLs to scrape.
+            selectors: Optional mapping of field name to CSS selector; the
+                record is then :meth:`ContentExtractor.extract_fields` output,
+                otherwise :meth:`ContentExtractor.extract_structured` output.
+            concurrency: Maximum number of simultaneous requests. Defaults to
+                the ``concurrency`` configuration value.
+            processes: Number of extraction processes. Defaults to the
+                ``extract_processes`` configuration value or the CPU count.
+            output_paths: Optional mapping of URL to the file path where its
+                record should be saved (see :func:`save_record`).
+            parser: Optional parser backend overriding the extractor default.
+            on_skip: Optional ``(url, reason)`` callback, as for
+                :meth:`scrape_many`.
+
+        Yields:
+            ``(url, record)`` pairs in completion order. ``record`` is
+            ``None`` when the page could not be fetched or extracted.
+        """
+        workers = max(1, int(concurrency or self.concurrency))
+        self._ensure_pool_size(workers)
+        paths = output_paths or {}
+        extracting: Dict[Future, str] = {}
+
+        with ExtractionPool(
+            processes or self.config.get("extract_processes"),
+            self.extractor.parser,
+            partial=self.extractor.partial,
+            streaming=self.extractor.streaming,
+        ) as pool:
+
+            def fetch(url: str) -> Optional[Future]:
+                result = self._scrape(
+                    url, None, True, functools.partial(self._read_body, url), True, on_skip
+                )
+                if result is None:
+                    return None
+                if isinstance(result, str):  # Served from the HTTP cache.
+                    result = (result.encode("utf-8"), "utf-8")
+                return pool.submit(result[0], result[1], selectors, parser)
+
+            def finished(futures: Iterable[Future]) -> Iterator[Tuple[str, Any]]:
+                for future in futures:
+                    url = extracting.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        logger.error(f"Failed to extract data from {url}: {exc}")
+                        yield url, None
+                        continue
+                    save_record(
+                        self.fingerprints, self.output_manager, url, record,
+                        paths.get(url), detector=self.near_duplicates,
+                    )
+                    yield url, record
+
+            try:
+                for url, future in self._run_many(urls, workers, fetch, on_skip):
+                    if future is None:
+                        yield url, None
+                    else:
+                        extracting[future] = url
+                    yield from finished([f for f in extracting if f.done()])
+                yield from finished(as_completed(list(extracting)))
+            finally:
+                for future in extracting:
+                    future.cancel()
+
+    def _run_many(
+        self,
+        urls: Iterable[str],
+        workers: int,
+        task: Callable[[str], Any],
+        on_skip: Optional[Callable[[str, str], None]] = None,
+    ) -> Iterator[Tuple[str, Any]]:
+        """Run ``task`` for every URL on ``workers`` threads (see :meth:`scrape_many`).
+
+        ``task`` must fetch without taking the first rate limit token or
+        claiming the URL in the dedup index; both happen here, and
+        duplicates are reported to ``on_skip``. With
+        :attr:`adaptive_concurrency` a URL also needs a free slot of its
+        host; until one is released it waits in a per-host queue, holding
+        no worker and no rate limit token.
+        """
+        url_iter = iter(urls)
+        lookahead = workers * 4
+        # Heap of (ready_at, sequence, url) for URLs waiting on their host.
+        delayed: List[Tuple[float, int, str]] = []
+        # Duplicates found by the dedup index, yielded without fetching.
+        skipped: Deque[str] = deque()
+        # URLs waiting for a concurrency slot of their host, by host.
+        blocked: Dict[str, Deque[str]] = {}
+        controller = self.adaptive_concurrency
+        sequence = itertools.count()
+        exhausted = False
+
+        def run(url: str) -> Any:
+            try:
+                return task(url)
+            finally:
+                controller.release(url)  # type: ignore[union-attr]
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="scraper"
+        ) as executor:
+            pending: Dict[Future, str] = {}
+
+            def submit(url: str) -> None:
+                pending[executor.submit(task if controller is None else run, url)] = url
+
+            def schedule(url: str, now: float) -> None:
+                wait_for = self.rate_limiter.reserve(url)
+                if wait_for > 0:
+                    heapq.heappush(delayed, (now + wait_for, next(sequence), url))
+                else:
+                    submit(url)
+
+            def unblock(now: float) -> None:
+                for host in list(blocked):
+                    queue = blocked[host]
+                    while queue and controller.acquire(queue[0]):  # type: ignore[union-attr]
+                        schedule(queue.popleft(), now)
+                    if not queue:
+                        del blocked[host]
+
+            def waiting() -> int:
+                return sum(len(queue) for queue in blocked.values())
+
+            def dispatch() -> None:
+                nonlocal exhausted
+                now = time.monotonic()
+                while delayed and delayed[0][0] <= now and len(pending) < workers * 2:
+                    submit(heapq.heappop(delayed)[2])
+                if blocked:
+                    unblock(now)
+                while (
+                    not exhausted
+                    and len(pending) < workers * 2
+                    and len(pending) + len(delayed) + len(skipped) + waiting() < lookahead
+                ):
+                    try:
+                        url = next(url_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    if self.dedup_index is not None and not self._claim(url):
+                        skipped.append(url)
+                        continue
+                    if controller is not None and not controller.acquire(url):
+                        blocked.setdefault(host_of(url), deque()).append(url)
+                        continue
+                    schedule(url, now)
+
+            try:
+                dispatch()
+                while pending or delayed or skipped or blocked:
+                    while skipped:
+                        url = skipped.popleft()
+                        if on_skip is not None:
+                            on_skip(url, SKIP_DUPLICATE)
+                        yield url, None
+                    if not pending and not delayed:
+                        releases = controller.releases() if controller is not None else 0
+                        dispatch()
+                        if blocked and not (pending or delayed or skipped):
+                            # Every slot of the blocked hosts is held by
+                            # another call on this engine; sleep until one
+                            # is released instead of spinning.
+                            controller.wait_release(releases)  # type: ignore[union-attr]
+                        continue
+                    timeout = (
+                        max(0.0, delayed[0][0] - time.monotonic()) if delayed else None
+                    )
+                    if pending:
+                        done, _ = wait(
+                            pending, timeout=timeout, return_when=FIRST_COMPLETED
+                        )
+                    else:
+                        time.sleep(timeout or 0)
+                        done = set()
+                    dispatch()
+                    for future in done:
+                        yield pending.pop(future), future.result()
+            finally:
+                unfetched = [url for _, _, url in delayed]
+                for future, url in pending.items():
+                    if future.cancel():
+                        unfetched.append(url)
+                if controller is not None:
+                    for url in unfetched:
+                        controller.release(url)
+                unfetched.extend(url for queue in blocked.values() for url in queue)
+                if self.dedup_index is not None:
+                    for url in unfetched:
+                        self.dedup_index.release(self.url_normalizer.normalize(url))
+
+    def _finish(self, url: str, html: str, output_path: Optional[str]) -> str:
+        """Extract and save data from ``html`` if requested, then return it."""
+        if output_path:
+            process_page(
+                self.fingerprints, self.output_manager, url, html, output_path,
+                self._shared_extract(url, "text", self._extract_data), "text",
+                self.near_duplicates,
+            )
+        return html
+
     def _extract_data(self, html: str) -> Any:
-        """Parse ``html`` content and delegate extraction."""
-        soup = BeautifulSoup(html, "html.parser")
-        return self.extractor.extract(str(soup))
+        """Delegate extraction of ``html``; the extractor parses it exactly once."""
+        return self.extractor.extract(html)
@@ -0,0 +1,135 @@
+"""Coalescing of concurrent identical work with a short-lived result cache."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """A running call that other callers of the same key wait for."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its result.
+
+    Callers of :meth:`do` that arrive while a call for the same key is
+    running wait for it and receive the same result (or exception) instead
+    of repeating the work. Results other than ``None`` may additionally be
+    kept for ``ttl`` seconds so back-to-back callers reuse them; at most
+    ``max_entries`` results are kept, least recently used first out.
+    Shared results must be treated as read-only.
+
+    :meth:`shared` returns one process-wide instance so engines created by
+    different jobs coalesce with each other.
+    """
+
+    _shared: Optional["SingleFlight"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty group.
+
+        Args:
+            max_entries: Number of results kept for reuse.
+            clock: Monotonic time source, mainly useful for tests.
+        """
+        self.max_entries = max(0, int(max_entries))
+        self._clock = clock
+        self._calls: Dict[Hashable, _Call] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"executed": 0, "coalesced": 0, "cache_hits": 0}
+
+    @classmethod
+    def shared(cls) -> "SingleFlight":
+        """Return the process-wide group, creating it on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def do(self, key: Hashable, fn: Callable[[], Any], ttl: float = 0.0) -> Any:
+        """Return ``fn()``, sharing one call among concurrent callers of ``key``.
+
+        Args:
+            key: Identifies equivalent work, e.g. a canonical URL.
+            fn: Performs the work.
+            ttl: Seconds a result other than ``None`` is reused by later
+                callers. ``0`` only coalesces concurrent callers.
+        """
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                if cached[0] > self._clock():
+                    self._results.move_to_end(key)
+                    self._stats["cache_hits"] += 1
+                    return cached[1]
+                del self._results[key]
+            running = self._calls.get(key)
+            leader = running is None
+            if running is None:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+            else:
+                call = running
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None and call.result is not None and ttl > 0:
+                    self._store(key, call.result, ttl)
+            call.done.set()
+        return call.result
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        if not self.max_entries:
+            return
+        self._results[key] = (self._clock() + ttl, value)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def forget(self, key: Hashable) -> None:
+        """Drop the cached result of ``key``."""
+        with self._lock:
+            self._results.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._results.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+    def stats(self) -> Dict[str, int]:
+        """Return ``executed`` calls and the ``coalesced`` and ``cache_hits`` they saved."""
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,224 @@
+"""Tree-free streaming implementation of ``extract_structured``."""
+
+from __future__ import annotations
+
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from bs4 import UnicodeDammit
+
+# Void elements closed as soon as they start, as in bs4's html.parser builder.
+VOID_ELEMENTS = frozenset(
+    {
+        "area", "base", "basefont", "bgsound", "br", "col", "command", "embed",
+        "frame", "hr", "image", "img", "input", "isindex", "keygen", "link",
+        "menuitem", "meta", "nextid", "param", "source", "spacer", "track", "wbr",
+    }
+)
+# Elements whose strings ``get_text`` leaves out (scripts, styles, templates
+# and ruby annotations).
+NON_TEXT_ELEMENTS = frozenset({"script", "style", "template", "rt", "rp"})
+
+# Size of the pieces raw markup is fed to the tokenizer in.
+CHUNK_SIZE = 64 * 1024
+
+# Children of the first ``<title>``: strings, or nested lists for elements.
+_TitleNode = List[Any]
+
+
+class StructuredParser(HTMLParser):
+    """Collect the title, links, images and visible text of a page.
+
+    Markup is tokenized incrementally with :meth:`feed` and never turned
+    into a tree: apart from the results only the stack of open element
+    names is kept. :meth:`result` returns the same dictionary as
+    :meth:`ContentExtractor.extract_structured` with the ``html.parser``
+    backend, including its rules for which strings count as text and where
+    the ``<body>`` ends.
+    """
+
+    def __init__(self, include_text: bool = True) -> None:
+        """Create a parser.
+
+        Args:
+            include_text: Collect the visible text. When ``False`` ``text``
+                is an empty string.
+        """
+        super().__init__(convert_charrefs=True)
+        self.include_text = include_text
+        self.links: List[str] = []
+        self.images: List[str] = []
+        self._stack: List[str] = []
+        self._data: List[str] = []
+        self._non_text = 0
+        # Void elements already closed whose end tag is still to be skipped.
+        self._closed_voids: Counter = Counter()
+        self._body_depth: Optional[int] = None
+        self._body_seen = False
+        self._text: List[str] = []
+        self._title: Optional[_TitleNode] = None
+        # Open elements from the first <title> down while it is being parsed.
+        self._title_path: List[_TitleNode] = []
+
+    # -- tokenizer callbacks -------------------------------------------------
+
+    def handle_starttag(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]], void: bool = True
+    ) -> None:
+        self._flush()
+        values = dict(attrs)
+        if tag == "a" and values.get("href"):
+            self.links.append(values["href"])  # type: ignore[arg-type]
+        elif tag == "img" and values.get("src"):
+            self.images.append(values["src"])  # type: ignore[arg-type]
+
+        if self._title_path:
+            child: _TitleNode = []
+            self._title_path[-1].append(child)
+            self._title_path.append(child)
+        elif tag == "title" and self._title is None:
+            self._title = []
+            self._title_path.append(self._title)
+        if tag == "body" and not self._body_seen:
+            self._body_seen = True
+            self._body_depth = len(self._stack)
+            self._text.clear()
+        if tag in NON_TEXT_ELEMENTS:
+            self._non_text += 1
+        self._stack.append(tag)
+
+        if void and tag in VOID_ELEMENTS:
+            self._pop_to(tag)
+            self._closed_voids[tag] += 1
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self.handle_starttag(tag, attrs, void=False)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._closed_voids[tag]:
+            self._closed_voids[tag] -= 1
+            return
+        self._flush()
+        if tag in self._stack:
+            self._pop_to(tag)
+
+    def handle_data(self, data: str) -> None:
+        self._data.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._other(data)
+
+    def handle_decl(self, decl: str) -> None:
+        self._other(decl)
+
+    def handle_pi(self, data: str) -> None:
+        self._other(data)
+
+    def unknown_decl(self, data: str) -> None:
+        if data.upper().startswith("CDATA["):
+            # CDATA sections count as text wherever they appear.
+            self._flush()
+            self._add_string(data[len("CDATA["):], is_text=True)
+        else:
+            self._other(data)
+
+    # -- state handling ------------------------------------------------------
+
+    def _other(self, data: str) -> None:
+        """Handle a comment, declaration or processing instruction."""
+        self._flush()
+        self._add_string(data, is_text=False)
+
+    def _flush(self) -> None:
+        """Turn the pending character data into one string."""
+        if self._data:
+            data = "".join(self._data)
+            self._data.clear()
+            self._add_string(data, is_text=not self._non_text)
+
+    def _add_string(self, data: str, is_text: bool) -> None:
+        if self._title_path:
+            self._title_path[-1].append(data)
+        if not (is_text and self.include_text):
+            return
+        in_body = self._body_depth is not None
+        # Without a <body> the text of the whole document is used.
+        if in_body or not self._body_seen:
+            stripped = data.strip()
+            if stripped:
+                self._text.append(stripped)
+
+    def _pop_to(self, tag: str) -> None:
+        """Close open elements up to and including the last ``tag``."""
+        while self._stack:
+            name = self._stack.pop()
+            depth = len(self._stack)
+            if name in NON_TEXT_ELEMENTS:
+                self._non_text -= 1
+            if self._title_path:
+                self._title_path.pop()
+            if depth == self._body_depth:
+                self._body_depth = None
+            if name == tag:
+                return
+
+    # -- results -------------------------------------------------------------
+
+    def close(self) -> None:
+        """Process any buffered markup and finish the document."""
+        super().close()
+        self._flush()
+
+    @property
+    def title(self) -> Optional[str]:
+        """Stripped text of the first ``<title>`` as ``Tag.string`` gives it."""
+        node = self._title
+        while node is not None:
+            if len(node) != 1:
+                return None
+            child = node[0]
+            if isinstance(child, str):
+                return child.strip() if child else None
+            node = child
+        return None
+
+    def result(self) -> Dict[str, Any]:
+        """Return ``title``, ``links``, ``images`` and ``text`` so far."""
+        return {
+            "title": self.title,
+            "links": list(self.links),
+            "images": list(self.images),
+            "text": " ".join(self._text) if self.include_text else "",
+        }
+
+
+def extract_structured_stream(
+    markup: Union[str, bytes, Iterable[str]],
+    encoding: Optional[str] = None,
+    include_text: bool = True,
+) -> Dict[str, Any]:
+    """Run :class:`StructuredParser` over ``markup`` and return its result.
+
+    Args:
+        markup: HTML text, raw bytes (decoded like ``BeautifulSoup`` does)
+            or an iterable of text chunks, e.g. from a streaming download.
+        encoding: Optional encoding of ``bytes`` markup.
+        include_text: Collect the visible text.
+    """
+    if isinstance(markup, bytes):
+        dammit = UnicodeDammit(markup, [encoding] if encoding else [], is_html=True)
+        markup = dammit.unicode_markup or ""
+    if isinstance(markup, str):
+        text = markup
+        chunks: Iterable[str] = (
+            text[i:i + CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE)
+        )
+    else:
+        chunks = markup
+    parser = StructuredParser(include_text)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return parser.result()
@@ -0,0 +1,190 @@
+"""URL canonicalization with per-site rules."""
+
+from __future__ import annotations
+
+import re
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+
+from .rate_limiter import host_of
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# Query parameters that only track where a visitor came from.
+TRACKING_PARAMS = (
+    "utm_*",
+    "gclid",
+    "dclid",
+    "fbclid",
+    "msclkid",
+    "yclid",
+    "mc_cid",
+    "mc_eid",
+    "igshid",
+    "_ga",
+    "_hsenc",
+    "_hsmi",
+)
+_UNRESERVED = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~"
+)
+_PERCENT = re.compile(r"%[0-9A-Fa-f]{2}")
+
+
+class UrlRules(NamedTuple):
+    """How URLs of one site are canonicalized."""
+
+    strip_params: Tuple[str, ...] = TRACKING_PARAMS
+    keep_params: Tuple[str, ...] = ()
+    sort_query: bool = True
+    drop_fragment: bool = True
+    trailing_slash: str = "keep"
+    lowercase_path: bool = False
+
+    def updated(self, settings: Mapping[str, Any]) -> "UrlRules":
+        """Return a copy with the known keys of ``settings`` applied.
+
+        ``strip_params`` patterns are added to the inherited ones; list
+        ``keep_params`` to exempt any of them.
+        """
+        values: Dict[str, Any] = {}
+        for key in self._fields:
+            if key in settings:
+                value = settings[key]
+                if key in ("strip_params", "keep_params"):
+                    value = tuple(value or ())
+                    if key == "strip_params":
+                        value = self.strip_params + value
+                values[key] = value
+        return self._replace(**values)
+
+    def strips(self, name: str) -> bool:
+        """``True`` if query parameter ``name`` should be removed."""
+        name = unquote_plus(name).lower()
+        if any(fnmatchcase(name, p.lower()) for p in self.keep_params):
+            return False
+        return any(fnmatchcase(name, p.lower()) for p in self.strip_params)
+
+
+def _normalize_escapes(text: str) -> str:
+    """Upper-case percent escapes and decode escaped unreserved characters."""
+
+    def fix(match: "re.Match[str]") -> str:
+        char = chr(int(match.group(0)[1:], 16))
+        return char if char in _UNRESERVED else match.group(0).upper()
+
+    return _PERCENT.sub(fix, text)
+
+
+def remove_dot_segments(path: str) -> str:
+    """Resolve ``.`` and ``..`` segments as described in RFC 3986."""
+    if "." not in path:
+        return path
+    output: List[str] = []
+    segments = path.split("/")
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == ".":
+            if last:
+                output.append("")
+        elif segment == "..":
+            if len(output) > 1:
+                output.pop()
+            if last:
+                output.append("")
+        else:
+            output.append(segment)
+    return "/".join(output)
+
+
+class UrlNormalizer:
+    """Map equivalent URLs to one canonical form.
+
+    Always applied: lower-case scheme and host, no default port, resolved
+    dot segments, normalized percent escapes and ``/`` for an empty path.
+    Configurable per site (see :class:`UrlRules`): which query parameters
+    are stripped, query sorting, fragment removal, trailing slash handling
+    (``"keep"``, ``"strip"`` or ``"add"``) and path case.
+    """
+
+    def __init__(
+        self,
+        defaults: Optional[UrlRules] = None,
+        sites: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ) -> None:
+        """Create a normalizer.
+
+        Args:
+            defaults: Rules for hosts without their own rules.
+            sites: Mapping of host to rule overrides.
+        """
+        self.defaults = defaults or UrlRules()
+        self._sites: Dict[str, UrlRules] = {}
+        for host, settings in (sites or {}).items():
+            self.configure_host(host, settings)
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "UrlNormalizer":
+        """Build a normalizer from an engine configuration dictionary.
+
+        ``config["url_rules"]`` overrides the defaults and the ``url_rules``
+        mapping of every ``config["websites"]`` entry applies to its host.
+        """
+        normalizer = cls(UrlRules().updated(config.get("url_rules") or {}))
+        normalizer.configure_sites(config.get("websites") or [])
+        return normalizer
+
+    def configure_sites(self, sites: Iterable[Mapping[str, Any]]) -> None:
+        """Apply ``url_rules`` from ``websites.json`` style entries."""
+        for site in sites:
+            if isinstance(site, Mapping) and site.get("url") and site.get("url_rules"):
+                self.configure_host(host_of(site["url"]), site["url_rules"])
+
+    def configure_host(self, host: str, settings: Mapping[str, Any]) -> None:
+        """Override the rules of a single ``host``."""
+        self._sites[host_of(host)] = self.defaults.updated(settings)
+
+    def rules_for(self, url: str) -> UrlRules:
+        """Return the rules that apply to ``url``."""
+        return self._sites.get(host_of(url), self.defaults)
+
+    def normalize(self, url: str) -> str:
+        """Return the canonical form of ``url``.
+
+        URLs that cannot be parsed are returned unchanged.
+        """
+        try:
+            parts = urlsplit(url.strip())
+            port = parts.port
+        except ValueError:
+            return url
+        scheme = parts.scheme.lower()
+        host = parts.hostname or ""
+        if ":" in host:
+            host = f"[{host}]"
+        netloc = host
+        if parts.username is not None:
+            userinfo = parts.netloc.rpartition("@")[0]
+            netloc = f"{userinfo}@{host}"
+        if port is not None and port != DEFAULT_PORTS.get(scheme):
+            netloc += f":{port}"
+
+        rules = self._sites.get(host_of(host.strip("[]")), self.defaults)
+        path = remove_dot_segments(_normalize_escapes(parts.path)) or "/"
+        if rules.lowercase_path:
+            path = path.lower()
+        if rules.trailing_slash == "strip" and path != "/":
+            path = path.rstrip("/") or "/"
+        elif rules.trailing_slash == "add" and not path.endswith("/"):
+            if "." not in path.rsplit("/", 1)[-1]:
+                path += "/"
+
+        pairs = [
+            _normalize_escapes(pair)
+            for pair in parts.query.split("&")
+            if pair and not rules.strips(pair.partition("=")[0])
+        ]
+        if rules.sort_query:
+            pairs.sort()
+        fragment = "" if rules.drop_fragment else parts.fragment
+        return urlunsplit((scheme, netloc, path, "&".join(pairs), fragment))
@@ -0,0 +1,207 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from cinder_web_scraper.scraping.adaptive_concurrency import AdaptiveConcurrency
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+URL = "http://example.com/"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_slow_start_then_additive_increase():
+    controller = AdaptiveConcurrency(initial=2, maximum=100, clock=Clock())
+    for _ in range(6):
+        controller.record(URL, 0.1, 200)
+    assert controller.limit(URL) == 8
+    controller.record(URL, 0.1, 429)
+    assert controller.limit(URL) == 4
+    # After a decrease the limit grows by about one slot per window.
+    for _ in range(4):
+        controller.record(URL, 0.1, 200)
+    assert controller.limit(URL) == 4
+    for _ in range(2):
+        controller.record(URL, 0.1, 200)
+    assert controller.limit(URL) == 5
+
+
+def test_one_decrease_per_round_trip():
+    clock = Clock()
+    controller = AdaptiveConcurrency(initial=16, maximum=16, clock=clock)
+    controller.record(URL, 1.0, 200)
+    for status in (503, 500, None):
+        controller.record(URL, 1.0, status)
+    assert controller.limit(URL) == 8
+    clock.now = 1.0
+    controller.record(URL, 1.0, None)
+    assert controller.limit(URL) == 4
+    assert controller.limits()["example.com"]["decreases"] == 2
+
+
+def test_latency_spike_cuts_limit():
+    clock = Clock()
+    controller = AdaptiveConcurrency(initial=8, maximum=8, smoothing=0.5, clock=clock)
+    for _ in range(3):
+        controller.record(URL, 0.1, 200)
+    assert controller.limit(URL) == 8
+    controller.record(URL, 0.5, 200)
+    assert controller.limit(URL) == 4
+    limits = controller.limits()["example.com"]
+    assert limits["latency"] == pytest.approx(0.3)
+    assert limits["baseline_latency"] == pytest.approx(0.11)
+
+
+def test_slots_and_bounds():
+    controller = AdaptiveConcurrency(initial=2, minimum=1, maximum=3)
+    assert controller.acquire(URL) and controller.acquire(URL)
+    assert not controller.acquire(URL)
+    # Other hosts have their own slots.
+    assert controller.acquire("http://other.com/")
+    controller.release(URL)
+    assert controller.acquire(URL)
+    for _ in range(10):
+        controller.record(URL, 0.1, 200)
+    assert controller.limit(URL) == 3
+    for _ in range(10):
+        controller.record(URL, 0.1, 503)
+    assert controller.limit(URL) == 1
+    assert controller.limits()["example.com"]["in_flight"] == 2
+
+
+def test_wait_release_returns_after_a_release():
+    controller = AdaptiveConcurrency(initial=1, maximum=1)
+    assert controller.acquire(URL)
+    seen = controller.releases()
+    assert not controller.wait_release(seen, timeout=0.01)
+    threading.Timer(0.05, controller.release, [URL]).start()
+    assert controller.wait_release(seen, timeout=5)
+    # A release that happened before the wait is not missed.
+    assert controller.wait_release(seen, timeout=0)
+
+
+def test_from_config():
+    assert AdaptiveConcurrency.from_config({}, 8) is None
+    assert AdaptiveConcurrency.from_config({"adaptive_concurrency": True}, 8).maximum == 8
+    controller = AdaptiveConcurrency.from_config(
+        {"adaptive_concurrency": {"initial": 4, "maximum": 6}}, 8
+    )
+    assert (controller.initial, controller.maximum) == (4, 6)
+
+
+def test_broken_body_is_one_failed_sample():
+    class BrokenBody:
+        status_code = 200
+        headers = {}
+
+        def raise_for_status(self):
+            pass
+
+        @property
+        def content(self):
+            raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+    engine = ScraperEngine(config={"delay": 0, "retries": 2, "adaptive_concurrency": True})
+    engine.retry_policy.next_delay = lambda *args: 0
+    engine.session.get = lambda url, **kwargs: BrokenBody()
+    samples = []
+    engine.adaptive_concurrency.record = lambda url, latency, status=None: samples.append(status)
+    assert engine.scrape(URL) is None
+    assert samples == [None, None]
+
+
+@pytest.fixture
+def server():
+    active = {}
+    peak = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            host = self.headers["Host"].split(":")[0]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+            if host == "localhost":
+                self.send_error(503)
+                return
+            body = b"<title>ok</title>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd.server_address[1], peak
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_scrape_many_adapts_per_host(server):
+    port, peak = server
+    engine = ScraperEngine(config={
+        "delay": 0,
+        "retries": 1,
+        "concurrency": 8,
+        "adaptive_concurrency": {"initial": 2, "latency_factor": 100},
+    })
+    urls = []
+    for i in range(40):
+        urls.append(f"http://127.0.0.1:{port}/{i}")
+        if i < 10:
+            urls.append(f"http://localhost:{port}/{i}")
+    results = dict(engine.scrape_many(urls))
+    assert sum(html is not None for html in results.values()) == 40
+
+    limits = engine.concurrency_limits()
+    assert limits["127.0.0.1"]["limit"] == 8
+    assert limits["localhost"]["limit"] == 1
+    assert all(state["in_flight"] == 0 for state in limits.values())
+    assert peak["localhost"] <= 2
+    assert peak["127.0.0.1"] <= 8
+
+
+def test_scrape_many_waits_for_slots_held_elsewhere(server):
+    port, _ = server
+    url = f"http://127.0.0.1:{port}/"
+    engine = ScraperEngine(config={
+        "delay": 0, "adaptive_concurrency": {"initial": 1, "maximum": 1},
+    })
+    controller = engine.adaptive_concurrency
+    # Another batch on this engine holds the host's only slot.
+    assert controller.acquire(url)
+    attempts = []
+    acquire = controller.acquire
+    controller.acquire = lambda u: attempts.append(u) or acquire(u)
+
+    results = []
+    worker = threading.Thread(target=lambda: results.extend(engine.scrape_many([url])))
+    worker.start()
+    try:
+        time.sleep(0.3)
+        assert not results and len(attempts) <= 3
+    finally:
+        controller.release(url)
+        worker.join(5)
+    assert results[0][1] is not None
@@ -0,0 +1,154 @@
+import asyncio
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cinder_web_scraper.scraping.async_scraper_engine import AsyncScraperEngine
+from cinder_web_scraper.scraping.output_manager import OutputManager
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/page/target")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/missing":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/chunked":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for part in (b"<p>Hello ", b"chunked</p>"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path == "/gzip":
+            body = gzip.compress("<p>café</p>".encode("latin-1"))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=latin-1")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            body = f"<html><body><p class='x'>{self.path}</p></body></html>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_engine(**config):
+    return AsyncScraperEngine(config={"delay": 0, "retries": 1, **config})
+
+
+def test_scrape_returns_body(base_url):
+    html = asyncio.run(make_engine().scrape(f"{base_url}/page/1"))
+    assert "<p class='x'>/page/1</p>" in html
+
+
+def test_scrape_handles_chunked_gzip_and_redirects(base_url):
+    engine = make_engine()
+
+    async def run():
+        return (
+            await engine.scrape(f"{base_url}/chunked"),
+            await engine.scrape(f"{base_url}/gzip"),
+            await engine.scrape(f"{base_url}/redirect"),
+        )
+
+    chunked, gzipped, redirected = asyncio.run(run())
+    assert chunked == "<p>Hello chunked</p>"
+    assert gzipped == "<p>café</p>"
+    assert "/page/target" in redirected
+
+
+def test_scrape_returns_none_on_error(base_url):
+    engine = make_engine(retries=2)
+    assert asyncio.run(engine.scrape(f"{base_url}/missing")) is None
+    assert asyncio.run(engine.scrape("ftp://example.com")) is None
+
+
+def test_scrape_many_yields_all_results(base_url):
+    engine = make_engine(concurrency=5)
+    urls = [f"{base_url}/page/{i}" for i in range(30)]
+
+    async def collect():
+        return {url: html async for url, html in engine.scrape_many(urls)}
+
+    results = asyncio.run(collect())
+    assert set(results) == set(urls)
+    assert all(url.rsplit("/", 1)[-1] in results[url] for url in urls)
+
+
+def test_scrape_many_saves_output(base_url, tmp_path):
+    engine = make_engine()
+    engine.output_manager = OutputManager()
+    url = f"{base_url}/page/saved"
+    path = tmp_path / "saved.json"
+
+    async def collect():
+        return [item async for item in engine.scrape_many([url], {url: str(path)})]
+
+    assert asyncio.run(collect())[0][0] == url
+    assert path.read_text(encoding="utf-8").strip() != ""
+
+
+def test_scrape_enforces_download_limits(base_url):
+    tight = make_engine(stream_download={"max_body_bytes": 10})
+    json_only = make_engine(stream_download={"content_types": ["application/json"]})
+    roomy = make_engine(stream_download={"max_body_bytes": 1024})
+
+    async def run():
+        return (
+            await tight.scrape(f"{base_url}/chunked"),
+            await tight.scrape(f"{base_url}/gzip"),
+            await tight.scrape(f"{base_url}/page/1"),
+            await json_only.scrape(f"{base_url}/page/1"),
+            await roomy.scrape(f"{base_url}/chunked"),
+        )
+
+    chunked, gzipped, sized, wrong_type, allowed = asyncio.run(run())
+    assert chunked is None and gzipped is None and sized is None
+    assert wrong_type is None
+    assert allowed == "<p>Hello chunked</p>"
+
+
+def test_rejected_half_open_trial_closes_circuit(base_url):
+    engine = make_engine(
+        stream_download={"max_body_bytes": 10},
+        circuit_breaker={"min_requests": 1, "reset_timeout": 0},
+    )
+    url = f"{base_url}/page/1"
+    engine.circuit_breaker.record_failure(url)
+    assert engine.circuit_breaker.state(url) == "open"
+
+    assert asyncio.run(engine.scrape(url)) is None
+    # The rejected trial must not leave the host blocked.
+    assert engine.circuit_breaker.state(url) == "closed"
+    assert engine.circuit_breaker.allow(url)
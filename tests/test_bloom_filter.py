@@ -0,0 +1,14 @@
+from cinder_web_scraper.crawling.bloom_filter import BloomFilter
+
+
+def test_bloom_filter_membership_and_error_rate():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    assert bloom.add("http://example.com/")
+    assert not bloom.add("http://example.com/")
+    for i in range(10_000):
+        bloom.add(f"http://example.com/{i}")
+    assert all(f"http://example.com/{i}" in bloom for i in range(10_000))
+    false_positives = sum(f"http://other.com/{i}" in bloom for i in range(10_000))
+    assert false_positives < 200
+    assert len(bloom) <= 10_001
+    assert bloom.size_bytes < 20_000
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import cinder_web_scraper.scraping.charset as charset
+from cinder_web_scraper.scraping.charset import (
+    CharsetDetector,
+    bom_encoding,
+    charset_from_content_type,
+    sniff_meta_charset,
+)
+
+FRENCH = "Une phrase française très intéressante, déjà écrite à l'avance. " * 20
+
+
+def test_cheap_sources():
+    assert charset_from_content_type('text/html; charset="UTF-8"') == "utf-8"
+    assert charset_from_content_type("text/html") is None
+    assert charset_from_content_type("text/html; charset=bogus") is None
+    assert bom_encoding(b"\xef\xbb\xbf<p>") == "utf-8-sig"
+    assert bom_encoding(b"\xff\xfe\x00\x00<") == "utf-32"
+    assert sniff_meta_charset(b"<head><meta charset='Shift_JIS'>") == "shift_jis"
+    assert sniff_meta_charset(
+        b'<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-2">'
+    ) == "iso8859-2"
+    assert sniff_meta_charset(b"<meta charset=utf-16>") == "utf-8"
+    assert sniff_meta_charset(b" " * 5000 + b"<meta charset=koi8-r>") is None
+
+
+def test_detector_order_and_counters():
+    detector = CharsetDetector()
+    body = FRENCH.encode("utf-8")
+    bom = b"\xef\xbb\xbfx"
+    assert detector.encoding_for("http://a/", bom, "text/html; charset=latin-1") == "utf-8-sig"
+    assert detector.encoding_for("http://a/", body, "text/html; charset=latin-1") == "iso8859-1"
+    assert detector.encoding_for("http://a/", b"<meta charset=koi8-r>") == "koi8-r"
+    # The host now has a known encoding; no detection needed.
+    assert detector.encoding_for("http://a/other", b"plain") == "koi8-r"
+    assert detector.encoding_for("http://b/", body) == "utf-8"
+    stats = detector.stats()
+    assert stats["bom"] == stats["header"] == stats["meta"] == 1
+    assert stats["host_cache"] == 1 and stats["utf8"] == 1
+    assert stats["detected"] == stats["fallback"] == 0
+    assert stats["slow_path_rate"] == 0.0
+
+
+def test_slow_path_runs_once_per_host_on_a_bounded_sample():
+    detector = CharsetDetector(sample_size=256)
+    body = FRENCH.encode("cp1252")
+    with patch.object(charset, "from_bytes", wraps=charset.from_bytes) as detect:
+        text = detector.decode("http://legacy.example/1", body)
+        detector.decode("http://legacy.example/2", body)
+    assert detect.call_count == 1
+    assert len(detect.call_args.args[0]) == 256
+    assert "intéressante" in text
+    assert detector.stats()["detected"] == 1
+    assert detector.host_encoding("http://legacy.example/") is not None
@@ -0,0 +1,172 @@
+import json
+from unittest.mock import patch
+
+import requests
+
+from cinder_web_scraper.crawling.checkpoint import Checkpoint
+from cinder_web_scraper.crawling.crawler import Crawler
+from cinder_web_scraper.main import output_path, parse_arguments, run_crawl
+from cinder_web_scraper.scraping.rate_limiter import HostRateLimiter
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+PAGES = {
+    "http://example.com/": "<a href='/a'>A</a><a href='/b'>B</a>",
+    "http://example.com/a": "<a href='/c'>C</a>",
+    "http://example.com/b": "<a href='/d'>D</a>",
+    "http://example.com/c": "<p>c</p>",
+    "http://example.com/d": "<p>d</p>",
+}
+
+
+def fake_get(url, **kwargs):
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200 if url in PAGES else 404
+    response._content = PAGES.get(url, "").encode()
+    return response
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_replay_tolerates_truncated_line(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    limiter = HostRateLimiter(rate=2, burst=4)
+    with Checkpoint(path) as checkpoint:
+        checkpoint.pending("http://a/")
+        checkpoint.pending("http://a/1", 1)
+        checkpoint.pending("http://b/", 0, 1)
+        checkpoint.finished("http://a/")
+        checkpoint.finished("http://a/1", ok=False)
+        limiter.reserve("http://a/")
+        checkpoint.flush(limiter)
+    with open(path, "a", encoding="utf-8") as fp:
+        fp.write('{"c":"http://b/"')
+
+    state = Checkpoint.load(path)
+    assert state.finished == {"http://a/", "http://a/1"}
+    assert state.failed == {"http://a/1"}
+    assert list(state.remaining()) == [("http://b/", 0, 1)]
+    assert state.site_pages() == {0: 2}
+    assert state.limits["a"]["rate"] == 2
+    assert Checkpoint.load(str(tmp_path / "missing.jsonl")).pending == {}
+
+
+def test_lines_are_short_and_flushed_by_interval(tmp_path):
+    path = tmp_path / "run.jsonl"
+    clock = Clock()
+    checkpoint = Checkpoint(str(path), interval=5, clock=clock)
+    checkpoint.pending("http://a/")
+    assert not checkpoint.maybe_flush()
+    assert path.read_text() == ""
+    clock.now = 5
+    assert checkpoint.maybe_flush()
+    assert path.read_text() == '{"p":"http://a/"}\n'
+    checkpoint.close()
+
+
+def test_resume_compacts_and_appends(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    with Checkpoint(path) as checkpoint:
+        for _ in range(3):
+            checkpoint.pending("http://a/")
+        checkpoint.finished("http://a/")
+    with Checkpoint(path, state=Checkpoint.load(path)) as checkpoint:
+        checkpoint.pending("http://a/2")
+    with open(path, encoding="utf-8") as fp:
+        lines = [json.loads(line) for line in fp]
+    assert lines == [{"p": "http://a/"}, {"c": "http://a/"}, {"p": "http://a/2"}]
+    # A fresh run starts a new file.
+    Checkpoint(path).close()
+    assert Checkpoint.load(path).pending == {}
+
+
+def crawl(tmp_path, checkpoint, state=None, stop_after=None):
+    engine = ScraperEngine(config={"delay": 0, "retries": 1, "concurrency": 1})
+    config = {"frontier_path": str(tmp_path / "frontier.db"), "max_depth": 3, "max_pages": 4}
+    urls = []
+    with Crawler(engine, config, checkpoint=checkpoint) as crawler, patch.object(
+        engine.session, "get", side_effect=fake_get
+    ) as mock_get:
+        if state is not None:
+            crawler.resume(state)
+        for result in crawler.crawl(["http://example.com/"]):
+            urls.append(result.url)
+            if len(urls) == stop_after:
+                break
+    checkpoint.close()
+    return urls, mock_get.call_count
+
+
+def test_interrupted_crawl_resumes_where_it_stopped(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    full, _ = crawl(tmp_path, Checkpoint(str(tmp_path / "full.jsonl")))
+    assert len(full) == 4
+
+    first, _ = crawl(tmp_path, Checkpoint(path), stop_after=2)
+    state = Checkpoint.load(path)
+    # The page being handled when the run stopped is not finished.
+    assert state.finished == set(first[:1])
+
+    second, fetched = crawl(tmp_path, Checkpoint(path, state=state), state)
+    resumed = first[:1] + second
+    assert fetched == 3 and len(set(resumed)) == 4
+    # Pages fetched together complete in any order, so which of /c and /d
+    # fills the last slot can differ between runs.
+    leaves = {"http://example.com/c", "http://example.com/d"}
+    for pages in (full, resumed):
+        assert set(pages) - leaves == {"http://example.com/" + p for p in ("", "a", "b")}
+    assert Checkpoint.load(path).finished == set(resumed)
+
+
+def test_cli_resume(tmp_path, monkeypatch):
+    websites = tmp_path / "websites.json"
+    websites.write_text(json.dumps([{"url": "http://example.com/"}]))
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({
+        "delay": 0,
+        "crawl": {"frontier_path": str(tmp_path / "frontier.db"), "max_depth": 1},
+    }))
+    argv = [
+        "--websites", str(websites), "--config", str(config),
+        "--checkpoint", str(tmp_path / "run.jsonl"), "--output-dir", str(tmp_path / "out"),
+    ]
+    assert not parse_arguments(argv).crawl
+    args = parse_arguments(argv + ["--resume"])
+    assert args.crawl and args.resume
+
+    monkeypatch.setattr(requests.Session, "get", lambda self, url, **kw: fake_get(url))
+    with Checkpoint(args.checkpoint) as checkpoint:
+        checkpoint.pending("http://example.com/")
+        checkpoint.pending("http://example.com/a", 1)
+        checkpoint.pending("http://example.com/b", 1)
+        checkpoint.finished("http://example.com/")
+    assert run_crawl(args) == 2
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == sorted(
+        output_path("", url) for url in ("http://example.com/a", "http://example.com/b")
+    )
+
+
+def test_crawl_applies_per_site_rate_limits(tmp_path, monkeypatch):
+    websites = tmp_path / "websites.json"
+    websites.write_text(json.dumps([
+        {"url": "http://example.com/", "rate_limit": {"requests_per_second": 50, "burst": 5}}
+    ]))
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({
+        "delay": 0,
+        "crawl": {"frontier_path": str(tmp_path / "frontier.db")},
+    }))
+    args = parse_arguments([
+        "--crawl", "--websites", str(websites), "--config", str(config),
+        "--checkpoint", str(tmp_path / "run.jsonl"), "--output-dir", str(tmp_path / "out"),
+    ])
+    monkeypatch.setattr(requests.Session, "get", lambda self, url, **kw: fake_get(url))
+    assert run_crawl(args) == 5
+    limits = Checkpoint.load(args.checkpoint).limits["example.com"]
+    assert (limits["rate"], limits["burst"]) == (50, 5)
@@ -0,0 +1,76 @@
+import requests
+from unittest.mock import patch
+
+from cinder_web_scraper.scraping.circuit_breaker import CircuitBreaker
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_opens_after_failure_rate_threshold():
+    breaker = CircuitBreaker(failure_threshold=0.5, window=4, min_requests=4)
+    url = "http://flaky.example/page"
+    breaker.record_success(url)
+    breaker.record_failure(url)
+    breaker.record_success(url)
+    assert breaker.state(url) == "closed"
+    breaker.record_failure(url)
+    assert breaker.state(url) == "open"
+    assert breaker.allow(url) is False
+    # other hosts are unaffected
+    assert breaker.allow("http://healthy.example/") is True
+
+
+def test_half_open_trial_closes_or_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_requests=1, reset_timeout=10, clock=clock)
+    url = "http://flaky.example/"
+    breaker.record_failure(url)
+    assert breaker.allow(url) is False
+
+    clock.now = 10
+    assert breaker.allow(url) is True
+    assert breaker.state(url) == "half_open"
+    # only a single trial request is let through
+    assert breaker.allow(url) is False
+    breaker.record_failure(url)
+    assert breaker.state(url) == "open"
+
+    clock.now = 20
+    assert breaker.allow(url) is True
+    breaker.record_success(url)
+    assert breaker.state(url) == "closed"
+
+
+def test_snapshot_reports_state():
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_requests=2, reset_timeout=30, clock=clock)
+    breaker.record_failure("http://a.example/")
+    breaker.record_failure("http://a.example/")
+    clock.now = 5
+    snapshot = breaker.snapshot()
+    assert snapshot["a.example"]["state"] == "open"
+    assert snapshot["a.example"]["failure_rate"] == 1.0
+    assert snapshot["a.example"]["retry_in"] == 25
+
+
+def test_engine_short_circuits_failing_host():
+    config = {
+        "delay": 0,
+        "retries": 1,
+        "circuit_breaker": {"min_requests": 2, "reset_timeout": 60},
+    }
+    engine = ScraperEngine(config=config)
+    with patch.object(
+        engine.session, "get", side_effect=requests.ConnectionError("reset")
+    ) as mock_get:
+        for i in range(5):
+            assert engine.scrape(f"http://down.example/{i}") is None
+    assert mock_get.call_count == 2
+    assert engine.circuit_breaker.snapshot()["down.example"]["state"] == "open"
@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from cinder_web_scraper.scraping.connection_pool import InstrumentedAdapter, PoolMetrics
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+@pytest.fixture
+def server():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path == "/slow":
+                time.sleep(0.2)
+            body = b"<title>ok</title>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def engine(pool, **config):
+    return ScraperEngine(config={"delay": 0, "connection_pool": pool, **config})
+
+
+def test_metrics_aggregate_hosts():
+    metrics = PoolMetrics()
+    metrics.record_checkout("a", reused=False, tls=True, wait=0.5)
+    metrics.record_checkout("a", reused=True, tls=True, wait=0.0)
+    metrics.record_checkout("b", reused=True, tls=False, wait=0.25)
+    metrics.record("b", "discarded")
+    total = metrics.stats()
+    assert total["checkouts"] == 3
+    assert total["tls_handshakes"] == 1
+    assert total["reuse_ratio"] == pytest.approx(2 / 3)
+    assert total["pool_wait_seconds"] == pytest.approx(0.75)
+    assert total["max_pool_wait_seconds"] == 0.5
+    assert metrics.stats("b")["discarded"] == 1
+    assert set(metrics.hosts()) == {"a", "b"}
+    assert metrics.stats("missing")["reuse_ratio"] == 0.0
+
+
+def test_keep_alive_connections_are_reused(server):
+    scraper = engine({"shared": False})
+    for _ in range(5):
+        assert scraper.scrape(server + "/") is not None
+    stats = scraper.connection_stats()
+    assert stats["new_connections"] == 1
+    assert stats["reused"] == 4
+    assert stats["reuse_ratio"] == pytest.approx(0.8)
+    assert stats["tls_handshakes"] == 0
+
+
+def test_idle_connections_are_closed(server):
+    scraper = engine({"shared": False, "idle_timeout": 0.05})
+    scraper.scrape(server + "/")
+    time.sleep(0.1)
+    scraper.scrape(server + "/")
+    scraper.scrape(server + "/")
+    stats = scraper.connection_stats()
+    assert stats["idle_closed"] == 1
+    assert stats["new_connections"] == 2
+    assert stats["reused"] == 1
+
+
+def test_full_pool_discards_or_waits(server):
+    def run(scraper):
+        # Bypass the rate limiter so all three requests overlap.
+        request = scraper.session.prepare_request(requests.Request("GET", server + "/slow"))
+        with ThreadPoolExecutor(3) as pool:
+            list(pool.map(lambda _: scraper.adapter.send(request).content, range(3)))
+        return scraper.connection_stats()
+
+    discarding = engine({"shared": False, "per_host": 1}, concurrency=1)
+    stats = run(discarding)
+    assert stats["new_connections"] == 3
+    assert stats["discarded"] == 2
+
+    blocking = engine({"shared": False, "per_host": 1, "block": True}, concurrency=1)
+    stats = run(blocking)
+    assert stats["new_connections"] == 1
+    assert stats["discarded"] == 0
+    assert stats["max_pool_wait_seconds"] >= 0.15
+
+
+def test_adapter_is_shared_across_engines(server):
+    with patch.object(InstrumentedAdapter, "_shared", None):
+        first = engine({"per_host": 2})
+        second = engine({"per_host": 6})
+        private = engine({"shared": False})
+        assert first.adapter is second.adapter
+        assert private.adapter is not first.adapter
+        assert first.adapter.per_host == 6
+
+        first.scrape(server + "/")
+        second.scrape(server + "/")
+        assert second.connection_stats()["reused"] == 1
+
+    assert engine({"shared": False}, concurrency=3).adapter.per_host == 3
+
+
+def test_stock_adapter_without_connection_pool_config():
+    scraper = ScraperEngine(config={"concurrency": 3})
+    adapter = scraper.session.get_adapter("https://example.com/")
+    assert scraper.adapter is None
+    assert type(adapter) is HTTPAdapter
+    assert adapter._pool_maxsize == 3
+    assert scraper.connection_stats() == {}
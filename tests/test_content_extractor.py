@@ -33,3 +33,76 @@ def test_empty_html():
     assert result["links"] == []
     assert result["images"] == []
     assert result["text"] == ""
+
+
+def test_parsed_document_is_reused():
+    html = "<html><head><title>T</title></head><body><p class='x'>A</p></body></html>"
+    extractor = ContentExtractor()
+    doc = extractor.parse(html)
+    assert extractor.parse(doc) is doc
+    assert extractor.extract(doc, "p.x") == ["A"]
+    assert extractor.extract_structured(doc)["title"] == "T"
+
+
+def test_extract_accepts_bytes():
+    extractor = ContentExtractor()
+    markup = "<p class='x'>café</p>".encode("utf-8")
+    assert extractor.extract(markup, "p.x") == ["café"]
+
+
+def test_extract_fields_matches_select():
+    html = (
+        "<html><body><h1 id='main'>Title</h1>"
+        "<div class='content'><p>One</p><p class='x'>Two</p></div>"
+        "<ul><li><a href='/a'>A</a></li><li><a>B</a></li></ul></body></html>"
+    )
+    selectors = {
+        "title": "h1",
+        "content": ".content",
+        "paragraphs": "div.content > p",
+        "links": "a[href]",
+        "either": "#main, p.x",
+        "second": "li:nth-child(2)",
+        "missing": ".nope",
+    }
+    extractor = ContentExtractor()
+    doc = extractor.parse(html)
+    record = extractor.extract_fields(doc, selectors)
+    expected = {
+        field: [el.get_text(strip=True) for el in doc.select(selector)]
+        for field, selector in selectors.items()
+    }
+    assert record == expected
+    assert record["either"] == ["Title", "Two"]
+    assert record["missing"] == []
+
+
+def test_partial_parse_matches_full_parse():
+    html = (
+        "<html><head><title>T</title></head><body>"
+        "<div class='content'><p>One</p><p class='x'>Two <b>bold</b></p></div>"
+        "<p class='x'>Outside</p><ul><li><a href='/a'>A</a></li></ul>"
+        "<img src='/i.png'><script>var x;</script></body></html>"
+    )
+    selectors = {
+        "content": ".content",
+        "paragraphs": "div.content > p",
+        "links": "ul a[href]",
+        "x": "p.x",
+        "second": "li:nth-child(1)",
+    }
+    full = ContentExtractor()
+    partial = ContentExtractor(partial=True)
+    assert partial.extract_fields(html, selectors) == full.extract_fields(html, selectors)
+    for selector in selectors.values():
+        assert partial.extract(html, selector) == full.extract(html, selector)
+    structured = partial.extract_structured(html, include_text=False)
+    assert structured == dict(full.extract_structured(html), text="")
+
+
+def test_partial_parse_builds_only_needed_subtrees():
+    html = "<html><body><div class='content'><p>One</p></div><p>Other</p></body></html>"
+    extractor = ContentExtractor(partial=True)
+    doc = extractor.parse_for(html, [".content p"])
+    assert [tag.name for tag in doc.find_all(True)] == ["div", "p"]
+    assert ContentExtractor().parse_for(html, [".content p"]).body is not None
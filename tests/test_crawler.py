@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+import requests
+
+from cinder_web_scraper.crawling.crawler import Crawler, SiteRules, resolve_link
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+PAGES = {
+    "http://example.com/": "<a href='/a'>A</a><a href='b#top'>B</a>"
+    "<a href='http://other.com/x'>X</a><a href='mailto:me@example.com'>M</a>",
+    "http://example.com/a": "<a href='/c'>C</a><a href='/'>Home</a>",
+    "http://example.com/b": "<a href='/private/1'>P</a>",
+    "http://example.com/c": "<a href='/d'>D</a>",
+    "http://example.com/d": "<p>leaf</p>",
+}
+
+
+def fake_get(url, **kwargs):
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200 if url in PAGES else 404
+    response._content = PAGES.get(url, "").encode()
+    return response
+
+
+def make_crawler(tmp_path, **crawl):
+    engine = ScraperEngine(config={"delay": 0, "retries": 1, "concurrency": 2})
+    config = {"frontier_path": str(tmp_path / "frontier.db"), **crawl}
+    return engine, Crawler(engine, config)
+
+
+def test_crawl_follows_links_within_depth_and_domain(tmp_path):
+    engine, crawler = make_crawler(tmp_path, max_depth=2, deny_patterns=["/private/"])
+    with crawler, patch.object(engine.session, "get", side_effect=fake_get):
+        results = {r.url: r for r in crawler.crawl(["http://example.com/"])}
+    assert set(results) == {
+        "http://example.com/",
+        "http://example.com/a",
+        "http://example.com/b",
+        "http://example.com/c",
+    }
+    assert results["http://example.com/c"].depth == 2
+    assert results["http://example.com/a"].record["links"] == ["/c", "/"]
+
+
+def test_crawl_respects_per_site_page_limit(tmp_path):
+    engine, crawler = make_crawler(tmp_path, max_depth=5)
+    site = {"url": "http://example.com/", "crawl": {"max_pages": 2}}
+    with crawler, patch.object(engine.session, "get", side_effect=fake_get):
+        results = list(crawler.crawl([site]))
+    assert len(results) == 2
+    assert results[0].url == "http://example.com/"
+
+
+def test_site_rules_filters():
+    rules = SiteRules(
+        "http://example.com/",
+        allowed_domains=["cdn.net"],
+        allow_patterns=[r"^https?://[^/]+/(docs|static)/"],
+    )
+    assert rules.allows("http://example.com/docs/1", 1)
+    assert rules.allows("http://img.cdn.net/static/x", 1)
+    assert not rules.allows("http://example.com/blog/1", 1)
+    assert not rules.allows("http://evil.com/docs/1", 1)
+    assert not rules.allows("http://example.com/docs/1", 3)
+    assert resolve_link("http://example.com/a/", "../b#frag") == "http://example.com/b"
+    assert resolve_link("http://example.com/", "javascript:void(0)") is None
+
+
+def test_crawl_fetches_url_variants_once(tmp_path):
+    engine, crawler = make_crawler(tmp_path, max_depth=2)
+    pages = {
+        "http://example.com/": "<a href='/a?utm_source=x'>A</a><a href='/./a'>A</a>"
+        "<a href='HTTP://EXAMPLE.COM:80/a'>A</a>",
+        "http://example.com/a": "<p>a</p>",
+    }
+
+    def get(url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200 if url in pages else 404
+        response._content = pages.get(url, "").encode()
+        return response
+
+    with crawler, patch.object(engine.session, "get", side_effect=get) as mock_get:
+        urls = [r.url for r in crawler.crawl(["http://Example.com"])]
+    assert urls == ["http://example.com/", "http://example.com/a"]
+    assert mock_get.call_count == 2
+    assert crawler.duplicates == 2
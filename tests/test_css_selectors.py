@@ -0,0 +1,97 @@
+from bs4 import BeautifulSoup
+
+from cinder_web_scraper.scraping.css_selectors import (
+    CompiledSelector,
+    SelectorCache,
+    SelectorKey,
+    SelectorSet,
+    default_selector_cache,
+    prefilter_keys,
+    split_selector,
+    strainer_for,
+)
+
+
+def test_split_selector():
+    assert split_selector("div.a > p, h1") == [["div.a", "p"], ["h1"]]
+    assert split_selector("a[href]") is None
+    assert split_selector("li:first-child") is None
+
+
+def test_prefilter_keys_use_subject_of_each_branch():
+    assert prefilter_keys("div > p.x#y") == (SelectorKey("p", frozenset({"x"}), "y"),)
+    assert prefilter_keys("a[href]") == (SelectorKey("a", frozenset(), None),)
+    # the attribute selector is the subject here, so any element may match
+    assert prefilter_keys("a [href]") == (SelectorKey(None, frozenset(), None),)
+    assert prefilter_keys("a[title='x']") is None
+
+
+def test_compiled_selector_agrees_with_soupsieve():
+    soup = BeautifulSoup(
+        "<div class='a b'><p id='x'>1</p><p>2</p><span class='b'>3</span></div>",
+        "html.parser",
+    )
+    for selector in ["p", ".b", "div.a > p", "#x", "p:not(#x)", "span, p#x"]:
+        compiled = CompiledSelector(selector)
+        expected = soup.select(selector)
+        assert [tag for tag in soup.find_all(True) if compiled.match(tag)] == expected
+
+
+def test_selector_set_reports_matching_fields():
+    soup = BeautifulSoup("<h1 class='t'>x</h1>", "html.parser")
+    selectors = SelectorSet({"heading": "h1", "titled": ".t", "other": "p"})
+    assert selectors.matching_fields(soup.h1) == ["heading", "titled"]
+
+
+def test_selector_cache_lru_and_stats():
+    cache = SelectorCache(maxsize=2)
+    first = cache.get("p")
+    assert cache.get("p") is first
+    cache.get("h1")
+    cache.get("p")
+    cache.get("div")  # evicts "h1", the least recently used entry
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+    assert stats["hit_rate"] == 0.4
+    assert cache.get("p") is first
+
+
+def test_selector_cache_keys_include_namespaces():
+    cache = SelectorCache()
+    plain = cache.get("rect")
+    namespaced = cache.get("rect", {"svg": "http://www.w3.org/2000/svg"})
+    assert plain is not namespaced
+
+
+def test_extractor_uses_shared_cache():
+    from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+
+    default_selector_cache.clear()
+    extractor = ContentExtractor()
+    for _ in range(3):
+        extractor.extract("<p class='x'>A</p>", "p.x")
+        extractor.extract_fields("<p class='x'>A</p>", {"a": "p.x"})
+    stats = default_selector_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 5
+
+
+def test_strainer_for_uses_leftmost_compounds():
+    strainer = strainer_for(["div.x > p, #main", "a[href]"])
+    assert strainer is not None
+    assert set(strainer.keys) == {
+        SelectorKey("div", frozenset({"x"}), None),
+        SelectorKey(None, frozenset(), "main"),
+        SelectorKey("a", frozenset(), None),
+    }
+
+
+def test_strainer_for_rejects_unsafe_selectors():
+    assert strainer_for(["h1 + p"]) is None
+    assert strainer_for(["li:first-child"]) is None
+    assert strainer_for(["[href] a"]) is None
+    assert strainer_for(["*"]) is None
+    assert strainer_for(["h1", "p ~ span"]) is None
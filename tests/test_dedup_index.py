@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from cinder_web_scraper.scraping.dedup_index import DedupIndex
+
+
+def test_claim_and_persistence(tmp_path):
+    path = str(tmp_path / "dedup.db")
+    with DedupIndex(path) as index:
+        assert index.claim("http://e.com/a")
+        assert not index.claim("http://e.com/a")
+        assert "http://e.com/a" in index
+        assert index.stats() == {"claimed": 1, "saved": 1, "released": 0, "errors": 0}
+
+    with DedupIndex(path) as index:
+        assert not index.claim("http://e.com/a")
+        assert index.claim("http://e.com/b")
+        assert len(index) == 2
+
+
+def test_release_allows_refetch(tmp_path):
+    with DedupIndex(str(tmp_path / "dedup.db")) as index:
+        index.claim("http://e.com/a")
+        index.release("http://e.com/a")
+        assert index.claim("http://e.com/a")
+
+
+def test_database_errors_are_logged_not_raised(tmp_path):
+    index = DedupIndex(str(tmp_path / "dedup.db"))
+    index.close()
+    index.release("http://e.com/a")
+    # A failed lookup lets the fetch go ahead.
+    assert index.claim("http://e.com/a")
+    assert index.stats() == {"claimed": 0, "saved": 0, "released": 0, "errors": 2}
+
+
+def test_ttl_expires_entries(tmp_path):
+    with DedupIndex(str(tmp_path / "dedup.db"), ttl=60) as index:
+        with patch("cinder_web_scraper.scraping.dedup_index.time.time", return_value=1000.0):
+            assert index.claim("http://e.com/a")
+        with patch("cinder_web_scraper.scraping.dedup_index.time.time", return_value=1030.0):
+            assert not index.claim("http://e.com/a")
+        with patch("cinder_web_scraper.scraping.dedup_index.time.time", return_value=1100.0):
+            assert index.claim("http://e.com/a")
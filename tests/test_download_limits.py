@@ -0,0 +1,51 @@
+import io
+
+import pytest
+import requests
+
+from cinder_web_scraper.scraping.download_limits import (
+    DownloadLimits,
+    DownloadRejected,
+    decode_chunks,
+)
+
+
+def _stream_response(body: bytes, content_type: str = "text/html") -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = "http://example.com/"
+    response.headers["Content-Type"] = content_type
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def test_from_config_is_off_by_default():
+    assert DownloadLimits.from_config({}) is None
+    limits = DownloadLimits.from_config({"stream_download": {"max_body_bytes": 5}})
+    assert limits.max_body_bytes == 5
+    assert "text/html" in limits.content_types
+
+
+def test_read_aborts_after_limit():
+    response = _stream_response(b"x" * 100)
+    limits = DownloadLimits(max_body_bytes=30, chunk_size=10)
+    with pytest.raises(DownloadRejected):
+        limits.read(response)
+    # Only the chunks up to the limit were read from the socket.
+    assert response.raw.tell() == 40
+
+
+def test_content_type_and_length_checked_before_body():
+    limits = DownloadLimits(max_body_bytes=10)
+    with pytest.raises(DownloadRejected, match="content type"):
+        limits.check_headers("u", {"Content-Type": "application/pdf"})
+    with pytest.raises(DownloadRejected, match="larger"):
+        limits.check_headers("u", {"Content-Type": "text/html", "Content-Length": "11"})
+    limits.check_headers("u", {"Content-Type": "text/html; charset=utf-8"})
+    DownloadLimits(content_types=[]).check_headers("u", {"Content-Type": "image/png"})
+
+
+def test_decode_chunks_handles_split_characters():
+    data = "café ☕".encode("utf-8")
+    chunks = [data[i:i + 1] for i in range(len(data))]
+    assert "".join(decode_chunks(chunks, "utf-8")) == "café ☕"
@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import shared_memory
+
+import pytest
+
+from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+from cinder_web_scraper.scraping.extraction_pool import ExtractionPool, extract_page
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+PAGE = (
+    "<html><head><title>Café {n}</title></head><body>"
+    "<h1>Heading {n}</h1><p class='content'>Body {n}</p>"
+    "<a href='/next/{n}'>next</a></body></html>"
+)
+SELECTORS = {"heading": "h1", "content": ".content"}
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ExtractionPool(processes=2, parser="html.parser") as pool:
+        yield pool
+
+
+def settle(pool):
+    """Wait for done callbacks, which may run just after ``result()`` returns."""
+    deadline = time.monotonic() + 5
+    while True:
+        stats = pool.stats()
+        if stats["completed"] + stats["failed"] == stats["submitted"]:
+            return
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def server():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/missing"):
+                self.send_error(404)
+                return
+            body = PAGE.format(n=self.path.strip("/")).encode("latin-1")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=iso-8859-1")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_extract_page_matches_extractor():
+    html = PAGE.format(n=1)
+    extractor = ContentExtractor("html.parser")
+    assert extract_page(html, extractor=extractor) == extractor.extract_structured(html)
+    assert extract_page(html, SELECTORS, extractor=extractor) == {
+        "heading": ["Heading 1"],
+        "content": ["Body 1"],
+    }
+
+
+@pytest.mark.parametrize("shared", [True, False])
+def test_pool_extracts_bodies(pool, shared):
+    pool.shared = shared
+    body = PAGE.format(n=7).encode("utf-16")
+    assert pool.submit(body, "utf-16").result(timeout=30)["title"] == "Café 7"
+    assert pool.submit(body, "utf-16", SELECTORS).result(timeout=30) == {
+        "heading": ["Heading 7"],
+        "content": ["Body 7"],
+    }
+    pool.shared = True
+
+
+def test_shared_blocks_are_unlinked(pool):
+    blocks = []
+    original = shared_memory.SharedMemory
+
+    def recording(*args, **kwargs):
+        block = original(*args, **kwargs)
+        blocks.append(block.name)
+        return block
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(shared_memory, "SharedMemory", recording)
+        futures = [pool.submit(PAGE.format(n=i).encode()) for i in range(5)]
+        for future in futures:
+            future.result(timeout=30)
+    assert len(blocks) == 5
+    settle(pool)
+    for name in blocks:
+        with pytest.raises(FileNotFoundError):
+            original(name=name)
+
+
+def test_failed_jobs_are_counted(pool):
+    before = pool.stats()
+    future = pool.submit(b"<p>x</p>", "no-such-codec")
+    with pytest.raises(LookupError):
+        future.result(timeout=30)
+    settle(pool)
+    stats = pool.stats()
+    assert stats["failed"] == before["failed"] + 1
+    assert stats["submitted"] == before["submitted"] + 1
+
+
+def test_engine_extract_many(server, tmp_path):
+    engine = ScraperEngine(config={"delay": 0, "parser": "html.parser"})
+    urls = [f"{server}/{i}" for i in range(6)] + [f"{server}/missing"]
+    paths = {urls[0]: str(tmp_path / "first.json")}
+
+    results = dict(engine.extract_many(urls, SELECTORS, processes=2, output_paths=paths))
+
+    assert set(results) == set(urls)
+    assert results[f"{server}/missing"] is None
+    assert results[f"{server}/3"] == {"heading": ["Heading 3"], "content": ["Body 3"]}
+    saved = json.loads((tmp_path / "first.json").read_text())
+    assert saved == {"heading": ["Heading 0"], "content": ["Body 0"]}
+
+    structured = dict(engine.extract_many(urls[:2], processes=1))
+    assert structured[urls[1]]["title"] == "Café 1"
+    assert structured[urls[1]]["links"] == ["/next/1"]
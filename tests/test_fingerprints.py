@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+import requests
+
+from cinder_web_scraper.scraping.fingerprints import FingerprintStore, content_hash
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+def test_content_hash_uses_context():
+    assert content_hash("<p>x</p>") == content_hash(b"<p>x</p>")
+    assert content_hash("<p>x</p>", "a") != content_hash("<p>x</p>", "b")
+
+
+def test_check_body_returns_stored_record(tmp_path):
+    with FingerprintStore(str(tmp_path / "fp.db")) as store:
+        body_hash, record = store.check_body("u", "<p>1</p>")
+        assert record is None
+        assert store.check_record("u", {"a": [1]}, body_hash)
+
+        assert store.check_body("u", "<p>1</p>") == (body_hash, {"a": [1]})
+        assert store.check_body("u", "<p>1</p>", context="other")[1] is None
+        assert store.check_body("u", "<p>2</p>")[1] is None
+        assert store.stats()["extractions_skipped"] == 1
+        assert store.stats()["extracted"] == 3
+
+
+def test_check_record_detects_changes_across_runs(tmp_path):
+    path = str(tmp_path / "fp.db")
+    with FingerprintStore(path) as store:
+        assert store.check_record("u", {"b": 1, "a": 2})
+    with FingerprintStore(path) as store:
+        assert not store.check_record("u", {"a": 2, "b": 1})
+        assert store.check_record("u", {"a": 3, "b": 1})
+
+
+def _response(html):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = html.encode()
+    response.headers["Content-Type"] = "text/html; charset=utf-8"
+    return response
+
+
+def test_engine_skips_unchanged_extraction_and_writes(tmp_path):
+    config = {"delay": 0, "retries": 1, "fingerprints": {"path": str(tmp_path / "fp.db")}}
+    engine = ScraperEngine(config=config)
+    output = tmp_path / "out.json"
+    site = {"url": "http://example.com/", "selectors": {"title": "h1"}, "output": str(output)}
+    pages = [
+        "<h1>Hello</h1><p>10:00</p>",
+        "<h1>Hello</h1><p>10:00</p>",  # identical body
+        "<h1>Hello</h1><p>10:05</p>",  # new timestamp, same record
+        "<h1>Bye</h1><p>10:10</p>",  # changed record
+    ]
+    extract = engine.extractor.extract_fields
+    with patch.object(engine.session, "get", side_effect=[_response(p) for p in pages]), \
+            patch.object(engine.extractor, "extract_fields", side_effect=extract) as fields, \
+            patch.object(engine.output_manager, "save", wraps=engine.output_manager.save) as save:
+        records = [engine.scrape_site(site) for _ in pages]
+
+    assert records[:3] == [{"title": ["Hello"]}] * 3
+    assert records[3] == {"title": ["Bye"]}
+    assert fields.call_count == 3
+    assert save.call_count == 2
+    assert output.read_text().count("Bye") == 1
+    assert engine.fingerprints.stats() == {
+        "extracted": 3,
+        "extractions_skipped": 1,
+        "written": 2,
+        "writes_skipped": 2,
+    }
+
+
+def test_missing_output_is_rewritten(tmp_path):
+    config = {"delay": 0, "retries": 1, "fingerprints": {"path": str(tmp_path / "fp.db")}}
+    engine = ScraperEngine(config=config)
+    output = tmp_path / "page.txt"
+    with patch.object(engine.session, "get", side_effect=lambda *a, **k: _response("<p>x</p>")):
+        engine.scrape("http://example.com/", str(output))
+        output.unlink()
+        engine.scrape("http://example.com/", str(output))
+    assert output.read_text() == "x"
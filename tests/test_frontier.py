@@ -0,0 +1,35 @@
+import random
+
+from cinder_web_scraper.crawling.frontier import Frontier
+
+
+def test_frontier_pops_in_priority_order_while_spilling(tmp_path):
+    random.seed(7)
+    pushed = []
+    with Frontier(str(tmp_path / "frontier.db"), max_in_memory=8, batch_size=4) as frontier:
+        for i in range(200):
+            priority = random.randint(0, 9)
+            frontier.push(f"http://example.com/{i}", priority, depth=priority)
+            pushed.append((priority, i))
+            assert frontier.in_memory <= 8 + 4
+        assert len(frontier) == 200
+
+        popped = []
+        while True:
+            entry = frontier.pop()
+            if entry is None:
+                break
+            popped.append((entry.priority, int(entry.url.rsplit("/", 1)[1])))
+    assert popped == sorted(pushed)
+
+
+def test_frontier_interleaved_push_and_pop():
+    frontier = Frontier(":memory:", max_in_memory=4, batch_size=2)
+    for i in range(10):
+        frontier.push(f"u{i}", 5)
+    assert frontier.pop().url == "u0"
+    frontier.push("urgent", 0)
+    assert frontier.pop().url == "urgent"
+    assert [frontier.pop().url for _ in range(9)] == [f"u{i}" for i in range(1, 10)]
+    assert frontier.pop() is None
+    frontier.close()
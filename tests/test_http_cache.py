@@ -0,0 +1,85 @@
+import time
+
+import requests
+from unittest.mock import patch
+
+from cinder_web_scraper.scraping.http_cache import HttpCache, freshness_deadline
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+def _response(status, body=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    response.encoding = "utf-8"
+    return response
+
+
+def test_freshness_deadline_directives():
+    now = 1000.0
+    assert freshness_deadline({"Cache-Control": "public, max-age=60"}, now) == 1060
+    assert freshness_deadline({"Cache-Control": "no-store"}, now) is None
+    assert freshness_deadline({"Cache-Control": "no-cache, max-age=60"}, now) == now
+    assert freshness_deadline({}, now) == now
+
+
+def test_store_and_lookup_validators(tmp_path):
+    with HttpCache(str(tmp_path / "cache.db")) as cache:
+        assert cache.store(
+            "http://a/", b"<p>a</p>", {"ETag": '"v1"', "Last-Modified": "Mon"}, "utf-8"
+        )
+        entry = cache.lookup("http://a/")
+        assert entry.text == "<p>a</p>"
+        assert not entry.fresh
+        assert entry.validators() == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon",
+        }
+        # responses that can never be reused are not stored
+        assert not cache.store("http://b/", b"x", {})
+        assert not cache.store("http://c/", b"x", {"Cache-Control": "no-store"})
+
+
+def test_lru_eviction_keeps_size_bound(tmp_path):
+    with HttpCache(str(tmp_path / "cache.db"), max_bytes=25) as cache:
+        headers = {"ETag": "x"}
+        cache.store("http://1/", b"a" * 10, headers)
+        cache.store("http://2/", b"b" * 10, headers)
+        time.sleep(0.01)
+        cache.lookup("http://1/")
+        cache.store("http://3/", b"c" * 10, headers)
+        assert cache.size <= 25
+        assert cache.lookup("http://2/") is None
+        assert cache.lookup("http://1/") is not None
+        assert cache.stats()["evictions"] == 1
+
+
+def test_engine_serves_fresh_entries_without_request(tmp_path):
+    config = {"delay": 0, "http_cache": {"path": str(tmp_path / "cache.db")}}
+    engine = ScraperEngine(config=config)
+    first = _response(200, b"<p>cached</p>", {"Cache-Control": "max-age=300"})
+    with patch.object(engine.session, "get", return_value=first) as mock_get:
+        assert engine.scrape("http://example.com/") == "<p>cached</p>"
+        assert engine.scrape("http://example.com/") == "<p>cached</p>"
+    mock_get.assert_called_once()
+    stats = engine.http_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes_saved"] == len(b"<p>cached</p>")
+    engine.http_cache.close()
+
+
+def test_engine_revalidates_with_conditional_request(tmp_path):
+    config = {"delay": 0, "http_cache": {"path": str(tmp_path / "cache.db")}}
+    engine = ScraperEngine(config=config)
+    responses = [
+        _response(200, b"<p>page</p>", {"ETag": '"abc"'}),
+        _response(304, b"", {"ETag": '"abc"'}),
+    ]
+    with patch.object(engine.session, "get", side_effect=responses) as mock_get:
+        assert engine.scrape("http://example.com/") == "<p>page</p>"
+        assert engine.scrape("http://example.com/") == "<p>page</p>"
+    assert mock_get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"abc"'}
+    assert engine.http_cache.stats()["revalidated"] == 1
+    engine.http_cache.close()
@@ -0,0 +1,122 @@
+import random
+from unittest.mock import patch
+
+import requests
+
+from cinder_web_scraper.scraping.near_duplicates import (
+    NearDuplicateDetector,
+    choose_bands,
+    jaccard_estimate,
+    minhash,
+    record_text,
+    shingle_hashes,
+)
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+RNG = random.Random(7)
+VOCAB = [f"word{i}" for i in range(5000)]
+
+
+def article(words=300):
+    return [RNG.choice(VOCAB) for _ in range(words)]
+
+
+def edit(words, changes):
+    words = list(words)
+    for _ in range(changes):
+        words[RNG.randrange(len(words))] = RNG.choice(VOCAB)
+    return words
+
+
+def test_shingles_ignore_case_and_punctuation():
+    assert shingle_hashes("Hello, World! again") == shingle_hashes("hello world again")
+    assert len(shingle_hashes("a b c d e", size=3)) == 3
+    assert len(shingle_hashes("a b", size=3)) == 1
+    assert shingle_hashes("  ") == []
+
+
+def test_minhash_estimates_jaccard():
+    first = set(range(0, 1000))
+    second = set(range(200, 1200))  # Jaccard 800 / 1200
+    sig_a = minhash((hash_ * 0x9E3779B97F4A7C15 & (2**64 - 1) for hash_ in first), 256)
+    sig_b = minhash((hash_ * 0x9E3779B97F4A7C15 & (2**64 - 1) for hash_ in second), 256)
+    assert abs(jaccard_estimate(sig_a, sig_b) - 2 / 3) < 0.08
+    assert minhash([], 16) is None
+    # Densified bins keep tiny sets comparable.
+    assert minhash([5], 8) == minhash([5], 8)
+
+
+def test_choose_bands_targets_threshold():
+    bands, rows = choose_bands(0.9, 256)
+    assert bands * rows <= 256
+    assert abs((1 / bands) ** (1 / rows) - 0.9) < 0.02
+
+
+def test_detector_flags_near_duplicates_only():
+    detector = NearDuplicateDetector(threshold=0.9, capacity=1000)
+    original = article()
+    assert not detector.seen(" ".join(original))
+    assert detector.seen(" ".join(original))
+    assert detector.seen(" ".join(edit(original, 2)))
+    assert not detector.seen(" ".join(edit(original, 60)))
+    assert not detector.seen(" ".join(article()))
+    assert not detector.seen("")
+    assert detector.stats() == {"checked": 6, "duplicates": 2}
+
+
+def test_filter_stage_uses_record_text():
+    detector = NearDuplicateDetector(capacity=100)
+    page = " ".join(article())
+    records = [
+        {"title": "A", "text": page},
+        {"title": "B", "text": page + " footer"},
+        {"title": "C", "text": " ".join(article())},
+    ]
+    assert [r["title"] for r in detector.filter(records)] == ["A", "C"]
+    assert record_text({"title": ["x"], "body": ["y", "z"]}) == "x y z"
+
+
+def test_engine_does_not_write_near_duplicate_records(tmp_path):
+    engine = ScraperEngine(
+        config={"delay": 0, "retries": 1, "near_duplicates": {"threshold": 0.8}}
+    )
+    body = " ".join(article())
+    pages = {
+        "http://a.com/1": f"<title>One</title><p>{body}</p>",
+        "http://mirror.com/1": f"<title>One (mirror)</title><p>{body}</p>",
+        "http://a.com/2": f"<title>Two</title><p>{' '.join(article())}</p>",
+    }
+
+    def get(url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = pages[url].encode()
+        return response
+
+    with patch.object(engine.session, "get", side_effect=get):
+        for i, url in enumerate(pages):
+            assert engine.scrape_structured(url, str(tmp_path / f"{i}.json")) is not None
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["0.json", "2.json"]
+    assert engine.near_duplicates.stats()["duplicates"] == 1
+
+
+def test_rescraped_page_updates_its_own_output(tmp_path):
+    engine = ScraperEngine(config={"delay": 0, "retries": 1, "near_duplicates": True})
+    body = " ".join(article())
+    price = {"value": 10}
+
+    def get(url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = f"<title>Shop</title><p>{body} price {price['value']}</p>".encode()
+        return response
+
+    path = tmp_path / "shop.json"
+    with patch.object(engine.session, "get", side_effect=get):
+        engine.scrape_structured("http://shop.com/item", str(path))
+        price["value"] = 99
+        engine.scrape_structured("http://shop.com/item", str(path))
+
+    assert "price 99" in path.read_text()
+    assert engine.near_duplicates.stats()["duplicates"] == 0
@@ -0,0 +1,33 @@
+from cinder_web_scraper.scraping import parsers
+from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+
+
+def test_html_parser_is_always_available():
+    assert "html.parser" in parsers.available_parsers()
+    assert parsers.resolve_parser("html.parser") == "html.parser"
+
+
+def test_auto_prefers_fastest_installed(monkeypatch):
+    monkeypatch.setattr(parsers, "is_available", lambda name: True)
+    assert parsers.resolve_parser("auto") == "lxml"
+
+
+def test_default_is_html_parser_even_with_lxml_installed(monkeypatch):
+    monkeypatch.setattr(parsers, "is_available", lambda name: True)
+    assert parsers.resolve_parser(None) == "html.parser"
+    assert ContentExtractor().parser == "html.parser"
+
+
+def test_missing_backend_falls_back(monkeypatch):
+    monkeypatch.setattr(parsers, "is_available", lambda name: name == "html.parser")
+    assert parsers.resolve_parser("lxml") == "html.parser"
+    assert parsers.resolve_parser("no-such-parser") == "html.parser"
+    assert ContentExtractor("html5lib").parser == "html.parser"
+
+
+def test_per_call_parser_override(monkeypatch):
+    extractor = ContentExtractor("html.parser")
+    monkeypatch.setattr(parsers, "is_available", lambda name: True)
+    # the backend is resolved as installed but bs4 cannot load it here
+    doc = extractor.parse("<p>x</p>", parser="not-a-real-builder")
+    assert doc.p.get_text() == "x"
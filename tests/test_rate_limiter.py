@@ -0,0 +1,107 @@
+import time
+
+import requests
+from unittest.mock import patch
+
+from cinder_web_scraper.scraping.rate_limiter import HostRateLimiter, TokenBucket, host_of
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_host_of():
+    assert host_of("https://Example.COM:8080/path?q=1") == "example.com"
+    assert host_of("Example.com") == "example.com"
+
+
+def test_token_bucket_burst_and_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+    clock.now = 1.0
+    assert bucket.reserve() == 0.5
+
+
+def test_unlimited_rate_never_waits():
+    bucket = TokenBucket(rate=0)
+    assert all(bucket.reserve() == 0 for _ in range(100))
+
+
+def test_hosts_are_limited_independently():
+    clock = FakeClock()
+    limiter = HostRateLimiter(rate=1, burst=1, clock=clock)
+    assert limiter.reserve("http://slow.example/a") == 0
+    assert limiter.reserve("http://slow.example/b") == 1.0
+    # another host still has its own token available
+    assert limiter.reserve("http://fast.example/a") == 0
+
+
+def test_restore_reapplies_limits_snapshot():
+    clock = FakeClock()
+    limiter = HostRateLimiter(rate=1, burst=3, clock=clock)
+    limiter.configure_host("slow.example", 0.5)
+    for _ in range(3):
+        limiter.reserve("http://slow.example/")
+    snapshot = limiter.limits()
+
+    restored = HostRateLimiter(rate=1, burst=3, clock=clock)
+    restored.restore(snapshot)
+    assert restored.limits() == snapshot
+    # The used-up balance carries over instead of a fresh burst.
+    assert restored.reserve("http://slow.example/") == 2.0
+
+
+def test_site_overrides_from_config():
+    config = {
+        "rate_limit": {"requests_per_second": 1, "burst": 1},
+        "websites": [
+            {
+                "url": "https://fragile.example/",
+                "rate_limit": {"requests_per_second": 0.5, "burst": 3},
+            },
+            {"url": "https://plain.example/"},
+        ],
+    }
+    limiter = HostRateLimiter.from_config(config, delay=1.0)
+    limiter.bucket("https://fragile.example/x")
+    limiter.bucket("https://plain.example/x")
+    limits = limiter.limits()
+    assert limits["fragile.example"]["rate"] == 0.5
+    assert limits["fragile.example"]["burst"] == 3
+    assert limits["plain.example"]["rate"] == 1
+
+
+def test_scrape_many_does_not_block_other_hosts():
+    config = {
+        "delay": 0,
+        "retries": 1,
+        "websites": [
+            {"url": "http://slow.example/", "rate_limit": {"requests_per_second": 2}}
+        ],
+    }
+    engine = ScraperEngine(config=config)
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"ok"
+    urls = [f"http://slow.example/{i}" for i in range(3)]
+    urls += [f"http://fast.example/{i}" for i in range(10)]
+
+    order = []
+    with patch.object(engine.session, "get", return_value=response):
+        start = time.monotonic()
+        for url, _ in engine.scrape_many(urls, concurrency=2):
+            order.append((url, time.monotonic() - start))
+
+    finished = dict(order)
+    assert len(finished) == len(urls)
+    assert max(t for u, t in order if "fast" in u) < 0.4
+    assert finished["http://slow.example/2"] >= 0.9
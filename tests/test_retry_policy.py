@@ -0,0 +1,62 @@
+from email.utils import formatdate
+
+import requests
+from unittest.mock import patch
+
+from cinder_web_scraper.scraping.retry_policy import RetryPolicy, parse_retry_after
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+def _response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"body"
+    response.headers.update(headers or {})
+    response.url = "http://example.com"
+    return response
+
+
+def test_parse_retry_after_forms():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    now = 1_700_000_000
+    assert parse_retry_after(formatdate(now + 30, usegmt=True), now=now) == 30
+
+
+def test_backoff_grows_exponentially_with_cap():
+    policy = RetryPolicy(base_delay=1, max_delay=5, jitter=False)
+    assert [policy.backoff(n) for n in range(1, 6)] == [1, 2, 4, 5, 5]
+
+
+def test_full_jitter_stays_below_cap():
+    policy = RetryPolicy(base_delay=2, random_func=lambda: 0.25)
+    assert policy.backoff(3) == 2.0
+
+
+def test_next_delay_rules():
+    policy = RetryPolicy(max_attempts=3, base_delay=1, max_delay=10, jitter=False)
+    assert policy.next_delay(1, status=None) == 1
+    assert policy.next_delay(1, status=404) is None
+    assert policy.next_delay(3, status=503) is None
+    assert policy.next_delay(1, status=429, retry_after="7") == 7
+    # Retry-After beyond the allowed maximum aborts instead of waiting
+    assert policy.next_delay(1, status=429, retry_after="60") is None
+
+
+def test_engine_honours_retry_after():
+    engine = ScraperEngine(config={"delay": 0, "retries": 2})
+    responses = [_response(429, {"Retry-After": "3"}), _response(200)]
+    with patch.object(engine.session, "get", side_effect=responses) as mock_get, \
+            patch("time.sleep") as mock_sleep:
+        assert engine.scrape("http://example.com") == "body"
+    assert mock_get.call_count == 2
+    mock_sleep.assert_called_once_with(3.0)
+
+
+def test_engine_does_not_retry_client_errors():
+    engine = ScraperEngine(config={"delay": 0, "retries": 3})
+    with patch.object(engine.session, "get", return_value=_response(404)) as mock_get:
+        assert engine.scrape("http://example.com/missing") is None
+    mock_get.assert_called_once()
+    assert engine.circuit_breaker.state("http://example.com") == "closed"
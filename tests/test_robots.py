@@ -0,0 +1,152 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from cinder_web_scraper.scraping.async_scraper_engine import AsyncScraperEngine
+from cinder_web_scraper.scraping.rate_limiter import HostRateLimiter
+from cinder_web_scraper.scraping.robots import RobotsCache, robots_url
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+ROBOTS = b"""User-agent: *
+Disallow: /private/
+Crawl-delay: 2
+
+User-agent: blocked-bot
+Disallow: /
+"""
+
+
+@pytest.fixture
+def server():
+    hits = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        robots = ROBOTS
+        robots_status = 200
+
+        def do_GET(self):
+            hits[self.path] = hits.get(self.path, 0) + 1
+            if self.path == "/robots.txt":
+                status, body = self.server.robots_status, self.server.robots
+            else:
+                status, body = 200, b"<title>ok</title>"
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.robots, httpd.robots_status, httpd.hits = ROBOTS, 200, hits
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def base(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_robots_url():
+    assert robots_url("HTTPS://Example.com:8443/a/b?c") == "https://example.com:8443/robots.txt"
+
+
+def test_rules_are_fetched_once_per_ttl(server):
+    now = [0.0]
+    cache = RobotsCache(ttl=60, clock=lambda: now[0])
+    url = base(server)
+    assert cache.allowed(url + "/page", "cinder")
+    assert not cache.allowed(url + "/private/x", "cinder")
+    assert not cache.allowed(url + "/page", "blocked-bot")
+    assert server.hits["/robots.txt"] == 1
+
+    now[0] = 61.0
+    cache.allowed(url + "/page", "cinder")
+    assert server.hits["/robots.txt"] == 2
+    assert cache.stats() == {"hits": 2, "fetches": 2, "errors": 0}
+
+
+def test_concurrent_lookups_share_one_download(server):
+    cache = RobotsCache()
+    threads = [
+        threading.Thread(target=cache.allowed, args=(base(server) + "/p", "cinder"))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.hits["/robots.txt"] == 1
+
+
+@pytest.mark.parametrize("status, allowed", [(404, True), (403, False), (503, False)])
+def test_status_handling(server, status, allowed):
+    server.robots_status = status
+    assert RobotsCache().allowed(base(server) + "/private/x", "cinder") is allowed
+
+
+def test_lru_eviction(server):
+    cache = RobotsCache(max_hosts=1)
+    port = server.server_address[1]
+    cache.allowed(f"http://127.0.0.1:{port}/", "cinder")
+    cache.allowed(f"http://localhost:{port}/", "cinder")
+    assert len(cache) == 1
+    cache.allowed(f"http://127.0.0.1:{port}/", "cinder")
+    assert server.hits["/robots.txt"] == 3
+
+
+def test_crawl_delay_slows_rate_limiter_once(server):
+    cache = RobotsCache()
+    limiter = HostRateLimiter(rate=10.0, burst=5.0)
+    url = base(server) + "/page"
+    cache.allowed(url, "cinder", rate_limiter=limiter)
+    assert limiter.bucket(url).rate == pytest.approx(0.5)
+    assert limiter.bucket(url).burst == 1.0
+
+    # A slower configured rate is kept.
+    slow = HostRateLimiter(rate=0.1)
+    cache.allowed(url, "cinder", rate_limiter=slow)
+    assert slow.bucket(url).rate == pytest.approx(0.1)
+
+
+def test_engines_share_the_robots_cache(server):
+    config = {"delay": 0, "retries": 1, "respect_robots": True}
+    with patch.object(RobotsCache, "_shared", None):
+        first = ScraperEngine(config=config)
+        second = ScraperEngine(config=config)
+        assert first.robots is second.robots
+        assert first.scrape(base(server) + "/page") == "<title>ok</title>"
+        assert first.scrape(base(server) + "/private/secret") is None
+        results = dict(second.scrape_many([base(server) + "/a", base(server) + "/private/b"]))
+
+    assert results[base(server) + "/a"] is not None
+    assert results[base(server) + "/private/b"] is None
+    assert server.hits["/robots.txt"] == 1
+    assert "/private/secret" not in server.hits
+    assert first.rate_limiter.bucket(base(server)).rate == pytest.approx(0.5)
+    assert second.rate_limiter.bucket(base(server)).rate == pytest.approx(0.5)
+
+
+def test_async_engine_respects_robots(server):
+    config = {"delay": 0, "retries": 1, "respect_robots": True}
+    with patch.object(RobotsCache, "_shared", None):
+        engine = AsyncScraperEngine(config=config)
+
+    async def run():
+        return (
+            await engine.scrape(base(server) + "/page"),
+            await engine.scrape(base(server) + "/private/x"),
+        )
+
+    allowed, blocked = asyncio.run(run())
+    assert allowed == "<title>ok</title>"
+    assert blocked is None
+    assert "/private/x" not in server.hits
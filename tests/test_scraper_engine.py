@@ -1,8 +1,10 @@
+import io
 import requests
 from unittest.mock import patch
 
 from bs4 import BeautifulSoup
 
+import cinder_web_scraper.scraping.content_extractor as content_extractor
 from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
 from cinder_web_scraper.scraping.content_extractor import ContentExtractor
 from cinder_web_scraper.scraping.output_manager import OutputManager
@@ -145,3 +147,179 @@ def test_scraper_engine_scrape_working_url():
     assert "<title>Example Domain</title>" in content
     assert mock_get.called
 
+
+def _html_response(html: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = html.encode()
+    return response
+
+
+def test_scrape_many_yields_every_url():
+    engine = ScraperEngine(config={"delay": 0, "retries": 1})
+    urls = [f"http://example.com/{i}" for i in range(20)]
+
+    def fake_get(url, **kwargs):
+        return _html_response(f"<p>{url}</p>")
+
+    with patch.object(engine.session, "get", side_effect=fake_get):
+        results = dict(engine.scrape_many(urls, concurrency=4))
+
+    assert set(results) == set(urls)
+    assert all(results[url] == f"<p>{url}</p>" for url in urls)
+
+
+def test_scrape_many_saves_output_and_reports_failures(tmp_path):
+    output = DummyOutput()
+    engine = ScraperEngine(DummyExtractor(), output, {"delay": 0, "retries": 2})
+
+    def fake_get(url, **kwargs):
+        if url.endswith("bad"):
+            raise requests.RequestException("boom")
+        return _html_response("<html><head><title>Good</title></head></html>")
+
+    paths = {"http://example.com/good": str(tmp_path / "good.json")}
+    with patch.object(engine.session, "get", side_effect=fake_get) as mock_get:
+        results = dict(
+            engine.scrape_many(
+                ["http://example.com/good", "http://example.com/bad"],
+                concurrency=2,
+                output_paths=paths,
+            )
+        )
+
+    assert results["http://example.com/bad"] is None
+    assert results["http://example.com/good"] is not None
+    assert output.data == {"title": "Good"}
+    assert output.path == paths["http://example.com/good"]
+    # one attempt for the good page, two for the failing one
+    assert mock_get.call_count == 3
+
+
+def test_scrape_many_consumes_urls_lazily():
+    engine = ScraperEngine(config={"delay": 0, "retries": 1})
+    consumed = []
+
+    def url_source():
+        for i in range(1000):
+            consumed.append(i)
+            yield f"http://example.com/{i}"
+
+    with patch.object(
+        engine.session, "get", side_effect=lambda url, **kw: _html_response("ok")
+    ):
+        results = engine.scrape_many(url_source(), concurrency=2)
+        next(results)
+        results.close()
+
+    assert len(consumed) < 1000
+
+
+def test_scrape_parses_each_page_once(tmp_path):
+    engine = ScraperEngine(config={"delay": 0, "retries": 1})
+    response = _html_response("<html><body><p>Hello</p></body></html>")
+
+    real = content_extractor.BeautifulSoup
+    with patch.object(engine.session, "get", return_value=response), \
+            patch.object(content_extractor, "BeautifulSoup", side_effect=real) as parser:
+        engine.scrape("http://example.com", str(tmp_path / "out.json"))
+
+    assert parser.call_count == 1
+
+
+def test_scrape_site_extracts_selector_fields(tmp_path):
+    output = DummyOutput()
+    engine = ScraperEngine(output_manager=output, config={"delay": 0, "retries": 1})
+    site = {
+        "name": "Example Site",
+        "url": "http://example.com",
+        "selectors": {"title": "h1", "content": ".content"},
+    }
+    html = "<h1>Hello</h1><div class='content'>Body</div><div class='content'>More</div>"
+
+    with patch.object(engine.session, "get", return_value=_html_response(html)):
+        record = engine.scrape_site(site, str(tmp_path / "site.json"))
+
+    assert record == {"title": ["Hello"], "content": ["Body", "More"]}
+    assert output.data == record
+
+
+def _stream_response(body: bytes, content_type: str = "text/html; charset=utf-8"):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = "http://example.com/"
+    response.headers["Content-Type"] = content_type
+    response.encoding = "utf-8"
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def test_streaming_download_limits():
+    engine = ScraperEngine(
+        config={"delay": 0, "retries": 3, "stream_download": {"max_body_bytes": 100}}
+    )
+    page = "<p>café</p>".encode("utf-8")
+    with patch.object(engine.session, "get", return_value=_stream_response(page)) as get:
+        assert engine.scrape("http://example.com/") == "<p>café</p>"
+    assert get.call_args.kwargs["stream"] is True
+
+    with patch.object(
+        engine.session, "get", return_value=_stream_response(b"x" * 1000)
+    ) as get:
+        assert engine.scrape("http://example.com/") is None
+    # Oversized bodies are rejected without retrying.
+    get.assert_called_once()
+
+    pdf = _stream_response(b"%PDF", "application/pdf")
+    with patch.object(engine.session, "get", return_value=pdf):
+        assert engine.scrape("http://example.com/") is None
+
+
+def test_scrape_structured_streams_into_parser():
+    html = "<html><head><title>T</title></head><body><a href='/a'>A</a></body></html>"
+    engine = ScraperEngine(config={"delay": 0, "stream_download": {"chunk_size": 7}})
+    with patch.object(
+        engine.session, "get", return_value=_stream_response(html.encode())
+    ), patch.object(engine.extractor, "parse", side_effect=AssertionError):
+        record = engine.scrape_structured("http://example.com/")
+    assert record == ContentExtractor().extract_structured(html)
+
+
+def test_scrape_decodes_with_meta_charset():
+    engine = ScraperEngine(config={"delay": 0})
+    response = _html_response("<meta charset='utf-8'><p>café</p>")
+    response.headers["Content-Type"] = "text/html"
+    with patch.object(engine.session, "get", return_value=response):
+        html = engine.scrape("http://example.com/")
+    assert "café" in html
+    stats = engine.charset_detector.stats()
+    assert stats["meta"] == 1
+    assert stats["detected"] == 0
+
+
+def test_dedup_index_skips_equivalent_urls(tmp_path):
+    config = {"delay": 0, "retries": 1, "dedup_index": {"path": str(tmp_path / "d.db")}}
+    engine = ScraperEngine(config=config)
+    urls = [
+        "http://example.com/a?x=1&y=2",
+        "http://EXAMPLE.com/a?y=2&x=1&utm_source=mail",
+        "http://example.com/a?x=1&y=2#top",
+        "http://example.com/missing",
+        "http://example.com/b",
+    ]
+
+    def fake_get(url, **kwargs):
+        if url.endswith("missing"):
+            raise requests.RequestException("boom")
+        return _html_response("<p>ok</p>")
+
+    with patch.object(engine.session, "get", side_effect=fake_get) as mock_get:
+        results = list(engine.scrape_many(urls, concurrency=2))
+        # Failed fetches are released; successful ones persist.
+        assert engine.scrape("http://example.com/missing") is None
+        assert engine.scrape("http://example.com/b/../b") is None
+
+    assert len(results) == 5
+    assert sum(html is not None for _, html in results) == 2
+    assert mock_get.call_count == 4
+    assert engine.dedup_index.stats()["saved"] == 3
@@ -31,6 +31,8 @@ def test_content_extractor_extract():
 class DummyResponse:
     def __init__(self, text: str, status: int = 200):
         self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = {"Content-Type": "text/html; charset=utf-8"}
         self.status_code = status
 
     def raise_for_status(self):
@@ -46,7 +48,8 @@ def test_scrape_success():
         result = engine.scrape("http://example.com")
         assert result == html
         mock_get.assert_called_once()
-        mock_sleep.assert_called_once()
+        # with no delay configured the per-host rate limiter never sleeps
+        mock_sleep.assert_not_called()
 
 
 def test_scrape_failure():
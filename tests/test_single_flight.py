@@ -0,0 +1,144 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from cinder_web_scraper.scraping.single_flight import SingleFlight
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+@pytest.fixture
+def server():
+    hits = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] = hits.get(self.path, 0) + 1
+            time.sleep(0.2)
+            body = f"<title>{self.path}</title><p>hello</p>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.hits = hits
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "body"
+
+    with ThreadPoolExecutor(4) as pool:
+        first = pool.submit(flight.do, "k", work)
+        started.wait(5)
+        others = [pool.submit(flight.do, "k", work) for _ in range(3)]
+        while flight.stats()["coalesced"] < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [first.result()] + [f.result() for f in others]
+
+    assert results == ["body"] * 4
+    assert len(calls) == 1
+    assert flight.stats() == {"executed": 1, "coalesced": 3, "cache_hits": 0}
+    # Without a ttl nothing is kept once the call finished.
+    assert flight.do("k", lambda: "again") == "again"
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(flight.do, "k", fail)
+        started.wait(5)
+        second = pool.submit(flight.do, "k", fail)
+        while flight.stats()["coalesced"] < 1:
+            time.sleep(0.01)
+        release.set()
+        for future in (first, second):
+            with pytest.raises(ValueError):
+                future.result()
+    assert len(flight) == 0
+
+
+def test_results_are_cached_for_ttl():
+    now = [0.0]
+    flight = SingleFlight(max_entries=2, clock=lambda: now[0])
+    assert flight.do("a", lambda: 1, ttl=5) == 1
+    assert flight.do("a", lambda: 2, ttl=5) == 1
+    assert flight.do("none", lambda: None, ttl=5) is None
+    assert flight.do("none", lambda: 3, ttl=5) == 3
+    now[0] = 6
+    assert flight.do("a", lambda: 4, ttl=5) == 4
+    flight.do("b", lambda: 5, ttl=5)
+    flight.do("c", lambda: 6, ttl=5)
+    assert len(flight) == 2
+    flight.forget("c")
+    assert flight.do("c", lambda: 7, ttl=5) == 7
+    assert flight.stats()["cache_hits"] == 1
+
+
+def test_engines_coalesce_fetches(server, tmp_path):
+    url = f"http://127.0.0.1:{server.server_address[1]}/page"
+    config = {"delay": 0, "coalesce": {"ttl": 30}}
+    with patch.object(SingleFlight, "_shared", None):
+        engines = [ScraperEngine(config=config) for _ in range(3)]
+        paths = [str(tmp_path / f"{i}.json") for i in range(3)]
+        with ThreadPoolExecutor(3) as pool:
+            results = list(pool.map(lambda i: engines[i].scrape(url, paths[i]), range(3)))
+        again = engines[0].scrape(url + "?utm_source=x")
+        stats = engines[0].single_flight.stats()
+
+    assert server.hits == {"/page": 1}
+    assert len(set(results + [again])) == 1 and "hello" in again
+    assert all((tmp_path / f"{i}.json").exists() for i in range(3))
+    assert stats["coalesced"] + stats["cache_hits"] >= 3
+
+
+def test_engines_with_different_settings_do_not_share(server):
+    url = f"http://127.0.0.1:{server.server_address[1]}/page"
+    coalesce = {"delay": 0, "coalesce": {"ttl": 30}}
+    with patch.object(SingleFlight, "_shared", None):
+        assert "hello" in ScraperEngine(config=coalesce).scrape(url)
+        limited = ScraperEngine(config={**coalesce, "stream_download": {"max_body_bytes": 10}})
+        assert limited.scrape(url) is None
+        other_agent = ScraperEngine(config={**coalesce, "user_agent": "other"})
+        assert "hello" in other_agent.scrape(url)
+        assert "hello" in ScraperEngine(config=coalesce).scrape(url)
+    assert server.hits == {"/page": 3}
+
+
+def test_coalescing_is_opt_in(server):
+    url = f"http://127.0.0.1:{server.server_address[1]}/page"
+    engine = ScraperEngine(config={"delay": 0})
+    assert engine.single_flight is None
+    engine.scrape(url)
+    engine.scrape(url)
+    assert server.hits == {"/page": 2}
@@ -0,0 +1,230 @@
+import gzip
+import io
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cinder_web_scraper.crawling.crawler import Crawler
+from cinder_web_scraper.crawling.sitemap import (
+    SitemapEntry,
+    SitemapSource,
+    iter_sitemap,
+    parse_lastmod,
+)
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def urlset(*entries):
+    body = "".join(
+        f"<url><loc>{loc}</loc>" + (f"<lastmod>{mod}</lastmod>" if mod else "") + "</url>"
+        for loc, mod in entries
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{body}</urlset>'.encode()
+
+
+def sitemapindex(*entries):
+    body = "".join(
+        f"<sitemap><loc>{loc}</loc><lastmod>{mod}</lastmod></sitemap>" for loc, mod in entries
+    )
+    return f"<sitemapindex {NS}>{body}</sitemapindex>".encode()
+
+
+def test_parse_lastmod():
+    assert parse_lastmod("1970-01-02") == 86400
+    assert parse_lastmod("1970-01-01T01:00:00Z") == 3600
+    assert parse_lastmod("1970-01-01T02:00:00+01:00") == 3600
+    assert parse_lastmod("1971") == parse_lastmod("1971-01-01")
+    assert parse_lastmod("yesterday") is None
+    assert parse_lastmod(None) is None
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_iter_sitemap(compress):
+    data = urlset(("http://e.com/a", "1970-01-02"), ("http://e.com/b", None))
+    if compress:
+        data = gzip.compress(data)
+    assert list(iter_sitemap(io.BytesIO(data))) == [
+        SitemapEntry("url", "http://e.com/a", 86400.0),
+        SitemapEntry("url", "http://e.com/b", None),
+    ]
+
+
+def test_iter_sitemap_ignores_extension_locs():
+    data = (
+        f'<urlset {NS} xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+        "<url><loc>https://ex.com/page</loc>"
+        "<image:image><image:loc>https://ex.com/pic.jpg</image:loc></image:image>"
+        "<lastmod>1970-01-02</lastmod></url></urlset>"
+    ).encode()
+    assert list(iter_sitemap(io.BytesIO(data))) == [
+        SitemapEntry("url", "https://ex.com/page", 86400.0)
+    ]
+
+
+def test_iter_sitemap_memory_is_constant():
+    data = urlset(*((f"http://e.com/page/{i}", "2024-01-01") for i in range(50_000)))
+    tracemalloc.start()
+    count = sum(1 for _ in iter_sitemap(io.BytesIO(data)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert count == 50_000
+    assert peak < 2 * 1024 * 1024
+
+
+@pytest.fixture
+def server():
+    files = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = files.get(self.path)
+            self.send_response(200 if body is not None else 404)
+            self.send_header("Content-Type", "application/xml")
+            self.end_headers()
+            self.wfile.write(body or b"")
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.files = files
+    httpd.base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_source_follows_indexes_and_skips_unchanged(server, tmp_path):
+    base = server.base
+    server.files.update(
+        {
+            "/sitemap.xml": sitemapindex(
+                (base + "/pages.xml.gz", "2024-01-01"),
+                (base + "/posts.xml", "2024-01-01"),
+                (base + "/missing.xml", "2024-01-01"),
+            ),
+            "/pages.xml.gz": gzip.compress(
+                urlset((base + "/p1", "2024-01-01"), (base + "/p2", None))
+            ),
+            "/posts.xml": urlset((base + "/b1", "2024-01-01"), (base + "/b2", "2024-01-01")),
+        }
+    )
+    engine = ScraperEngine(config={"delay": 0})
+    state = str(tmp_path / "state.db")
+    with SitemapSource(engine, state) as source:
+        first = list(source.urls(base + "/sitemap.xml"))
+        assert source.stats()["errors"] == 1
+        for url in first:
+            source.processed(url)
+    assert first == [base + "/p1", base + "/p2", base + "/b1", base + "/b2"]
+
+    server.files["/posts.xml"] = urlset(
+        (base + "/b1", "2024-01-01"), (base + "/b2", "2024-02-01")
+    )
+    server.files["/sitemap.xml"] = sitemapindex(
+        (base + "/pages.xml.gz", "2024-01-01"),
+        (base + "/posts.xml", "2024-02-01"),
+        (base + "/missing.xml", "2024-01-01"),
+    )
+    with SitemapSource(engine, state) as source:
+        second = list(source.urls(base + "/sitemap.xml"))
+        stats = source.stats()
+    # pages.xml.gz is unchanged; missing.xml failed before and is retried.
+    assert second == [base + "/b2"]
+    assert stats["unchanged"] == 1
+    assert stats["sitemaps"] == 3
+
+
+def test_lastmod_is_stored_only_for_processed_pages(server, tmp_path):
+    base = server.base
+    server.files.update(
+        {
+            "/sitemap.xml": sitemapindex((base + "/pages.xml", "2024-01-01")),
+            "/pages.xml": urlset(
+                (base + "/a", "2024-01-01"),
+                (base + "/b", "2024-01-01"),
+                (base + "/c", "2024-01-01"),
+            ),
+        }
+    )
+    engine = ScraperEngine(config={"delay": 0})
+    state = str(tmp_path / "state.db")
+
+    def run(ok):
+        with SitemapSource(engine, state) as source:
+            urls = list(source.urls(base + "/sitemap.xml"))
+            for url in urls:
+                if url in ok:
+                    source.processed(url, ok[url])
+            return urls, source.stats()["unchanged"]
+
+    # /b failed and /c was never reported, so both come back.
+    assert run({base + "/a": True, base + "/b": False}) == (
+        [base + "/a", base + "/b", base + "/c"], 0
+    )
+    assert run({base + "/b": True, base + "/c": True}) == ([base + "/b", base + "/c"], 1)
+    # Every page was processed, so the child sitemap itself is skipped.
+    assert run({}) == ([], 0)
+
+
+def test_crawler_records_lastmod_after_crawling(server, tmp_path):
+    base = server.base
+    server.files["/sitemap.xml"] = urlset(
+        (base + "/ok", "2024-01-01"), (base + "/gone", "2024-01-01")
+    )
+    server.files["/ok"] = b"<p>ok</p>"
+    config = {"frontier_path": str(tmp_path / "f.db"), "sitemap_state": str(tmp_path / "s.db")}
+
+    def crawl():
+        engine = ScraperEngine(config={"delay": 0, "retries": 1})
+        with Crawler(engine, config) as crawler:
+            crawler.add_sitemap(base + "/sitemap.xml")
+            return [r.url for r in crawler.crawl()]
+
+    # Pages fetched together may complete in any order.
+    assert sorted(crawl()) == [base + "/gone", base + "/ok"]
+    assert crawl() == [base + "/gone"]
+
+
+def test_crawler_settles_sitemap_pages_it_already_crawled(server, tmp_path):
+    base = server.base
+    pages = [f"{base}/p{i}" for i in range(5)]
+    # The seed is listed after the first wave, once it was already crawled.
+    server.files["/sitemap.xml"] = urlset(*((url, "2024-01-01") for url in pages + [base + "/"]))
+    for url in pages + [base + "/"]:
+        server.files[url[len(base):]] = b"<p>page</p>"
+    config = {"frontier_path": str(tmp_path / "f.db"), "sitemap_state": str(tmp_path / "s.db")}
+
+    def crawl():
+        engine = ScraperEngine(config={"delay": 0, "concurrency": 1})
+        with Crawler(engine, config) as crawler:
+            crawler.add_site({"url": base + "/", "sitemap": base + "/sitemap.xml"})
+            urls = [r.url for r in crawler.crawl()]
+            return urls, crawler.sitemaps.stats()
+
+    urls, _ = crawl()
+    assert sorted(urls) == sorted(pages + [base + "/"])
+    urls, stats = crawl()
+    assert urls == [base + "/"]
+    assert stats["urls"] == 0 and stats["unchanged"] == 6
+
+
+def test_crawler_reads_sitemaps_lazily(server, tmp_path):
+    base = server.base
+    server.files["/sitemap.xml"] = urlset(*((f"{base}/page/{i}", None) for i in range(30)))
+    for i in range(30):
+        server.files[f"/page/{i}"] = b"<p>page</p>"
+    engine = ScraperEngine(config={"delay": 0, "concurrency": 1})
+    crawler = Crawler(engine, {"frontier_path": str(tmp_path / "f.db"), "max_pages": 10})
+    with crawler:
+        crawler.add_sitemap(base + "/sitemap.xml")
+        results = list(crawler.crawl())
+    assert [r.url for r in results] == [f"{base}/page/{i}" for i in range(10)]
+    # One wave of four pages is queued at a time, plus the look-ahead entry.
+    assert crawler.sitemaps.stats()["urls"] <= 13
@@ -0,0 +1,60 @@
+import pytest
+
+from cinder_web_scraper.scraping.content_extractor import ContentExtractor
+from cinder_web_scraper.scraping.structured_parser import (
+    StructuredParser,
+    extract_structured_stream,
+)
+
+PAGES = [
+    "<html><head><title> Page </title></head><body><h1>Hi</h1>"
+    "<a href='/a'>A</a><a>no href</a><img src='/i.png'><img src=''></body></html>",
+    "<!DOCTYPE html><title>T</title>x<p>y &amp; z</p>",
+    "<body>a<template>T<p>z</p></template><![CDATA[cd]]>b<!--c--><?pi?>c"
+    "<style>s</style><script>x</script><noscript>n</noscript></body>",
+    "<html><body>x</html>y",
+    "<body>x</body>y<body>z</body>",
+    "<title><b>T</b></title>",
+    "<title><!--c-->T</title>",
+    "<title></title>",
+    "<p>a<br>b</br>c</p>",
+    "<div>a</p>b<ruby>r<rt>t</rt></ruby></div>",
+]
+
+
+@pytest.mark.parametrize("html", PAGES)
+def test_stream_matches_tree_extraction(html):
+    expected = ContentExtractor("html.parser").extract_structured(html)
+    assert extract_structured_stream(html) == expected
+
+
+def test_stream_accepts_chunks_and_bytes():
+    html = PAGES[0]
+    expected = extract_structured_stream(html)
+    assert extract_structured_stream(html[i:i + 3] for i in range(0, len(html), 3)) == expected
+    assert extract_structured_stream(html.encode("utf-8")) == expected
+
+
+def test_parser_results_without_text():
+    parser = StructuredParser(include_text=False)
+    parser.feed(PAGES[0])
+    parser.close()
+    assert parser.result() == {
+        "title": "Page",
+        "links": ["/a"],
+        "images": ["/i.png"],
+        "text": "",
+    }
+
+
+def test_extractor_streaming_mode():
+    extractor = ContentExtractor(streaming=True)
+    assert extractor.extract_structured(PAGES[1]) == {
+        "title": "T",
+        "links": [],
+        "images": [],
+        "text": "T x y & z",
+    }
+    # Parsed documents still use the tree.
+    doc = extractor.parse(PAGES[1])
+    assert extractor.extract_structured(doc)["text"] == "T x y & z"
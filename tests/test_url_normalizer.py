@@ -0,0 +1,66 @@
+import pytest
+
+from cinder_web_scraper.scraping.url_normalizer import (
+    UrlNormalizer,
+    UrlRules,
+    remove_dot_segments,
+)
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTP://Example.COM:80/a/./b/../c", "http://example.com/a/c"),
+        ("https://example.com:443", "https://example.com/"),
+        ("https://example.com:8443/x", "https://example.com:8443/x"),
+        ("http://example.com/%7euser/%2f", "http://example.com/~user/%2F"),
+        ("http://example.com/?b=2&a=1#frag", "http://example.com/?a=1&b=2"),
+        ("http://example.com/p?utm_source=x&id=3&fbclid=y", "http://example.com/p?id=3"),
+        ("http://[::1]:8080/", "http://[::1]:8080/"),
+        ("http://example.com/?a&&b=", "http://example.com/?a&b="),
+    ],
+)
+def test_default_normalization(url, expected):
+    assert UrlNormalizer().normalize(url) == expected
+
+
+def test_remove_dot_segments():
+    assert remove_dot_segments("/a/b/c/./../../g") == "/a/g"
+    assert remove_dot_segments("/../a/..") == "/"
+    assert remove_dot_segments("/a/.") == "/a/"
+
+
+def test_per_site_rules_from_config():
+    config = {
+        "url_rules": {"sort_query": False},
+        "websites": [
+            {
+                "url": "https://shop.example.com/",
+                "url_rules": {
+                    "strip_params": ["sessionid", "ref*"],
+                    "keep_params": ["utm_campaign"],
+                    "trailing_slash": "strip",
+                    "drop_fragment": False,
+                },
+            }
+        ],
+    }
+    normalizer = UrlNormalizer.from_config(config)
+    assert (
+        normalizer.normalize(
+            "https://shop.example.com/item/?utm_campaign=c&SessionId=1&referrer=x&utm_source=s#d"
+        )
+        == "https://shop.example.com/item?utm_campaign=c#d"
+    )
+    # Other hosts keep the global defaults.
+    assert normalizer.normalize("http://other.com/?b=1&a=2#x") == "http://other.com/?b=1&a=2"
+
+
+def test_trailing_slash_add_skips_files():
+    normalizer = UrlNormalizer(UrlRules(trailing_slash="add"))
+    assert normalizer.normalize("http://e.com/docs") == "http://e.com/docs/"
+    assert normalizer.normalize("http://e.com/page.html") == "http://e.com/page.html"
+
+
+def test_unparsable_url_is_returned_unchanged():
+    assert UrlNormalizer().normalize("http://e.com:99999/") == "http://e.com:99999/"
@@ -0,0 +1,213 @@
+import multiprocessing
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cinder_web_scraper.scheduling.work_queue import WorkQueue, run_worker
+from cinder_web_scraper.scraping.scraper_engine import ScraperEngine
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    path = str(tmp_path / "queue.db")
+    with WorkQueue(path, lease_seconds=60, retry_delay=10, clock=clock) as queue:
+        yield queue
+
+
+def test_put_ignores_queued_urls(queue):
+    assert queue.put("https://a/1", payload="x")
+    assert not queue.put("https://a/1")
+    assert queue.put_many(["https://a/1", "https://a/2", ("https://a/3", "p")]) == 2
+    assert queue.counts() == {"ready": 3, "leased": 0, "done": 0, "dead": 0}
+
+
+def test_claims_are_exclusive_batches(queue):
+    queue.put_many(f"https://a/{i}" for i in range(10))
+    first = queue.claim(4)
+    second = queue.claim(10)
+    assert len(first) == 4 and len(second) == 6
+    assert not {i.id for i in first} & {i.id for i in second}
+    assert queue.claim(5) == []
+    assert first[0].attempts == 1 and first[0].lease != second[0].lease
+    assert queue.complete(first) == 4
+    assert queue.counts()["done"] == 4
+
+
+def test_expired_leases_are_reclaimed(queue, clock):
+    queue.put("https://a/1")
+    (stale,) = queue.claim()
+    clock.now += 30
+    assert queue.heartbeat([stale]) == 1
+    clock.now += 50
+    assert queue.claim() == []
+    clock.now += 30
+    (fresh,) = queue.claim()
+    assert fresh.id == stale.id and fresh.attempts == 2
+    # The first worker lost its lease and cannot finish the item.
+    assert queue.complete([stale]) == 0
+    assert queue.heartbeat([stale]) == 0
+    assert queue.complete([fresh]) == 1
+
+
+def test_failures_retry_then_dead_letter(queue, clock):
+    queue.put("https://a/1")
+    for attempt, delay in ((1, 10), (2, 20)):
+        (item,) = queue.claim()
+        assert item.attempts == attempt
+        assert queue.fail([item], "boom") == 1
+        clock.now += delay - 1
+        assert queue.claim() == []
+        clock.now += 1
+    (item,) = queue.claim()
+    queue.fail([item], "still broken")
+    assert queue.counts()["dead"] == 1
+    (dead,) = queue.dead_letters()
+    assert dead["url"] == "https://a/1" and dead["last_error"] == "still broken"
+    assert queue.requeue_dead() == 1
+    assert queue.claim()[0].attempts == 1
+
+
+def test_abandoned_items_at_max_attempts_are_dead_lettered(queue, clock):
+    queue.put("https://a/1")
+    for _ in range(3):
+        assert queue.claim()
+        clock.now += 61
+    assert queue.claim() == []
+    assert queue.dead_letters()[0]["last_error"] == "lease expired"
+
+
+def test_release_does_not_count_attempt(queue):
+    queue.put("https://a/1")
+    queue.release(queue.claim())
+    assert queue.claim()[0].attempts == 1
+
+
+def _drain(db_path, batch):
+    with WorkQueue(db_path) as queue:
+        claimed = []
+        while True:
+            items = queue.claim(batch)
+            if not items:
+                return claimed
+            claimed.extend(item.url for item in items)
+            queue.complete(items)
+
+
+def _abandon(db_path):
+    with WorkQueue(db_path, lease_seconds=0.5) as queue:
+        return [item.url for item in queue.claim(5)]
+
+
+def test_processes_share_the_queue(tmp_path):
+    db_path = str(tmp_path / "queue.db")
+    urls = [f"https://a/{i}" for i in range(2000)]
+    with WorkQueue(db_path) as queue:
+        queue.put_many(urls)
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(4) as pool:
+        results = pool.starmap(_drain, [(db_path, 25)] * 4)
+
+    claimed = [url for result in results for url in result]
+    assert sorted(claimed) == sorted(urls)
+    with WorkQueue(db_path) as queue:
+        assert queue.counts()["done"] == len(urls)
+
+
+def test_crashed_worker_items_are_reclaimed(tmp_path):
+    db_path = str(tmp_path / "queue.db")
+    with WorkQueue(db_path, lease_seconds=0.5) as queue:
+        queue.put_many(f"https://a/{i}" for i in range(5))
+        process = multiprocessing.get_context("spawn").Process(target=_abandon, args=(db_path,))
+        process.start()
+        process.join(30)
+        assert queue.claim(5) == []
+        time.sleep(0.6)
+        items = queue.claim(5)
+        assert len(items) == 5 and all(item.attempts == 2 for item in items)
+
+
+@pytest.fixture
+def server():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/missing":
+                self.send_error(404)
+                return
+            body = b"<title>ok</title>"
+            kind = "text/html"
+            if self.path == "/robots.txt":
+                body, kind = b"User-agent: *\nDisallow: /private\n", "text/plain"
+            elif self.path.endswith(".pdf"):
+                kind = "application/pdf"
+            self.send_response(200)
+            self.send_header("Content-Type", kind)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_run_worker(tmp_path, server):
+    with WorkQueue(str(tmp_path / "queue.db"), max_attempts=1) as queue:
+        queue.put_many([f"{server}/{i}" for i in range(5)] + [f"{server}/missing"])
+        engine = ScraperEngine(config={"delay": 0, "retries": 1})
+        counts = run_worker(
+            queue, engine, batch_size=4,
+            output_path=lambda item: str(tmp_path / f"{item.id}.json"),
+        )
+        assert counts == {"completed": 5, "failed": 1, "rejected": 0}
+        assert queue.counts() == {"ready": 0, "leased": 0, "done": 5, "dead": 1}
+        assert len(list(tmp_path.glob("*.json"))) == 5
+
+
+def test_run_worker_completes_duplicates(tmp_path, server):
+    with WorkQueue(str(tmp_path / "queue.db"), max_attempts=1) as queue:
+        queue.put_many([f"{server}/a", f"{server}/a?", f"{server}/missing"])
+        engine = ScraperEngine(
+            config={"delay": 0, "retries": 1, "dedup_index": {"path": str(tmp_path / "seen.db")}}
+        )
+        counts = run_worker(queue, engine, batch_size=4)
+        assert counts == {"completed": 2, "failed": 1, "rejected": 0}
+        assert queue.counts() == {"ready": 0, "leased": 0, "done": 2, "dead": 1}
+
+
+def test_run_worker_rejects_pages_it_cannot_fetch(tmp_path, server):
+    with WorkQueue(str(tmp_path / "queue.db"), max_attempts=3) as queue:
+        queue.put_many([f"{server}/ok", f"{server}/private", f"{server}/file.pdf"])
+        engine = ScraperEngine(config={
+            "delay": 0, "retries": 1, "respect_robots": True,
+            "stream_download": {"content_types": ["text/html"]},
+        })
+        counts = run_worker(queue, engine, batch_size=4)
+        assert counts == {"completed": 1, "failed": 0, "rejected": 2}
+        assert queue.counts() == {"ready": 0, "leased": 0, "done": 1, "dead": 2}
+        errors = {item["url"]: item["last_error"] for item in queue.dead_letters()}
+        assert errors == {
+            f"{server}/private": "disallowed by robots.txt",
+            f"{server}/file.pdf": "content type 'application/pdf' not allowed",
+        }